@@ -1,131 +1,600 @@
 #任务:写一个 “计算器”（支持加减乘除）；
+import json
+import math
+import operator
+import re
+import sys
+import time
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+
+try:
+    import numpy  # 可选：装了 NumPy 时按整列计算会快很多，没装就用标准库的 array
+except ImportError:
+    numpy = None
+
+# 编译后的表达式里，每一项都提前标好类型（不用每次计算时再判断、再把字符串转成数字）
+NUMBER = 0  # 数字（已经转成 float）
+VARIABLE = 1  # 变量名（计算时从传入的变量里取值）
+OPERATOR = 2  # 运算符（已经换成对应的函数）
+UNARY = 3  # 负号（只有一个运算数，比如 -3、-(1+2)）
+
+OPERATOR_FUNCTIONS = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv}
+
+# 编译后的运算符（后缀表达式里的一项），'neg' 是负号
+OPERATOR_ITEMS = {op: (OPERATOR, function) for op, function in OPERATOR_FUNCTIONS.items()}
+OPERATOR_ITEMS['neg'] = (UNARY, operator.neg)
+
+# 词法分析：用一个编译好的正则表达式从左到右切出每个词（数字、变量名、运算符、括号），
+# 正则在 C 里逐字符匹配，Python 只按“词”循环，表达式再长耗时也只和长度成正比
+# 数字支持小数和科学计数法：3、3.14、.5、1e3、2.5E-4
+TOKEN_PATTERN = re.compile(r"""
+    \s*                                             # 跳过空白
+    (?:
+        ((?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)    # 1. 数字
+      | ([A-Za-z_][A-Za-z0-9_]*)                     # 2. 变量名
+      | ([-+*/()])                                   # 3. 运算符、括号
+      | (\S)                                         # 4. 不认识的字符
+    )
+""", re.VERBOSE)
+TOKEN_KINDS = {1: "number", 2: "name", 3: "symbol", 4: "unknown"}
+
+
+class ExpressionError(ValueError):
+    """表达式写错了，position 是出错的位置（从0开始数）"""
+    def __init__(self, message, position):
+        super().__init__(f"错误：第{position + 1}个字符：{message}")
+        self.position = position
+
+
+def tokenize(expression):
+    """
+    把表达式切成一个个词，依次返回 (类型, 文本, 位置)
+    类型：number（数字）、name（变量名）、symbol（+-*/和括号）、unknown（不认识的字符）
+    """
+    for match in TOKEN_PATTERN.finditer(expression):
+        group = match.lastindex
+        yield TOKEN_KINDS[group], match.group(group), match.start(group)
+
+
+def token_position(expression, index):
+    """第 index 个词在表达式里的位置（只在报错时用，所以再扫一遍也没关系）"""
+    for i, (kind, text, position) in enumerate(tokenize(expression)):
+        if i == index:
+            return position
+    return len(expression)
+
+
+class CompiledExpression:
+    """
+    编译好的表达式：解析一次，可以反复计算
+    比如 "price*(1+rate)" 编译一次，然后带入不同的 price、rate 算很多次，不用每次都重新解析
+    """
+    def __init__(self, expression, program, variables):
+        self.expression = expression  # 原来的表达式文本
+        self.program = program  # 后缀表达式，每一项是 (类型, 值)
+        self.variables = variables  # 用到的变量名（按第一次出现的顺序）
+
+    def evaluate(self, variables=None):
+        """
+        计算结果，返回 (结果, 错误信息)
+        variables：变量的值，比如 {"price": 9.5, "rate": 0.1}
+        """
+        result_stack = []
+        push = result_stack.append
+        pop = result_stack.pop
+        for kind, value in self.program:
+            if kind == NUMBER:
+                push(value)
+            elif kind == VARIABLE:
+                if variables is None or value not in variables:
+                    return None, f"错误：变量 '{value}' 没有赋值"
+                push(variables[value])
+            elif kind == UNARY:
+                push(value(pop()))
+            else:
+                # 运算数够不够在编译时已经检查过了，这里直接算
+                num2 = pop()
+                num1 = pop()
+                if value is operator.truediv and num2 == 0:
+                    return None, "错误：除数不能是0！"
+                push(value(num1, num2))
+        return result_stack[0], ""
+
+    def evaluate_columns(self, columns, use_numpy=None):
+        """
+        按整列计算（比如给一张表的每一行算一个派生列），返回 (结果列, 出错标记列, 错误信息)
+        columns：每个变量一列数据，比如 {"price": [9.5, 12, 3], "rate": [0.1, 0.2, 0.3]}，
+                 可以是 list、array('d') 或 NumPy 数组，长度必须一样
+        结果列：每一行的结果（出错的行是 nan）
+        出错标记列：每一行是否出错（除数是0），出错的行不会中断其它行的计算
+        use_numpy：None 表示装了 NumPy 就用；False 强制用标准库 array（对比速度用）
+        不是一行一行地算：每个运算对整列只算一次（NumPy 在 C 里算，标准库 array 也省掉了逐行解释后缀表达式的开销）
+        """
+        missing = [name for name in self.variables if name not in columns]
+        if missing:
+            return None, None, f"错误：变量 '{missing[0]}' 没有赋值"
+        lengths = {len(columns[name]) for name in self.variables}
+        if len(lengths) > 1:
+            return None, None, "错误：各列的长度不一样"
+        rows = lengths.pop() if lengths else 1  # 没有变量时，结果只有一行
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        if use_numpy:
+            return self._evaluate_numpy(columns, rows)
+        return self._evaluate_array(columns, rows)
+
+    def _evaluate_numpy(self, columns, rows):
+        errors = numpy.zeros(rows, dtype=bool)
+        result_stack = []
+        for kind, value in self.program:
+            if kind == NUMBER:
+                result_stack.append(value)  # 数字不用展开成整列，NumPy 会自动广播
+            elif kind == VARIABLE:
+                result_stack.append(numpy.asarray(columns[value], dtype=numpy.float64))
+            elif kind == UNARY:
+                result_stack.append(value(result_stack.pop()))
+            else:
+                num2 = result_stack.pop()
+                num1 = result_stack.pop()
+                if value is operator.truediv:
+                    zero = numpy.equal(num2, 0)
+                    errors |= zero
+                    # 除数是0的行不计算，结果填 nan
+                    result = numpy.divide(num1, num2, out=numpy.full(rows, numpy.nan), where=~zero)
+                else:
+                    result = value(num1, num2)
+                result_stack.append(result)
+        # 出错的行是 nan，nan 参与后面的运算结果还是 nan，不用再单独处理
+        values = numpy.broadcast_to(numpy.asarray(result_stack[0], dtype=numpy.float64), (rows,)).copy()
+        return values, errors, ""
+
+    def _evaluate_array(self, columns, rows):
+        nan = float("nan")
+        errors = array('b', bytes(rows))
+        result_stack = []  # 每一项是一个数字（整列都一样）或者一列
+        for kind, value in self.program:
+            if kind == NUMBER:
+                result_stack.append(value)
+            elif kind == VARIABLE:
+                result_stack.append(columns[value])
+            elif kind == UNARY:
+                num = result_stack.pop()
+                result_stack.append(value(num) if isinstance(num, float) else array('d', [value(a) for a in num]))
+            else:
+                num2 = result_stack.pop()
+                num1 = result_stack.pop()
+                # 数字当成每行都一样的一列
+                pairs = zip(repeat(num1, rows) if isinstance(num1, float) else num1,
+                            repeat(num2, rows) if isinstance(num2, float) else num2)
+                if value is operator.truediv:
+                    result = array('d')
+                    for i, (a, b) in enumerate(pairs):
+                        if b == 0:
+                            errors[i] = 1
+                            result.append(nan)
+                        else:
+                            result.append(a / b)
+                else:
+                    result = array('d', [value(a, b) for a, b in pairs])
+                result_stack.append(result)
+        values = result_stack[0]
+        if isinstance(values, float):
+            values = array('d', [values]) * rows
+        elif not isinstance(values, array):
+            values = array('d', values)  # 表达式只有一个变量时，结果就是传进来的那一列，复制一份
+        return values, errors, ""
+
+    def __repr__(self):
+        return f"CompiledExpression({self.expression!r})"
+
 
 # 定义计算器类
 class SimpleCalculator:
-    def __init__(self):
-        # 定义运算符优先级：乘除（2）比加减（1）高
-        self.operator_priority = {'+': 1, '-': 1, '*': 2, '/': 2}
+    def __init__(self, cache_size=256):
+        # 定义运算符优先级：负号（3）比乘除（2）高，乘除比加减（1）高
+        self.operator_priority = {'+': 1, '-': 1, '*': 2, '/': 2, 'neg': 3}
+        # 编译结果的缓存：表达式文本 -> (编译结果, 错误信息)，最多存 cache_size 个，满了淘汰最久没用的（LRU）
+        self.cache_size = cache_size
+        self._compiled = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
-    def is_valid_number(self, s):
-        """判断输入的字符串是不是合法数字（整数或小数）"""
-        try:
-            float(s)  # 尝试把字符串转成数字，成功就是合法的
-            return True
-        except:
-            return False
+    def compile(self, expression):
+        """
+        把表达式编译成 CompiledExpression，返回 (编译结果, 错误信息)
+        同一个表达式只编译一次，之后直接从缓存里拿
+        """
+        cached = self._compiled.get(expression)
+        if cached is not None:
+            self._compiled.move_to_end(expression)  # 标记为最近使用
+            self.cache_hits += 1
+            return cached
+        self.cache_misses += 1
+        cached = self._compile(expression)
+        if self.cache_size > 0:
+            self._compiled[expression] = cached
+            if len(self._compiled) > self.cache_size:
+                self._compiled.popitem(last=False)  # 淘汰最久没用的
+        return cached
 
-    def infix_to_postfix(self, expression):
+    def _compile(self, expression):
         """
-        把表达式转成后缀
-        比如 "1+2*3" 转成 ["1", "2", "3", "*", "+"]
+        真正的编译：中缀转后缀（调度场算法），数字转成 float，运算符换成函数
+        一边转换一边检查格式：记住下一个词应该是“运算数”（数字、变量、左括号、负号）还是“运算符”，
+        不符合就报错，并指出是第几个字符
         """
-        postfix = []  # 存储转换后的后缀表达式
+        try:
+            program = self._parse(expression)
+        except ExpressionError as e:
+            return None, str(e)
+        if not program:
+            return None, "错误：表达式无法识别"
+        variables = []
+        for kind, value in program:
+            if kind == VARIABLE and value not in variables:
+                variables.append(value)
+        return CompiledExpression(expression, tuple(program), tuple(variables)), ""
+
+    def _parse(self, expression):
+        """把表达式转成后缀形式的 [(类型, 值)]，写错了抛出 ExpressionError"""
+        priority = self.operator_priority
+        program = []  # 转换后的后缀表达式
+        append = program.append
         operator_stack = []  # 临时存运算符的栈
-        i = 0
-        n = len(expression)
-
-        while i < n:
-            char = expression[i]
-            # 1. 跳过空格（比如输入 "1 + 2" 也能识别）
-            if char == ' ':
-                i += 1
-                continue
-            # 2. 处理数字（包括小数）
-            if char.isdigit() or char == '.':
-                num_str = ''  # 用来拼接数字字符
-                # 把连续的数字/小数点拼起来（比如 "3.14" 是一个完整数字）
-                while i < n and (expression[i].isdigit() or expression[i] == '.'):
-                    num_str += expression[i]
-                    i += 1
-                postfix.append(num_str)  # 数字直接加入后缀表达式
-                continue
-            # 3. 处理左括号 "("，直接入栈
-            if char == '(':
-                operator_stack.append(char)
-                i += 1
-                continue
-            # 4. 处理右括号 ")"，把栈里的运算符弹出来，直到遇到左括号
-            if char == ')':
-                found_left_bracket = False
-                while operator_stack:
-                    top_op = operator_stack.pop()  # 弹出栈顶运算符
-                    if top_op == '(':
-                        found_left_bracket = True
-                        break
-                    postfix.append(top_op)  # 运算符加入后缀表达式
-                if not found_left_bracket:  # 没找到左括号，说明括号不匹配
-                    return None, "错误：括号不匹配（少了左括号 '('）"
-                i += 1
-                continue
-            # 5. 处理加减乘除运算符
-            if char in self.operator_priority:
+        left_indexes = []  # 还没配对的左括号是第几个词（报错时找位置用）
+        expect_operand = True  # 下一个词应该是运算数（开头、运算符后面、左括号后面）
+
+        def error(message, index):
+            return ExpressionError(message, token_position(expression, index))
+
+        # findall 一次切出所有的词，每个词是 (数字, 变量名, 运算符或括号, 不认识的字符)，只有一项不是空字符串
+        for index, (number, name, symbol, unknown) in enumerate(TOKEN_PATTERN.findall(expression)):
+            if number or name:
+                if not expect_operand:
+                    raise error(f"'{number or name}' 前面缺少运算符", index)
+                append((NUMBER, float(number)) if number else (VARIABLE, name))
+                expect_operand = False
+            elif symbol == '(':
+                if not expect_operand:
+                    raise error("左括号 '(' 前面缺少运算符", index)
+                operator_stack.append('(')
+                left_indexes.append(index)
+            elif symbol == ')':
+                if expect_operand:
+                    raise error("右括号 ')' 前面缺少数字", index)
+                # 把栈里的运算符弹出来，直到遇到左括号
+                while operator_stack and operator_stack[-1] != '(':
+                    append(OPERATOR_ITEMS[operator_stack.pop()])
+                if not operator_stack:
+                    raise error("括号不匹配（少了左括号 '('）", index)
+                operator_stack.pop()  # 丢掉左括号
+                left_indexes.pop()
+            elif unknown:
+                raise error(f"有不认识的字符 '{unknown}'（只能输入数字、变量名、+-*/、括号）", index)
+            elif expect_operand:
+                # 该出现运算数的地方出现了运算符：'-' 是负号，'+' 是正号（忽略），'*' '/' 是写错了
+                if symbol == '-':
+                    operator_stack.append('neg')
+                elif symbol != '+':
+                    raise error(f"运算符 '{symbol}' 前面缺少数字", index)
+            else:
                 # 把栈里优先级比当前运算符高/相等的，弹出来加入后缀表达式
-                while (operator_stack and operator_stack[-1] != '(' and
-                       self.operator_priority[operator_stack[-1]] >= self.operator_priority[char]):
-                    postfix.append(operator_stack.pop())
-                operator_stack.append(char)  # 当前运算符入栈
-                i += 1
-                continue
-            # 6. 遇到不认识的字符（比如字母、特殊符号）
-            return None, f"错误：有不认识的字符 '{char}'（只能输入数字、+-*/、括号）"
-        # 7. 把栈里剩下的运算符全部弹出来
+                current = priority[symbol]
+                while operator_stack and operator_stack[-1] != '(' and priority[operator_stack[-1]] >= current:
+                    append(OPERATOR_ITEMS[operator_stack.pop()])
+                operator_stack.append(symbol)
+                expect_operand = True
+        if expect_operand and (program or operator_stack):
+            raise ExpressionError("表达式不完整（最后缺少数字）", len(expression))
+        if left_indexes:  # 还有左括号没配对
+            raise error("括号不匹配（少了右括号 ')'）", left_indexes[-1])
+        # 把栈里剩下的运算符全部弹出来
         while operator_stack:
-            top_op = operator_stack.pop()
-            if top_op == '(':  # 栈里还有左括号，说明括号不匹配
-                return None, "错误：括号不匹配（少了右括号 ')'）"
-            postfix.append(top_op)
-        return postfix, ""  # 成功，返回后缀表达式和空错误信息
-    def calculate_postfix(self, postfix):
+            append(OPERATOR_ITEMS[operator_stack.pop()])
+        return program
+
+    def cache_stats(self):
+        """编译缓存的统计：命中次数、未命中次数、当前数量、命中率"""
+        total = self.cache_hits + self.cache_misses
+        return {
+            "size": len(self._compiled),
+            "max_size": self.cache_size,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / total, 4) if total else 0.0,
+        }
+
+    def calculate(self, expression, variables=None):
         """
-        计算后缀表达式的结果
-        比如 ["1", "2", "3", "*", "+"] 计算过程：2*3=6，再 1+6=7
+        对外提供的计算接口：输入表达式，返回结果或错误信息
+        variables：表达式里变量的值（可选），比如 calculate("x*2+1", {"x": 3})
         """
-        result_stack = []  # 存储计算过程的数字
-        for token in postfix:
-            if self.is_valid_number(token):  # 是数字就入栈
-                result_stack.append(float(token))
-            else:  # 是运算符，弹出两个数字计算
-                if len(result_stack) < 2:  # 数字不够，说明表达式错了
-                    return None, "错误：表达式写错了（比如 '1+' 这种）"
-                num2 = result_stack.pop()  # 后弹出来的是第二个运算数（比如 1+2，先弹2）
-                num1 = result_stack.pop()  # 先弹出来的是第一个运算数（再弹1）
-                # 根据运算符计算
-                if token == '+':
-                    result = num1 + num2
-                elif token == '-':
-                    result = num1 - num2
-                elif token == '*':
-                    result = num1 * num2
-                elif token == '/':
-                    if num2 == 0:
-                        return None, "错误：除数不能是0！"
-                    result = num1 / num2
-                result_stack.append(result)  # 计算结果入栈
-        # 栈里最后应该只剩一个结果
-        if len(result_stack) != 1:
-            return None, "错误：表达式格式错了（比如 '1+2*'）"
-        return result_stack[0], ""
-    def calculate(self, expression):
-        """对外提供的计算接口：输入表达式，返回结果或错误信息"""
-        # 第一步：中缀转后缀
-        postfix, error = self.infix_to_postfix(expression)
+        # 第一步：编译（中缀转后缀，同一个表达式只做一次）
+        compiled, error = self.compile(expression)
         if error:  # 转换出错，返回错误信息
             return error
-        if not postfix:  # 转换失败
-            return "错误：表达式无法识别"
-        # 第二步：计算后缀表达式
-        result, error = self.calculate_postfix(postfix)
+        # 第二步：计算
+        if variables:
+            try:
+                variables = convert_variables(compiled, variables)
+            except ExpressionError as e:
+                return str(e)
+        result, error = compiled.evaluate(variables)
         if error:  # 计算出错，返回错误信息
             return error
+        return format_result(result)
 
-        # 处理结果：如果是整数（比如 7.0），转成整数显示；否则保留小数
-        return int(result) if result.is_integer() else round(result, 6)
+
+def convert_variables(compiled, variables):
+    """
+    把变量的值转成 float；表达式用到的变量转不了（比如 "abc"、None）时抛出 ExpressionError，
+    位置是这个变量在表达式里第一次出现的地方。表达式没用到的变量原样保留，不检查
+    """
+    converted = dict(variables)
+    for name in compiled.variables:
+        if name not in variables:
+            continue  # 没赋值的变量在计算时报错
+        try:
+            converted[name] = float(variables[name])
+        except (TypeError, ValueError):
+            position = next((pos for kind, text, pos in tokenize(compiled.expression)
+                             if kind == "name" and text == name), 0)
+            raise ExpressionError(f"变量 '{name}' 的值 {variables[name]!r} 不是数字", position)
+    return converted
+
+
+def format_result(result):
+    """处理结果：如果是整数（比如 7.0），转成整数显示；否则保留小数"""
+    return int(result) if result.is_integer() else round(result, 6)
+
+
+# ------------------- 批量计算（python 01.py batch）-------------------
+# 从文件或标准输入一行一行地读表达式，分成一块一块（chunk）交给多个进程计算，按原来的顺序输出，
+# 同时在计算的块数有上限（进程数的2倍），所以输入再大占用的内存也是固定的
+
+_batch_calculator = None  # 每个子进程各有一个计算器（带编译缓存，重复的公式只解析一次）
+
+
+def evaluate_chunk(first_line, lines, output_format):
+    """子进程里执行：算一块表达式，返回 (输出文本, 出错的行数)"""
+    global _batch_calculator
+    if _batch_calculator is None:
+        _batch_calculator = SimpleCalculator(cache_size=4096)
+    calc = _batch_calculator
+    output = []
+    errors = 0
+    for number, line in enumerate(lines, first_line):
+        expression = line.rstrip("\r\n")
+        compiled, error = calc.compile(expression)
+        if not error:
+            result, error = compiled.evaluate()
+        if error:
+            errors += 1
+            if output_format == "ndjson":
+                output.append(json.dumps({"line": number, "expression": expression, "error": error},
+                                         ensure_ascii=False))
+            else:
+                output.append(f"error\t{error}")
+        else:
+            result = format_result(result) if math.isfinite(result) else str(result)  # inf/nan 不是合法的 JSON 数字
+            if output_format == "ndjson":
+                output.append(json.dumps({"line": number, "expression": expression, "result": result},
+                                         ensure_ascii=False))
+            else:
+                output.append(f"result\t{result}")
+    output.append("")  # 最后一行也要换行
+    return "\n".join(output), errors
+
+
+def read_chunks(stream, chunk_size):
+    """把输入按 chunk_size 行一块切开，返回 (第一行的行号, 这一块的行)"""
+    first_line = 1
+    while True:
+        lines = list(islice(stream, chunk_size))
+        if not lines:
+            return
+        yield first_line, lines
+        first_line += len(lines)
+
+
+def positive_int(text: str) -> int:
+    """命令行参数：必须是正整数（给 argparse 的 type 用，不合法时 argparse 会打印用法并退出）"""
+    import argparse
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{text!r} 不是整数")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"必须大于等于1，收到 {value}")
+    return value
+
+
+def run_batch(argv):
+    """
+    批量计算：每行一个表达式，输出同样多的行（顺序和输入一致）
+    用法：python 01.py batch [文件] [--workers 4] [--chunk-size 2000] [--format text|ndjson]
+    不写文件（或写 -）时从标准输入读；结果写到标准输出，统计信息写到标准错误
+    text 格式每行是 "result<TAB>结果" 或 "error<TAB>错误信息"；ndjson 格式每行一个 JSON（带行号和原表达式）
+    """
+    import argparse
+    import os
+    parser = argparse.ArgumentParser(prog="python 01.py batch", description="批量计算表达式")
+    parser.add_argument("input", nargs="?", default="-", help="输入文件，每行一个表达式（默认标准输入）")
+    parser.add_argument("--workers", type=positive_int, default=os.cpu_count() or 1,
+                        help="进程数（默认CPU核数，1表示不开子进程）")
+    parser.add_argument("--chunk-size", type=positive_int, default=2000, help="每块多少行（默认2000）")
+    parser.add_argument("--format", choices=["text", "ndjson"], default="text", help="输出格式（默认text）")
+    args = parser.parse_args(argv)
+
+    stream = None
+    out = sys.stdout
+    total_lines = 0
+    total_errors = 0
+    start = time.perf_counter()
+    try:
+        stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+        chunks = read_chunks(stream, args.chunk_size)
+        if args.workers <= 1:
+            for first_line, lines in chunks:
+                text, errors = evaluate_chunk(first_line, lines, args.format)
+                out.write(text)
+                total_lines += len(lines)
+                total_errors += errors
+        else:
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                pending = deque()  # 已经提交、还没输出的块（按输入顺序）：(行数, 结果)
+                for first_line, lines in chunks:
+                    pending.append((len(lines), pool.submit(evaluate_chunk, first_line, lines, args.format)))
+                    # 在算的块太多时，先把最早的一块输出（等它算完），保证顺序，也限制了内存
+                    if len(pending) >= args.workers * 2:
+                        count, future = pending.popleft()
+                        text, errors = future.result()
+                        out.write(text)
+                        total_lines += count
+                        total_errors += errors
+                while pending:
+                    count, future = pending.popleft()
+                    text, errors = future.result()
+                    out.write(text)
+                    total_lines += count
+                    total_errors += errors
+        out.flush()
+    except BrokenPipeError:
+        # 输出被提前关掉了（比如 | head）：把标准输出指向 /dev/null，
+        # 否则退出时 Python 刷新标准输出又会报一次 BrokenPipeError
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+    except OSError as e:
+        if stream is not None:
+            raise  # 不是打不开输入文件，照常抛出
+        print(f"错误：无法打开输入文件 {args.input}：{e.strerror}", file=sys.stderr)
+        return 1
+    finally:
+        if stream is not None and stream is not sys.stdin:
+            stream.close()
+    seconds = time.perf_counter() - start
+    print(f"共 {total_lines} 行，成功 {total_lines - total_errors} 行，出错 {total_errors} 行；"
+          f"耗时 {seconds:.2f} 秒，{total_lines / seconds if seconds else 0:,.0f} 行/秒"
+          f"（{args.workers} 个进程，每块 {args.chunk_size} 行）", file=sys.stderr)
+    return 0
+
+
+def run_benchmark(repeat=20000):
+    """
+    基准测试：同一批公式反复计算，对比不缓存（每次都重新解析）和缓存编译结果的速度
+    用法：python 01.py bench [次数]
+    """
+    formulas = ["1+2*3", "(1+2)*3", "3.14+5.28", "10/2-3", "((12.5-3)*4+7/2)*(8-6.25)/3",
+                "1+2+3+4+5+6+7+8+9+10", "(100-37.5)/(2.5*4)+0.125"]
+
+    def measure(label, func):
+        start = time.perf_counter()
+        for i in range(repeat):
+            func(i)
+        seconds = time.perf_counter() - start
+        print(f"{label:<28}{repeat / seconds:>12,.0f} 次/秒")
+        return seconds
+
+    uncached = SimpleCalculator(cache_size=0)  # 不缓存：每次都重新解析
+    cached = SimpleCalculator()
+    slow = measure("不缓存（每次重新解析）", lambda i: uncached.calculate(formulas[i % len(formulas)]))
+    fast = measure("缓存编译结果", lambda i: cached.calculate(formulas[i % len(formulas)]))
+    compiled, _ = cached.compile("price*(1+rate)-discount")
+    measure("编译一次，带入不同变量", lambda i: compiled.evaluate({"price": i, "rate": 0.13, "discount": 5}))
+    print(f"缓存后快了 {slow / fast:.1f} 倍；缓存统计：{cached.cache_stats()}")
+
+
+def run_column_benchmark(rows=1000000):
+    """
+    按列计算的基准测试：同一个公式算 rows 行，对比逐行调用 evaluate 和按整列计算
+    用法：python 01.py bench-columns [行数]
+    """
+    import random
+    random.seed(1)
+    compiled, _ = SimpleCalculator().compile("(price*qty-discount)/qty*(1+rate)")
+    columns = {
+        "price": array('d', (random.uniform(1, 100) for _ in range(rows))),
+        "qty": array('d', (float(random.randint(0, 20)) for _ in range(rows))),  # 有 0：除数是0的行会被标记出来
+        "discount": array('d', (random.uniform(0, 5) for _ in range(rows))),
+        "rate": array('d', (random.uniform(0, 0.2) for _ in range(rows))),
+    }
+    names = list(columns)
+
+    def measure(label, func):
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        print(f"{label:<24}{rows / seconds:>14,.0f} 行/秒")
+        return result
+
+    loop_rows = min(rows, 200000)  # 逐行太慢，只算一部分再按比例换算
+    start = time.perf_counter()
+    for i in range(loop_rows):
+        compiled.evaluate({name: columns[name][i] for name in names})
+    print(f"{'逐行 evaluate':<24}{loop_rows / (time.perf_counter() - start):>14,.0f} 行/秒")
+    values, errors, _ = measure("按列（标准库 array）", lambda: compiled.evaluate_columns(columns, use_numpy=False))
+    print(f"除数是0的行：{sum(errors)}")
+    if numpy is not None:
+        numpy_columns = {name: numpy.asarray(column) for name, column in columns.items()}
+        numpy_values, numpy_errors, _ = measure("按列（NumPy）", lambda: compiled.evaluate_columns(numpy_columns))
+        assert numpy.array_equal(numpy_errors, numpy.frombuffer(errors, dtype=numpy.int8).astype(bool))
+        assert numpy.allclose(numpy_values, numpy.frombuffer(values), equal_nan=True)
+    else:
+        print("没装 NumPy，跳过 NumPy 模式")
+
+
+def run_scan_benchmark(max_size=10_000_000):
+    """
+    长表达式的基准测试：1KB 到 10MB 的机器生成表达式，分别统计编译（词法分析+转后缀）和计算的耗时，
+    每 MB 的耗时基本不变，说明耗时和长度成正比（线性）
+    用法：python 01.py bench-scan [最大字节数]
+    """
+    import random
+    random.seed(1)
+    terms = ["3.25", "-7", "1.5e3", "2.5E-4", "(12-4.75)", "-(6*0.5)", "42", "0.125"]
+    calc = SimpleCalculator(cache_size=0)  # 不缓存：每次都完整编译
+    print(f"{'长度':>12}{'编译秒':>10}{'计算秒':>10}{'编译 MB/秒':>14}")
+    size = 1000
+    while size <= max_size:
+        pieces = []
+        length = 0
+        while length < size:
+            piece = random.choice(terms) + random.choice("+-*")  # 不用除号，免得中途出现除数是0
+            pieces.append(piece)
+            length += len(piece)
+        expression = "".join(pieces) + "1"
+        start = time.perf_counter()
+        compiled, error = calc.compile(expression)
+        compile_seconds = time.perf_counter() - start
+        assert not error, error
+        start = time.perf_counter()
+        compiled.evaluate()
+        evaluate_seconds = time.perf_counter() - start
+        print(f"{len(expression):>12,}{compile_seconds:>10.4f}{evaluate_seconds:>10.4f}"
+              f"{len(expression) / compile_seconds / 1e6:>14.2f}")
+        size *= 10
 
 
 # ------------------- 小白怎么用？看这里！-------------------
 if __name__ == "__main__":
-    print("🎉 计算器（支持 +-*/ 和括号）")
-    print("📌 示例：1+2*3、(1+2)*3、3.14+5.28、10/2-3")
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        run_benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 20000)
+        sys.exit()
+    if len(sys.argv) > 1 and sys.argv[1] == "bench-columns":
+        run_column_benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 1000000)
+        sys.exit()
+    if len(sys.argv) > 1 and sys.argv[1] == "bench-scan":
+        run_scan_benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 10_000_000)
+        sys.exit()
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        sys.exit(run_batch(sys.argv[2:]))
+
+    print("🎉 计算器（支持 +-*/、负数、科学计数法和括号）")
+    print("📌 示例：1+2*3、(1+2)*3、3.14+5.28、10/2-3、-2*(3-5)、1.5e3/4")
     print("🔚 输入 'q' 或 'quit' 退出")
     print("-" * 50)
 
@@ -144,9 +613,3 @@ if __name__ == "__main__":
 
         # 输出结果
         print(f"结果：{result}\n")
-
-
-
-
-
-
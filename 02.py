@@ -1,5 +1,18 @@
 #任务: 写一个 “质数判断工具”（输入数字，判断是否为质数）。
 import math
+import re
+import sys
+import time
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import compress
+
+try:
+    import numpy  # 可选：装了 NumPy 时筛选、计数、取质数都更快，没装就用标准库的 bytearray
+except ImportError:
+    numpy = None
 
 #质数（也叫素数）指：大于 1 的整数，除了 1 和它自己，再也没有其他能整除它的数。
 class Prime_number_judgment_tool:
@@ -31,7 +44,277 @@ class Prime_number_judgment_tool:
 
 
 
+# ------------------- 分段筛法（批量找质数）-------------------
+# 埃氏筛：把 2、3、5…… 的倍数都划掉，剩下的就是质数。一次筛到 10^12 需要 1TB 内存，做不到，
+# 所以分段：先筛出 √b 以内的质数（10^12 也只要筛到 10^6），再把 [a, b] 切成一段一段，每段只占固定大小的内存，
+# 用这些小质数把这一段里的合数划掉。
+# 每段只存奇数（偶数除了2都不是质数），内存和计算量都减半：第 i 个位置表示 lo + 2*i 是不是质数。
+# 划掉倍数用切片赋值 seg[开始::p] = 0，循环在 C 里执行，Python 只按“小质数”循环。
+
+@lru_cache(maxsize=8)
+def base_primes(limit):
+    """limit 以内的奇质数（普通埃氏筛，用来筛各个分段；每个进程只算一次）"""
+    if limit < 3:
+        return []
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(limit) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit + 1, i)))
+    return list(compress(range(3, limit + 1, 2), sieve[3::2]))
+
+
+@lru_cache(maxsize=8)
+def base_primes_array(limit):
+    """base_primes 的 NumPy 数组版本"""
+    return numpy.array(base_primes(limit), dtype=numpy.int64)
+
+
+def _mark_large_primes(seg, lo, hi, primes):
+    """
+    NumPy：一次划掉一批“大”质数的倍数。大质数在一段里只有几个倍数，一个一个循环的话 Python 的开销比划掉本身还大，
+    所以先算出每个质数在这一段里的全部倍数的位置（二维数组），再一次性赋值
+    """
+    primes = primes[primes * primes < hi]
+    if len(primes) == 0:
+        return
+    start = numpy.maximum(primes * primes, (lo + primes - 1) // primes * primes)
+    start += (start % 2 == 0) * primes  # 第一个奇数倍
+    index = (start - lo) // 2
+    most = (len(seg) - 1) // int(primes[0]) + 1  # 每个质数最多有几个倍数在这一段里
+    positions = (index[:, None] + primes[:, None] * numpy.arange(most)).ravel()
+    seg[positions[positions < len(seg)]] = False
+
+
+def sieve_segment(lo, hi, limit, use_numpy):
+    """
+    筛一段：返回 [lo, hi) 里奇数的标记，第 i 个是 1/True 表示 lo + 2*i 是质数（lo 必须是奇数）
+    limit：用 limit 以内的质数来筛（不小于整个查询范围终点的平方根）
+    """
+    size = (hi - lo + 1) // 2
+    primes = base_primes(limit)
+    if use_numpy:
+        seg = numpy.ones(size, dtype=bool)
+        # 在这一段里倍数不超过8个的质数一次性处理，剩下的小质数再一个一个循环
+        large = bisect_left(primes, max(size // 8, 3))
+        _mark_large_primes(seg, lo, hi, base_primes_array(limit)[large:])
+        primes = primes[:large]
+    else:
+        seg = bytearray([1]) * size
+    for p in primes:
+        if p * p >= hi:
+            break
+        # 这一段里第一个要划掉的倍数：不小于 p*p（更小的倍数已经被更小的质数划掉了），并且是奇数
+        start = max(p * p, (lo + p - 1) // p * p)
+        if start % 2 == 0:
+            start += p
+        if start >= hi:
+            continue
+        index = (start - lo) // 2  # 奇数之间相差2，p 的奇数倍之间相差 2p，在这里正好隔 p 个位置
+        if use_numpy:
+            seg[index::p] = False
+        else:
+            seg[index::p] = bytes((size - 1 - index) // p + 1)
+    if lo == 1:
+        seg[0] = 0  # 1 不是质数
+    return seg
+
+
+def _count_segment(lo, hi, limit, use_numpy):
+    seg = sieve_segment(lo, hi, limit, use_numpy)
+    return int(numpy.count_nonzero(seg)) if use_numpy else seg.count(1)
+
+
+def _list_segment(lo, hi, limit, use_numpy):
+    seg = sieve_segment(lo, hi, limit, use_numpy)
+    if use_numpy:
+        return (numpy.flatnonzero(seg) * 2 + lo).tolist()
+    return list(compress(range(lo, hi, 2), seg))
+
+
+class SegmentedSieve:
+    """
+    分段筛：回答“[a, b] 里有哪些质数”“[a, b] 里有几个质数”“第 n 个质数是多少”，范围可以到 10^12
+    segment_size：每段多少个奇数（每段占用的内存，默认 100 万，约 1MB）
+    workers：用几个进程同时筛不同的段（默认1，不开子进程）
+    use_numpy：None 表示装了 NumPy 就用
+    """
+    def __init__(self, segment_size=1_000_000, workers=1, use_numpy=None):
+        if segment_size < 1:
+            raise ValueError(f"每段大小（segment_size）必须大于等于1，收到 {segment_size}")
+        self.segment_size = segment_size
+        self.workers = workers
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+
+    def _segments(self, a, b):
+        """把 [a, b] 里的奇数切成一段一段：(lo, hi)，lo 是奇数，不含 hi"""
+        lo = max(a, 1)
+        if lo % 2 == 0:
+            lo += 1
+        while lo <= b:
+            hi = min(lo + 2 * self.segment_size, b + 1)
+            yield lo, hi
+            lo = hi if hi % 2 else hi + 1
+
+    def _map(self, func, a, b):
+        """对每一段执行 func，按段的顺序返回结果；多进程时同时在算的段数有上限（进程数的2倍），内存固定"""
+        limit = math.isqrt(b)
+        segments = self._segments(a, b)
+        if self.workers <= 1:
+            for lo, hi in segments:
+                yield func(lo, hi, limit, self.use_numpy)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            for lo, hi in segments:
+                pending.append(pool.submit(func, lo, hi, limit, self.use_numpy))
+                if len(pending) >= self.workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def count(self, a, b):
+        """[a, b] 里有几个质数"""
+        if b < 2 or a > b:
+            return 0
+        total = 1 if a <= 2 <= b else 0
+        return total + sum(self._map(_count_segment, a, b))
+
+    def iter_primes(self, a, b):
+        """从小到大依次返回 [a, b] 里的质数（一段一段地算，范围再大内存也是固定的）"""
+        if b < 2 or a > b:
+            return
+        if a <= 2 <= b:
+            yield 2
+        for primes in self._map(_list_segment, a, b):
+            yield from primes
+
+    def primes(self, a, b):
+        """[a, b] 里的全部质数（列表；范围很大时请用 iter_primes）"""
+        return list(self.iter_primes(a, b))
+
+    def nth(self, n):
+        """第 n 个质数（第1个是2）"""
+        if n < 1:
+            raise ValueError("n 必须大于等于1")
+        if n == 1:
+            return 2
+        # 第 n 个质数的上界：n >= 6 时不超过 n*(ln n + ln ln n)
+        upper = 15 if n < 6 else int(n * (math.log(n) + math.log(math.log(n)))) + 1
+        remaining = n - 1  # 2 已经算过了，剩下的都是奇质数
+        limit = math.isqrt(upper)
+        segments = list(self._segments(3, upper)) if self.workers > 1 else None
+        if segments is None:
+            for lo, hi in self._segments(3, upper):
+                seg = sieve_segment(lo, hi, limit, self.use_numpy)
+                found = int(numpy.count_nonzero(seg)) if self.use_numpy else seg.count(1)
+                if found >= remaining:
+                    return self._pick(seg, lo, remaining)
+                remaining -= found
+        else:
+            for (lo, hi), found in zip(segments, self._map(_count_segment, 3, upper)):
+                if found >= remaining:
+                    return self._pick(sieve_segment(lo, hi, limit, self.use_numpy), lo, remaining)
+                remaining -= found
+        raise AssertionError("上界估计错误")  # 不会走到这里
+
+    def _pick(self, seg, lo, k):
+        """这一段里的第 k 个质数"""
+        if self.use_numpy:
+            return int(numpy.flatnonzero(seg)[k - 1]) * 2 + lo
+        index = -1
+        for _ in range(k):
+            index = seg.index(1, index + 1)
+        return lo + 2 * index
+
+
+def run_benchmark(workers=1):
+    """
+    分段筛的基准测试：不同大小、不同位置的范围，分别用 bytearray 和 NumPy 计数
+    用法：python 02.py bench [--workers N]
+    """
+    ranges = [(1, 10**6), (1, 10**7), (1, 10**8), (10**12, 10**12 + 10**6), (10**12, 10**12 + 10**7),
+              (10**12, 10**12 + 10**8)]
+    modes = [("bytearray", False)] + ([("NumPy", True)] if numpy is not None else [])
+    for name, use_numpy in modes:
+        sieve = SegmentedSieve(workers=workers, use_numpy=use_numpy)
+        print(f"--- {name}，{workers} 个进程 ---")
+        for a, b in ranges:
+            start = time.perf_counter()
+            count = sieve.count(a, b)
+            seconds = time.perf_counter() - start
+            print(f"[{a:,}, {b:,}]：{count:,} 个质数，{seconds:.3f} 秒，{(b - a + 1) / seconds / 1e6:,.1f} 百万个数/秒")
+        start = time.perf_counter()
+        value = sieve.nth(10**6)
+        print(f"第 1,000,000 个质数：{value:,}，{time.perf_counter() - start:.3f} 秒")
+
+
+def parse_number(text):
+    """
+    命令行里的数字，支持 1e12、1e+12、10**12、1_000_000 这种写法，以及用 + 连起来的和（比如 1e12+1000）
+    e/E 后面紧跟的 + 是指数的符号，不是加号
+    """
+    parts = re.split(r"(?<![eE])\+", text)
+    if len(parts) > 1:
+        return sum(parse_number(part) for part in parts)
+    if "**" in text:
+        base, exponent = text.split("**")
+        return int(base) ** int(exponent)
+    if "e" in text.lower():
+        return int(float(text))
+    return int(text)
+
+
+def run_cli(argv):
+    """
+    命令行用法：
+        python 02.py count 1 1e12          # [a, b] 里有几个质数
+        python 02.py list 1e12 1e12+1000   # 列出 [a, b] 里的质数（每行一个）
+        python 02.py nth 1000000           # 第 n 个质数
+        python 02.py bench                 # 基准测试
+    都可以加 --workers N（多进程）、--no-numpy（不用 NumPy）、--segment-size N
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="python 02.py", description="分段筛：批量找质数")
+    parser.add_argument("command", choices=["count", "list", "nth", "bench"])
+    parser.add_argument("numbers", nargs="*", type=str, help="count/list：a b；nth：n")
+    parser.add_argument("--workers", type=int, default=1, help="进程数（默认1）")
+    parser.add_argument("--segment-size", type=int, default=1_000_000, help="每段多少个奇数（默认100万）")
+    parser.add_argument("--no-numpy", action="store_true", help="不用 NumPy（对比速度用）")
+    args = parser.parse_args(argv)
+    if args.command == "bench":
+        run_benchmark(args.workers)
+        return
+    numbers = []
+    for text in args.numbers:
+        try:
+            numbers.append(parse_number(text))
+        except (ValueError, OverflowError):
+            parser.error(f"不是合法的数字：{text}")
+    expected = 1 if args.command == "nth" else 2
+    if len(numbers) != expected:
+        parser.error(f"{args.command} 需要 {expected} 个数字")
+    if args.command == "nth" and numbers[0] < 1:
+        parser.error("nth 的 n 必须大于等于1")
+    try:
+        sieve = SegmentedSieve(segment_size=args.segment_size, workers=args.workers,
+                               use_numpy=False if args.no_numpy else None)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.command == "count":
+        print(sieve.count(*numbers))
+    elif args.command == "nth":
+        print(sieve.nth(numbers[0]))
+    else:
+        for prime in sieve.iter_primes(*numbers):
+            print(prime)
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_cli(sys.argv[1:])
+        sys.exit()
+
     print("🎉 素数判断工具")
     # 创建类的实例
     prime_tool = Prime_number_judgment_tool()
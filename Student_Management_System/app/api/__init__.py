@@ -1,4 +1,8 @@
 from .auth import router as auth_router
 from .students import router as students_router
+from .clazzes import router as clazzes_router
+from .courses import router as courses_router
+from .scores import router as scores_router
+from .metrics import router as metrics_router, prometheus_router
 
-__all__ = ["auth_router", "students_router"]
\ No newline at end of file
+__all__ = ["auth_router", "students_router", "clazzes_router", "courses_router", "scores_router", "metrics_router", "prometheus_router"]
\ No newline at end of file
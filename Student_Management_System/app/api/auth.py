@@ -1,7 +1,11 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+import math
+from fastapi import APIRouter, HTTPException, Request, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, timedelta
+from sqlalchemy import select
+from datetime import datetime, timedelta, timezone
+import time
+import uuid
 from jwt  import PyJWTError
 import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,6 +14,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from Student_Management_System.app.config import settings
 from Student_Management_System.app.database import get_db
+from Student_Management_System.app.dependencies import oauth2_scheme, get_current_user, role_required, \
+    auth_cache_stats, decode_token, invalidate_user, Principal
+from Student_Management_System.app.ratelimit import check_login_rate, refund_login_rate, login_rate_stats
+from Student_Management_System.app.revocation import revocations, revoke_token, revoke_user
+from Student_Management_System.app.passwords import password_hasher
 from Student_Management_System.app.models import User
 from Student_Management_System.app.schemas.user import TokenData, Token
 
@@ -22,9 +31,10 @@ router = APIRouter(
 # 工具函数：生成JWT Token（登录成功后调用）
 def create_access_token(data: dict):
     to_encode = data.copy()
-    # 设置Token过期时间（当前时间+配置里的有效期）
-    expire = datetime.now() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # 设置Token过期时间（当前时间+配置里的有效期；用UTC时间，JWT 的 exp 按UTC解析）
+    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
+    # jti：Token编号（注销单个Token用）；iat：签发时间（注销用户全部Token用，带小数，同一秒内也分得清先后）
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex, "iat": time.time()})
     # 加密生成Token
     encoded_jwt = jwt.encode(
         to_encode,
@@ -36,6 +46,7 @@ def create_access_token(data: dict):
 # 登录接口
 @router.post("/login", response_model=Token, summary="用户登录")
 async def login(
+    request: Request,
     db: AsyncSession = Depends(get_db),  # 依赖：获取数据库会话
     form_data: OAuth2PasswordRequestForm = Depends()  # 接收用户名密码（支持表单提交，测试方便）
 ):
@@ -44,16 +55,26 @@ async def login(
     - 输入：username（用户名）、password（密码）
     - 输出：access_token（令牌）、token_type（bearer）
     - 支持管理员、教师、学生登录
+    - 尝试太频繁（同一个IP或同一个用户名）返回429，响应头 Retry-After 是要等待的秒数
     """
+    # 0. 限流：在查数据库、算 bcrypt 之前拦下过多的尝试
+    wait = check_login_rate(request.client.host if request.client else "", form_data.username)
+    if wait > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="登录尝试太频繁，请稍后再试",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
     # 1. 从数据库查询用户名对应的用户
-    user = await db.scalar(db.query(User).filter(User.username == form_data.username))
-    # 2. 验证用户是否存在，密码是否正确
-    if not user or not user.verify_password(form_data.password):
+    user = await db.scalar(select(User).filter(User.username == form_data.username))
+    # 2. 验证用户是否存在，密码是否正确（bcrypt 在线程池里算，不阻塞其他请求）
+    if not user or not await password_hasher.verify(form_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="用户名或密码错误",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    refund_login_rate(form_data.username)  # 密码正确：不占用这个用户名的尝试次数
     # 3. 生成Token（存用户ID和角色）
     access_token = create_access_token(
         data={"sub": str(user.id), "role": user.role}
@@ -61,8 +82,61 @@ async def login(
     # 4. 返回Token
     return {"access_token": access_token, "token_type": "bearer"}
 
-# 注销接口（实际JWT是无状态的，客户端删除Token即可）
+# 注销接口：当前Token立即失效
 @router.post("/logout", summary="用户注销")
-async def logout():
-    """注销接口：客户端直接删除Token即可，服务器无需额外处理"""
-    return {"code": 200, "msg": "注销成功"}
\ No newline at end of file
+async def logout(
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: Principal = Depends(get_current_user)  # 已经注销过的Token会在这里被拦下（401）
+):
+    """注销接口：服务器记住这个Token已注销，之后再用它访问会返回401（客户端也要删掉它）"""
+    claims = decode_token(token)
+    if claims.jti is None:
+        # 旧版本签发的Token没有编号，只能注销这个用户的全部Token
+        await revoke_user(db, current_user.id)
+    else:
+        await revoke_token(db, current_user.id, claims.jti, claims.exp)
+    return {"code": 200, "msg": "注销成功"}
+
+
+# 注销某个用户的全部登录（仅管理员），比如账号被盗、改了权限
+@router.post("/users/{user_id}/revoke", summary="注销用户的全部登录")
+async def revoke_user_sessions(
+    user_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(role_required(["admin"]))
+):
+    """这个时间之前签发给该用户的Token全部失效，用户需要重新登录"""
+    if await db.scalar(select(User.id).where(User.id == user_id)) is None:
+        raise HTTPException(status_code=404, detail=f"用户ID{user_id}不存在")
+    await revoke_user(db, user_id)
+    invalidate_user(user_id)
+    return {"code": 200, "msg": f"用户ID{user_id}的全部登录已注销"}
+
+
+# Token注销名单的统计（仅管理员）
+@router.get("/revocations/stats", summary="Token注销名单统计")
+async def revocation_stats(current_user: User = Depends(role_required(["admin"]))):
+    """revoked_tokens：注销的单个Token数；revoked_users：全部注销的用户数；memory_bytes：估算占用内存（字节）"""
+    return revocations.stats()
+
+
+# 密码加密线程池的统计数据（仅管理员）
+@router.get("/password-hasher/stats", summary="密码加密线程池统计")
+async def password_hasher_stats(current_user: User = Depends(role_required(["admin"]))):
+    """排队数量、拒绝次数、平均/最大排队时间和计算时间（秒）"""
+    return password_hasher.stats()
+
+
+# 登录限流统计（仅管理员）
+@router.get("/login-limiter/stats", summary="登录限流统计")
+async def login_limiter_stats(current_user: User = Depends(role_required(["admin"]))):
+    """ip / username：记录的数量、放行和拒绝次数、LRU淘汰次数、估算占用内存（字节）"""
+    return login_rate_stats()
+
+
+# 登录用户缓存的命中率（仅管理员）
+@router.get("/cache/stats", summary="登录用户缓存统计")
+async def auth_cache_statistics(current_user: User = Depends(role_required(["admin"]))):
+    """principal：用户信息缓存；token：Token解码缓存"""
+    return auth_cache_stats()
\ No newline at end of file
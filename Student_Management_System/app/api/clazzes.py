@@ -0,0 +1,158 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func, exists
+from typing import Optional
+from Student_Management_System.app.database import get_db, get_read_db, mark_written
+from Student_Management_System.app.models import Clazz, User, Student
+from Student_Management_System.app.queries import select_clazzes, select_clazzes_exact, row_to_clazz, fetch_clazz, \
+    recount_students, invalidate_students
+from Student_Management_System.app.schemas.clazz import ClazzCreate, ClazzUpdate, ClazzBase, ClazzPagination
+from Student_Management_System.app.dependencies import role_required
+
+# 创建路由对象
+router = APIRouter(
+    prefix="/api/clazzes",
+    tags=["班级管理"]
+)
+
+
+async def check_teacher(db: AsyncSession, teacher_id: int):
+    """校验班主任：必须是存在的教师账号"""
+    role = await db.scalar(select(User.role).where(User.id == teacher_id))
+    if role != "teacher":
+        raise HTTPException(status_code=400, detail=f"用户ID{teacher_id}不是教师账号")
+
+
+async def check_class_name(db: AsyncSession, class_name: str, exclude_id: Optional[int] = None):
+    """校验班级名称不能重复"""
+    stmt = select(Clazz.id).where(Clazz.class_name == class_name)
+    if exclude_id is not None:
+        stmt = stmt.where(Clazz.id != exclude_id)
+    if await db.scalar(stmt):
+        raise HTTPException(status_code=400, detail=f"班级名称{class_name}已存在")
+
+
+# 1. 查询班级列表（管理员和教师能看），每个班级带学生人数和班主任名字
+@router.get("", response_model=ClazzPagination, summary="查询所有班级")
+async def get_clazzes(
+        db: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(role_required(["admin", "teacher"])),
+        page: int = Query(1, ge=1, description="页码，默认第1页"),
+        size: int = Query(50, ge=1, le=1000, description="每页显示数量，默认50个"),
+        grade: Optional[str] = Query(None, description="按年级筛选（可选）"),
+        major: Optional[str] = Query(None, description="按专业筛选（可选）"),
+        teacher_id: Optional[int] = Query(None, description="按班主任筛选（可选）"),
+        exact: bool = Query(False, description="学生人数是否现算（默认读冗余计数，更快）")
+):
+    conditions = []
+    if grade:
+        conditions.append(Clazz.grade == grade)
+    if major:
+        conditions.append(Clazz.major == major)
+    if teacher_id:
+        conditions.append(Clazz.teacher_id == teacher_id)
+
+    # 一条SQL查出班级、班主任名字、学生人数（不会去加载每个班的学生）
+    stmt = select_clazzes_exact(*conditions) if exact else select_clazzes(*conditions)
+    result = await db.execute(stmt.order_by(Clazz.id).offset((page - 1) * size).limit(size))
+    items = [row_to_clazz(row) for row in result]
+
+    total = await db.scalar(select(func.count(Clazz.id)).where(*conditions))
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": (total + size - 1) // size
+    }
+
+
+# 2. 添加班级（只有管理员能操作）
+@router.post("", response_model=ClazzBase, summary="添加新班级")
+async def create_clazz(
+        clazz_in: ClazzCreate,
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(role_required(["admin"]))
+):
+    await check_class_name(db, clazz_in.class_name)
+    if clazz_in.teacher_id is not None:
+        await check_teacher(db, clazz_in.teacher_id)
+
+    clazz = Clazz(**clazz_in.model_dump(), student_count=0)
+    db.add(clazz)
+    await db.commit()
+    mark_written(("clazz", clazz.id))
+
+    return row_to_clazz(await fetch_clazz(db, clazz.id))
+
+
+# 3. 查询单个班级（管理员和教师能看）
+@router.get("/{clazz_id}", response_model=ClazzBase, summary="查询单个班级")
+async def get_clazz(
+        clazz_id: int,
+        db: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(role_required(["admin", "teacher"]))
+):
+    row = await fetch_clazz(db, clazz_id)
+    if not row:
+        raise HTTPException(status_code=404, detail=f"班级ID{clazz_id}不存在")
+    return row_to_clazz(row)
+
+
+# 4. 更新班级信息（只有管理员能操作）
+@router.put("/{clazz_id}", response_model=ClazzBase, summary="更新班级信息")
+async def update_clazz(
+        clazz_id: int,
+        clazz_in: ClazzUpdate,
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(role_required(["admin"]))
+):
+    update_data = clazz_in.model_dump(exclude_unset=True)
+    if "class_name" in update_data:
+        await check_class_name(db, update_data["class_name"], exclude_id=clazz_id)
+    if update_data.get("teacher_id") is not None:
+        await check_teacher(db, update_data["teacher_id"])
+
+    if update_data:
+        result = await db.execute(update(Clazz).where(Clazz.id == clazz_id).values(**update_data))
+        if result.rowcount == 0:
+            raise HTTPException(status_code=404, detail=f"班级ID{clazz_id}不存在")
+        await db.commit()
+        mark_written(("clazz", clazz_id))
+        if "class_name" in update_data:
+            invalidate_students()  # 学生信息里显示班级名，改名后学生的响应缓存全部失效
+
+    row = await fetch_clazz(db, clazz_id)
+    if not row:
+        raise HTTPException(status_code=404, detail=f"班级ID{clazz_id}不存在")
+    return row_to_clazz(row)
+
+
+# 5. 删除班级（只有管理员能操作，班里还有学生时不能删）
+@router.delete("/{clazz_id}", summary="删除班级")
+async def delete_clazz(
+        clazz_id: int,
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(role_required(["admin"]))
+):
+    # 注意：不要用 db.delete(clazz)，Clazz.students 配置了级联删除，会把班里的学生一起删掉
+    if await db.scalar(select(exists().where(Student.clazz_id == clazz_id))):
+        raise HTTPException(status_code=400, detail=f"班级ID{clazz_id}还有学生，请先转移学生")
+    result = await db.execute(delete(Clazz).where(Clazz.id == clazz_id))
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail=f"班级ID{clazz_id}不存在")
+    await db.commit()
+    mark_written(("clazz", clazz_id))
+    return {"code": 200, "msg": f"班级ID{clazz_id}删除成功"}
+
+
+# 6. 重新统计学生人数（只有管理员能操作，冗余计数和实际不一致时用）
+@router.post("/recount", summary="重新统计班级学生人数")
+async def recount_clazz_students(
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(role_required(["admin"]))
+):
+    changed = await recount_students(db)
+    await db.commit()
+    mark_written()  # 只标记这个请求改了数据（接下来的读请求走主库）
+    return {"code": 200, "msg": f"已修正{changed}个班级的学生人数"}
@@ -0,0 +1,186 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func
+from typing import Optional
+from Student_Management_System.app.database import get_db, get_read_db, mark_written
+from Student_Management_System.app.models import Course, Student, User
+from Student_Management_System.app.queries import select_courses, row_to_course, fetch_course, enroll, drop, \
+    change_capacity, select_my_enrollments, invalidate_course_stats
+from Student_Management_System.app.schemas.course import CourseCreate, CourseUpdate, CourseBase, CoursePagination, \
+    EnrollResult, EnrollmentBase
+from Student_Management_System.app.dependencies import role_required
+from Student_Management_System.app.api.clazzes import check_teacher
+
+# 创建路由对象
+router = APIRouter(
+    prefix="/api/courses",
+    tags=["课程与选课"]
+)
+
+
+async def check_course_name(db: AsyncSession, course_name: str, exclude_id: Optional[int] = None):
+    """校验课程名称不能重复"""
+    stmt = select(Course.id).where(Course.course_name == course_name)
+    if exclude_id is not None:
+        stmt = stmt.where(Course.id != exclude_id)
+    if await db.scalar(stmt):
+        raise HTTPException(status_code=400, detail=f"课程名称{course_name}已存在")
+
+
+async def resolve_student_id(db: AsyncSession, current_user, student_id: Optional[int]) -> int:
+    """
+    选课/退课是给哪个学生操作：学生只能操作自己（忽略传入的 student_id），管理员必须指定 student_id
+    """
+    if current_user.role == "student":
+        own_id = await db.scalar(select(Student.id).where(Student.user_id == current_user.id))
+        if own_id is None:
+            raise HTTPException(status_code=404, detail="当前账号没有对应的学生信息")
+        return own_id
+    if student_id is None:
+        raise HTTPException(status_code=400, detail="管理员操作时请指定 student_id")
+    if not await db.scalar(select(Student.id).where(Student.id == student_id)):
+        raise HTTPException(status_code=404, detail=f"学生ID{student_id}不存在")
+    return student_id
+
+
+# 1. 查询课程列表（所有登录用户都能看，选课前要看剩余名额）
+@router.get("", response_model=CoursePagination, summary="查询所有课程")
+async def get_courses(
+        db: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(role_required(["admin", "teacher", "student"])),
+        page: int = Query(1, ge=1, description="页码，默认第1页"),
+        size: int = Query(50, ge=1, le=1000, description="每页显示数量，默认50个"),
+        teacher_id: Optional[int] = Query(None, description="按任课老师筛选（可选）"),
+        available: bool = Query(False, description="只看还有名额的课程")
+):
+    conditions = []
+    if teacher_id:
+        conditions.append(Course.teacher_id == teacher_id)
+    if available:
+        conditions.append(Course.enrolled_count < Course.capacity)
+
+    result = await db.execute(select_courses(*conditions).order_by(Course.id).offset((page - 1) * size).limit(size))
+    items = [row_to_course(row) for row in result]
+
+    total = await db.scalar(select(func.count(Course.id)).where(*conditions))
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": (total + size - 1) // size
+    }
+
+
+# 2. 添加课程（只有管理员能操作）
+@router.post("", response_model=CourseBase, summary="添加新课程")
+async def create_course(
+        course_in: CourseCreate,
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(role_required(["admin"]))
+):
+    await check_course_name(db, course_in.course_name)
+    if course_in.teacher_id is not None:
+        await check_teacher(db, course_in.teacher_id)
+
+    course = Course(**course_in.model_dump(), enrolled_count=0)
+    db.add(course)
+    await db.commit()
+    mark_written(("course", course.id))
+
+    return row_to_course(await fetch_course(db, course.id))
+
+
+# 3. 我的选课（学生查自己的，管理员指定 student_id）：一条SQL查出全部课程和候补位置
+@router.get("/enrollments/me", response_model=list[EnrollmentBase], summary="我的选课")
+async def my_enrollments(
+        student_id: Optional[int] = Query(None, description="学生ID（管理员查询时必填，学生不用填）"),
+        db: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(role_required(["admin", "student"]))
+):
+    student_id = await resolve_student_id(db, current_user, student_id)
+    result = await db.execute(select_my_enrollments(student_id))
+    return [EnrollmentBase(**row._mapping) for row in result]
+
+
+# 4. 查询单个课程（所有登录用户都能看）
+@router.get("/{course_id}", response_model=CourseBase, summary="查询单个课程")
+async def get_course(
+        course_id: int,
+        db: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(role_required(["admin", "teacher", "student"]))
+):
+    row = await fetch_course(db, course_id)
+    if not row:
+        raise HTTPException(status_code=404, detail=f"课程ID{course_id}不存在")
+    return row_to_course(row)
+
+
+# 5. 更新课程信息（只有管理员能操作），扩容时自动从候补里补人
+@router.put("/{course_id}", response_model=CourseBase, summary="更新课程信息")
+async def update_course(
+        course_id: int,
+        course_in: CourseUpdate,
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(role_required(["admin"]))
+):
+    update_data = course_in.model_dump(exclude_unset=True)
+    if "course_name" in update_data:
+        await check_course_name(db, update_data["course_name"], exclude_id=course_id)
+    if update_data.get("teacher_id") is not None:
+        await check_teacher(db, update_data["teacher_id"])
+
+    capacity = update_data.pop("capacity", None)
+    if capacity is not None:
+        await change_capacity(db, course_id, capacity)
+    if update_data:
+        result = await db.execute(update(Course).where(Course.id == course_id).values(**update_data))
+        if result.rowcount == 0:
+            raise HTTPException(status_code=404, detail=f"课程ID{course_id}不存在")
+    await db.commit()
+    mark_written(("course", course_id))
+
+    row = await fetch_course(db, course_id)
+    if not row:
+        raise HTTPException(status_code=404, detail=f"课程ID{course_id}不存在")
+    return row_to_course(row)
+
+
+# 6. 删除课程（只有管理员能操作），选课记录和成绩由外键级联删除
+@router.delete("/{course_id}", summary="删除课程")
+async def delete_course(
+        course_id: int,
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(role_required(["admin"]))
+):
+    result = await db.execute(delete(Course).where(Course.id == course_id))
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail=f"课程ID{course_id}不存在")
+    await db.commit()
+    invalidate_course_stats(course_id)
+    return {"code": 200, "msg": f"课程ID{course_id}删除成功"}
+
+
+# 7. 选课（学生给自己选，管理员代选）：有名额直接选上，满了进候补
+@router.post("/{course_id}/enroll", response_model=EnrollResult, summary="选课")
+async def enroll_course(
+        course_id: int,
+        student_id: Optional[int] = Query(None, description="学生ID（管理员代选时必填，学生不用填）"),
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(role_required(["admin", "student"]))
+):
+    student_id = await resolve_student_id(db, current_user, student_id)
+    return await enroll(db, course_id, student_id)
+
+
+# 8. 退课（学生给自己退，管理员代退）：退出的名额由候补第一位补上
+@router.delete("/{course_id}/enroll", summary="退课")
+async def drop_course(
+        course_id: int,
+        student_id: Optional[int] = Query(None, description="学生ID（管理员代退时必填，学生不用填）"),
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(role_required(["admin", "student"]))
+):
+    student_id = await resolve_student_id(db, current_user, student_id)
+    result = await drop(db, course_id, student_id)
+    return {"code": 200, "msg": f"课程ID{course_id}退课成功", **result}
@@ -0,0 +1,77 @@
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from Student_Management_System.app.bootstrap import startup_timer
+from Student_Management_System.app.config import settings
+from Student_Management_System.app.database import engine, replica_engine, read_routing
+from Student_Management_System.app.dependencies import role_required, auth_cache_stats
+from Student_Management_System.app.metrics import pool_stats, render_prometheus
+from Student_Management_System.app.passwords import password_hasher
+from Student_Management_System.app.ratelimit import login_rate_stats
+from Student_Management_System.app.revocation import revocations
+from Student_Management_System.app.models import User
+
+# 创建路由对象
+router = APIRouter(
+    prefix="/api/metrics",
+    tags=["运行监控"]
+)
+
+# Prometheus 抓取地址固定是 /metrics（不加 /api 前缀）
+# 不用管理员登录：Prometheus 没法定时登录换 JWT（Token 会过期），所以用配置里的固定令牌 METRICS_TOKEN 校验；
+# 没配置令牌时不校验，这时 /metrics 只能在内网开放（指标里没有学生数据，但有接口路由、连接池等运行信息）
+prometheus_router = APIRouter(tags=["运行监控"])
+
+
+def metrics_token_required(authorization: str = Header(None)):
+    """配置了 METRICS_TOKEN 时，要求请求头 Authorization: Bearer <令牌>"""
+    if not settings.METRICS_TOKEN:
+        return
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="指标令牌错误",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+# 数据库连接池状态（仅管理员）
+@router.get("/pool", summary="数据库连接池状态")
+async def database_pool_stats(current_user: User = Depends(role_required(["admin"]))):
+    """
+    - checked_out：正在使用的连接数；overflow：超出 pool_size 的连接数
+    - wait_avg / wait_max：取连接的平均/最大等待时间（秒），持续变大说明连接池不够用
+    - pre_ping_failures：取连接时发现连接已失效的次数
+    - replica：只读副本的连接池（没配置副本时为空）；read_routing：只读会话走主库/副本的次数
+    注意：等待时间等累计数据是主库和副本合在一起统计的
+    """
+    stats = pool_stats(engine)
+    stats["replica"] = pool_stats(replica_engine) if replica_engine is not engine else None
+    stats["read_routing"] = dict(read_routing)
+    return stats
+
+
+# Prometheus 指标
+@prometheus_router.get("/metrics", response_class=PlainTextResponse, summary="Prometheus 指标",
+                       dependencies=[Depends(metrics_token_required)])
+async def prometheus_metrics():
+    extra = {}
+    for key, value in password_hasher.stats().items():
+        if isinstance(value, (int, float)):
+            extra[f"password_hasher_{key}"] = value
+    for cache_name, stats in auth_cache_stats().items():
+        for key, value in stats.items():
+            extra[f"auth_cache_{cache_name}_{key}"] = value
+    for target, value in read_routing.items():
+        extra[f'db_read_sessions_total{{target="{target}"}}'] = value
+    for limiter_name, stats in login_rate_stats().items():
+        for key, value in stats.items():
+            extra[f'login_limiter_{key}{{by="{limiter_name}"}}'] = value
+    for key, value in revocations.stats().items():
+        extra[f"token_revocation_{key}"] = value
+    for phase, seconds in startup_timer.as_dict().items():
+        extra[f'startup_phase_seconds{{phase="{phase}"}}'] = seconds
+    return render_prometheus(pool_stats(engine), extra)
@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import Optional
+from Student_Management_System.app.database import get_db, get_read_db
+from Student_Management_System.app.models import Course, Student, User
+from Student_Management_System.app.queries import upsert_scores_statement, compute_stats, compute_ranking, \
+    invalidate_course_stats
+from Student_Management_System.app.schemas.score import ScoreBulkCreate, ScoreBulkResult, ScoreStats, ScoreRanking
+from Student_Management_System.app.dependencies import role_required
+
+# 创建路由对象
+router = APIRouter(
+    prefix="/api/scores",
+    tags=["成绩管理"]
+)
+
+# 每条 INSERT 最多写多少行
+UPSERT_BATCH_SIZE = 1000
+
+
+# 1. 批量录入成绩（管理员和教师），已有成绩会被覆盖
+@router.post("/bulk", response_model=ScoreBulkResult, summary="批量录入成绩")
+async def bulk_save_scores(
+        scores_in: ScoreBulkCreate,
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(role_required(["admin", "teacher"]))
+):
+    if not await db.get(Course, scores_in.course_id):
+        raise HTTPException(status_code=400, detail=f"课程ID{scores_in.course_id}不存在")
+
+    # 一条 IN 查询校验所有学生（存在，并且在指定班级里）
+    student_ids = {entry.student_id for entry in scores_in.scores}
+    rows = await db.execute(select(Student.id, Student.clazz_id).where(Student.id.in_(student_ids)))
+    clazz_of = dict(rows.all())
+
+    errors = []
+    valid = {}  # 同一个学生提交了多次，以最后一次为准
+    for entry in scores_in.scores:
+        if entry.student_id not in clazz_of:
+            errors.append({"student_id": entry.student_id, "error": f"学生ID{entry.student_id}不存在"})
+        elif scores_in.clazz_id and clazz_of[entry.student_id] != scores_in.clazz_id:
+            errors.append({"student_id": entry.student_id, "error": f"学生不在班级ID{scores_in.clazz_id}里"})
+        else:
+            valid[entry.student_id] = entry.score
+
+    # 多行 INSERT ... ON DUPLICATE KEY UPDATE / ON CONFLICT，分批写入，同一个事务
+    rows = [{"student_id": sid, "course_id": scores_in.course_id, "exam": scores_in.exam, "score": score}
+            for sid, score in valid.items()]
+    dialect = db.bind.dialect.name
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        await db.execute(upsert_scores_statement(dialect, rows[i:i + UPSERT_BATCH_SIZE]))
+    await db.commit()
+    invalidate_course_stats(scores_in.course_id)  # 这门课的统计缓存失效
+
+    return {"total": len(scores_in.scores), "saved": len(rows), "errors": errors}
+
+
+# 2. 成绩统计（管理员和教师）：平均分、中位数、标准差、百分位数、等级分布
+@router.get("/stats", response_model=ScoreStats, summary="成绩统计")
+async def score_stats(
+        course_id: int = Query(..., description="课程ID"),
+        exam: str = Query(..., description="考试名称"),
+        clazz_id: Optional[int] = Query(None, description="班级ID（不传统计全部班级）"),
+        db: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(role_required(["admin", "teacher"]))
+):
+    return await compute_stats(db, course_id, exam, clazz_id)
+
+
+# 3. 成绩排名（管理员和教师）：班内排名 + 全部学生排名
+@router.get("/ranking", response_model=ScoreRanking, summary="成绩排名")
+async def score_ranking(
+        course_id: int = Query(..., description="课程ID"),
+        exam: str = Query(..., description="考试名称"),
+        clazz_id: Optional[int] = Query(None, description="只看某个班级（可选）"),
+        page: int = Query(1, ge=1, description="页码，默认第1页"),
+        size: int = Query(50, ge=1, le=500, description="每页显示数量，默认50个"),
+        db: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(role_required(["admin", "teacher"]))
+):
+    return await compute_ranking(db, course_id, exam, clazz_id, page, size)
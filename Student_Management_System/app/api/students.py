@@ -1,11 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Header, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, update, func, or_, and_
 from typing import Optional
-from Student_Management_System.app.database import get_db
+from Student_Management_System.app.database import get_db, get_read_db, read_from_primary, mark_written, \
+    AsyncSessionLocal, ReadSessionLocal
+from Student_Management_System.app.pagination import encode_cursor, decode_cursor, count_rows
+from Student_Management_System.app.queries import student_filters, select_students, fetch_student, \
+    get_cached_student, invalidate_students, adjust_student_counts, count_by_clazz, \
+    release_enrollments, score_course_ids, invalidate_course_stats
+from Student_Management_System.app.passwords import password_hasher
+from Student_Management_System.app.search import SEARCH_FIELDS, search_conditions, relevance, reindex_students, \
+    rebuild_search_index
+from Student_Management_System.app.serialization import FastJSONResponse, student_row_dict
+from Student_Management_System.app.exporter import EXPORT_COLUMNS, export_students
+from Student_Management_System.app.importer import StudentImporter, iter_lines, iter_records
 from Student_Management_System.app.models import Student, User, Clazz
-from Student_Management_System.app.schemas.student import StudentCreate, StudentUpdate, StudentBase, StudentPagination
-from Student_Management_System.app.dependencies import get_current_user, role_required
+from Student_Management_System.app.schemas.student import StudentCreate, StudentUpdate, StudentBase, StudentPagination, \
+    StudentSortEnum, CountModeEnum, DataFormatEnum, StudentImportResult, StudentBatchUpdate, StudentBatchResult
+from Student_Management_System.app.dependencies import get_current_user, role_required, invalidate_user
 
 # 创建路由对象
 router = APIRouter(
@@ -17,55 +30,72 @@ router = APIRouter(
 # 1. 查询学生列表（管理员和教师能看，支持分页、搜索）
 @router.get("", response_model=StudentPagination, summary="查询所有学生")
 async def get_students(
-        db: AsyncSession = Depends(get_db),
+        db: AsyncSession = Depends(get_read_db),
         # 权限控制：只允许admin和teacher访问
         current_user: User = Depends(role_required(["admin", "teacher"])),
-        page: int = Query(1, ge=1, description="页码，默认第1页"),
+        page: int = Query(1, ge=1, description="页码，默认第1页（传了cursor时忽略）"),
         size: int = Query(10, ge=1, le=100, description="每页显示数量，默认10个"),
         name: Optional[str] = Query(None, description="按姓名模糊搜索（可选）"),
-        clazz_id: Optional[int] = Query(None, description="按班级ID筛选（可选）")
+        clazz_id: Optional[int] = Query(None, description="按班级ID筛选（可选）"),
+        cursor: Optional[str] = Query(None, description="游标分页：传上一页返回的next_cursor（可选）"),
+        sort: StudentSortEnum = Query(StudentSortEnum.id, description="排序键：id 或 create_time"),
+        count: CountModeEnum = Query(CountModeEnum.exact, description="总数统计：exact精确 / estimated估算 / none不统计")
 ):
-    # 构建查询条件
-    stmt = select(Student).join(User).join(Clazz)  # 关联用户表和班级表（要显示用户名和班级名）
-    if name:
-        # 模糊查询：姓名包含name的学生（比如name=张三，会查到张三、张三丰）
-        stmt = stmt.filter(Student.student_name.like(f"%{name}%"))
-    if clazz_id:
-        # 精确查询：指定班级ID的学生
-        stmt = stmt.filter(Student.clazz_id == clazz_id)
-
-    # 分页查询：跳过前面的记录，取当前页的记录（相当于SQL的LIMIT和OFFSET）
-    offset = (page - 1) * size
-    result = await db.execute(stmt.offset(offset).limit(size))
-    students = result.scalars().unique().all()  # 获取查询结果
-
-    # 查询总条数（用于计算总页数）
-    total = await db.scalar(select(func.count(Student.id)).where(stmt.whereclause))
-
-    # 格式化结果（把数据库模型转换成响应模型，包含班级名称）
-    student_list = []
-    for student in students:
-        student_list.append(StudentBase(
-            id=student.id,
-            student_name=student.student_name,
-            gender=student.gender,
-            age=student.age,
-            phone=student.phone,
-            email=student.email,
-            clazz_id=student.clazz_id,
-            clazz_name=student.clazz.class_name,  # 从关联的班级表获取班级名
-            username=student.user.username,  # 从关联的用户表获取用户名
-            create_time=student.create_time
-        ))
-
-    # 返回分页结果
-    return {
+    # 构建查询条件（条件单独存起来，统计总数时复用）
+    conditions = student_filters(name, clazz_id)
+    # 关联用户表和班级表（要显示用户名和班级名），一条SQL只查响应需要的列
+    stmt = select_students(*conditions)
+
+    # 排序：按 id 或 (create_time, id)，保证翻页顺序稳定
+    if sort == StudentSortEnum.create_time:
+        stmt = stmt.order_by(Student.create_time, Student.id)
+    else:
+        stmt = stmt.order_by(Student.id)
+
+    if cursor:
+        # 游标分页：直接从上一页最后一行之后开始查（WHERE 排序键 > 上次的值），不用OFFSET
+        last = decode_cursor(cursor, sort.value)
+        if sort == StudentSortEnum.create_time:
+            stmt = stmt.where(or_(
+                Student.create_time > last[0],
+                and_(Student.create_time == last[0], Student.id > last[1])
+            ))
+        else:
+            stmt = stmt.where(Student.id > last[0])
+    else:
+        # 页码分页：跳过前面的记录，取当前页的记录（相当于SQL的LIMIT和OFFSET）
+        stmt = stmt.offset((page - 1) * size)
+
+    # 多查1条，用来判断还有没有下一页
+    result = await db.execute(stmt.limit(size + 1))
+    rows = result.all()  # 获取查询结果
+    has_more = len(rows) > size
+    rows = rows[:size]
+
+    # 生成下一页游标（记住本页最后一行的排序键）
+    next_cursor = None
+    if has_more:
+        last_row = rows[-1]
+        if sort == StudentSortEnum.create_time:
+            next_cursor = encode_cursor(sort.value, [last_row.create_time, last_row.id])
+        else:
+            next_cursor = encode_cursor(sort.value, [last_row.id])
+
+    # 查询总条数（用于计算总页数），可以选择估算或不统计
+    total = await count_rows(db, Student.id, conditions, count.value, Student.__tablename__)
+
+    # 格式化结果（查询行直接转成字典，数据来自数据库，不再逐个字段校验；班级名和用户名已经在同一条SQL里查出来了）
+    student_list = [student_row_dict(row) for row in rows]
+
+    # 返回分页结果（直接编码成JSON返回，跳过 response_model 的二次校验，response_model 只用来生成接口文档）
+    return FastJSONResponse({
         "items": student_list,
         "total": total,
         "page": page,
         "size": size,
-        "pages": (total + size - 1) // size  # 总页数（向上取整）
-    }
+        "pages": (total + size - 1) // size if total is not None else None,  # 总页数（向上取整）
+        "next_cursor": next_cursor
+    })
 
 
 # 2. 添加学生（只有管理员能操作）
@@ -88,9 +118,9 @@ async def create_student(
     # 步骤1：创建用户账号（学生的登录账号，角色是student）
     user = User(
         username=student_in.username,
+        password=await password_hasher.hash(student_in.password),  # 加密密码（在线程池里算，不阻塞其他请求）
         role="student"  # 固定为学生角色
     )
-    user.set_password(student_in.password)  # 加密密码
     db.add(user)  # 把用户添加到数据库会话
     await db.flush()  # 刷新会话，获取自动生成的user.id（不用提交事务）
 
@@ -105,7 +135,11 @@ async def create_student(
         clazz_id=student_in.clazz_id
     )
     db.add(student)  # 把学生添加到数据库会话
+    await db.flush()  # 获取自动生成的student.id
+    await reindex_students(db, [student.id])  # 生成搜索索引
+    await adjust_student_counts(db, {student.clazz_id: 1})  # 班级学生人数+1
     await db.commit()  # 提交事务（保存到数据库）
+    mark_written(("student", student.id))
     await db.refresh(student)  # 刷新学生对象，获取最新数据
 
     # 格式化并返回结果
@@ -123,35 +157,208 @@ async def create_student(
     )
 
 
+# 批量导入学生（只有管理员能操作），请求体是CSV或NDJSON，按行流式读取
+@router.post("/bulk", response_model=StudentImportResult, summary="批量导入学生")
+async def bulk_import_students(
+        request: Request,
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(role_required(["admin"])),  # 仅管理员可导入
+        format: Optional[DataFormatEnum] = Query(None, description="数据格式：csv 或 ndjson（不传时按Content-Type判断）"),
+        batch_size: int = Query(1000, ge=1, le=5000, description="每批写入的行数")
+):
+    """
+    批量导入学生：
+    - CSV：第一行是表头（字段名和添加学生接口一致：username,password,student_name,gender,age,phone,email,clazz_id）
+    - NDJSON：每行一个JSON对象
+    - 出错的行不影响其他行，返回每一行的错误明细和导入速度
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = DataFormatEnum.ndjson if "json" in content_type else DataFormatEnum.csv
+    records = iter_records(iter_lines(request.stream()), format)
+    report = await StudentImporter(db, batch_size).run(records)
+    if report["created"]:
+        mark_written()  # 只标记这个请求改了数据（接下来的读请求走主库）
+    return report
+
+
+# 每条 UPDATE 的 IN (...) 里最多放多少个ID；按条件修改时最多选中多少个学生
+BATCH_UPDATE_CHUNK = 1000
+BATCH_UPDATE_MAX = 10000
+# 成绩统计/排名里用到的学生字段：改了这些字段，学生有成绩的课程的统计缓存要失效
+SCORE_STATS_FIELDS = ("student_name", "clazz_id")
+# 数据库里不能为空的字段：修改时可以不传，但不能显式传 null（手机号、邮箱可以传 null 清空）
+NOT_NULL_FIELDS = ("student_name", "gender", "age", "clazz_id")
+
+
+def check_not_null(update_data: dict):
+    """修改学生时，不能为空的字段传了 null 直接返回 400（否则会在数据库里报错）"""
+    nulls = [field for field in NOT_NULL_FIELDS if field in update_data and update_data[field] is None]
+    if nulls:
+        raise HTTPException(status_code=400, detail=f"这些字段不能为空：{nulls}")
+
+
+# 批量修改学生（管理员和教师能用），比如整班转班、统一修正某个字段
+# 注意：这个路由要写在 /{student_id} 前面
+@router.patch("/batch", response_model=StudentBatchResult, summary="批量修改学生")
+async def batch_update_students(
+        batch_in: StudentBatchUpdate,
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(role_required(["admin", "teacher"]))
+):
+    """
+    批量修改学生：ids（学生ID列表）和 filter（按班级/姓名筛选）二选一，changes 是要改的字段
+    - 目标班级只校验一次，所有修改在同一个事务里，要么全部成功要么全部不改
+    - 用 UPDATE ... WHERE id IN (...) 按集合修改，不逐个加载学生
+    """
+    update_data = batch_in.changes.model_dump(exclude_unset=True)
+    check_not_null(update_data)
+    new_clazz_id = update_data.get("clazz_id")
+    # 校验：目标班级只查一次
+    if new_clazz_id is not None and not await db.scalar(select(Clazz.id).where(Clazz.id == new_clazz_id)):
+        raise HTTPException(status_code=400, detail=f"班级ID{new_clazz_id}不存在")
+
+    # 选中要修改的学生（一条SQL），同时拿到原来的班级用来更新人数
+    # FOR UPDATE：提交前其他请求不能把这些学生转走，班级人数不会算错
+    if batch_in.ids is not None:
+        conditions = [Student.id.in_(set(batch_in.ids))]
+    else:
+        conditions = student_filters(batch_in.filter.name, batch_in.filter.clazz_id)
+    rows = (await db.execute(
+        select(Student.id, Student.clazz_id).where(*conditions).order_by(Student.id)
+        .limit(BATCH_UPDATE_MAX + 1).with_for_update()
+    )).all()
+    if len(rows) > BATCH_UPDATE_MAX:
+        raise HTTPException(status_code=400, detail=f"一次最多修改{BATCH_UPDATE_MAX}个学生，请缩小范围")
+    student_ids = [row.id for row in rows]
+    missing_ids = sorted(set(batch_in.ids) - set(student_ids)) if batch_in.ids is not None else []
+    # 改了姓名/班级时，记下这些学生有成绩的课程，提交后让它们的统计缓存失效
+    stats_course_ids = await score_course_ids(db, student_ids) \
+        if any(field in update_data for field in SCORE_STATS_FIELDS) else set()
+
+    # 按集合修改：每条 UPDATE 改一批
+    updated = 0
+    for i in range(0, len(student_ids), BATCH_UPDATE_CHUNK):
+        chunk = student_ids[i:i + BATCH_UPDATE_CHUNK]
+        result = await db.execute(update(Student).where(Student.id.in_(chunk)).values(**update_data))
+        updated += result.rowcount
+
+    # 转班：原来各班减掉转走的人数，新班加上（已经在新班的学生不算）
+    clazz_changes = {}
+    if new_clazz_id is not None:
+        moved_from = count_by_clazz(row.clazz_id for row in rows if row.clazz_id != new_clazz_id)
+        if moved_from:
+            clazz_changes = {clazz_id: -n for clazz_id, n in moved_from.items()}
+            clazz_changes[new_clazz_id] = sum(moved_from.values())
+            await adjust_student_counts(db, clazz_changes)
+    # 姓名/手机号变了，重建这些学生的搜索索引
+    if "student_name" in update_data or "phone" in update_data:
+        for i in range(0, len(student_ids), BATCH_UPDATE_CHUNK):
+            await reindex_students(db, student_ids[i:i + BATCH_UPDATE_CHUNK])
+    await db.commit()  # 一次提交
+    invalidate_students(student_ids)  # 这些学生的响应缓存失效
+    for course_id in stats_course_ids:
+        invalidate_course_stats(course_id)
+
+    return {"matched": len(rows), "updated": updated, "missing_ids": missing_ids, "clazz_changes": clazz_changes}
+
+
+# 搜索学生（管理员和教师能用），按相关度排序：完全相同 > 开头匹配 > 中间包含
+# 注意：这个路由要写在 /{student_id} 前面
+@router.get("/search", response_model=list[StudentBase], summary="搜索学生")
+async def search_students(
+        q: str = Query(..., min_length=1, max_length=50, description="关键词"),
+        fields: str = Query("name", description="搜索哪些字段，逗号分隔：name,username,phone"),
+        limit: int = Query(20, ge=1, le=100, description="最多返回多少个"),
+        db: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(role_required(["admin", "teacher"]))
+):
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in SEARCH_FIELDS]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"不支持的搜索字段：{unknown}，可选：{list(SEARCH_FIELDS)}")
+
+    stmt = (
+        select_students(*search_conditions(q, selected))
+        .order_by(relevance(q, selected), func.length(Student.student_name), Student.id)
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return FastJSONResponse([student_row_dict(row) for row in result])
+
+
+# 重建搜索索引（只有管理员能操作，上线或数据不一致时用）
+# 升级时启动流程会自动给老学生补建索引；SCHEMA_BOOTSTRAP=skip 时要在发布后调用一次
+@router.post("/search/reindex", summary="重建学生搜索索引")
+async def rebuild_student_search_index(
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(role_required(["admin"]))
+):
+    total = await rebuild_search_index(db)
+    mark_written()  # 只标记这个请求改了数据（接下来的读请求走主库）
+    return {"code": 200, "msg": f"已重建{total}个学生的搜索索引"}
+
+
+# 导出学生（管理员和教师能用），边查边发，支持和列表接口一样的筛选条件
+# 注意：这个路由要写在 /{student_id} 前面，否则 "export" 会被当成学生ID
+@router.get("/export", summary="导出学生")
+async def export_students_file(
+        request: Request,
+        current_user: User = Depends(role_required(["admin", "teacher"])),
+        format: DataFormatEnum = Query(DataFormatEnum.csv, description="导出格式：csv 或 ndjson"),
+        columns: Optional[str] = Query(None, description=f"导出哪些列，逗号分隔（默认全部：{','.join(EXPORT_COLUMNS)}）"),
+        name: Optional[str] = Query(None, description="按姓名模糊搜索（可选）"),
+        clazz_id: Optional[int] = Query(None, description="按班级ID筛选（可选）")
+):
+    # 校验列名
+    selected = [c.strip() for c in columns.split(",") if c.strip()] if columns else EXPORT_COLUMNS
+    unknown = [c for c in selected if c not in EXPORT_COLUMNS]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"不支持的列：{unknown}，可选：{EXPORT_COLUMNS}")
+
+    if format == DataFormatEnum.csv:
+        media_type, filename = "text/csv; charset=utf-8", "students.csv"
+    else:
+        media_type, filename = "application/x-ndjson", "students.ndjson"
+    return StreamingResponse(
+        export_students(student_filters(name, clazz_id), selected, format,
+                        session_factory=AsyncSessionLocal if read_from_primary(request) else ReadSessionLocal),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 可能是 *、多个ETag（逗号分隔）或弱ETag（W/前缀）"""
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
 # 3. 查询单个学生（管理员/教师能查所有，学生只能查自己）
 @router.get("/{student_id}", response_model=StudentBase, summary="查询单个学生")
 async def get_student(
         student_id: int,  # 从URL获取学生ID（比如/api/students/1就是查ID=1的学生）
-        db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(role_required(["admin", "teacher", "student"]))
+        db: AsyncSession = Depends(get_read_db),
+        current_user: User = Depends(role_required(["admin", "teacher", "student"])),
+        if_none_match: Optional[str] = Header(None, description="上次响应里的ETag，没变化时返回304")
 ):
-    # 查询学生（关联用户表和班级表）
-    student = await db.scalar(select(Student).join(User).join(Clazz).filter(Student.id == student_id))
-    if not student:
+    # 查询学生（先查缓存，没有再用一条SQL关联用户表和班级表）
+    entry = await get_cached_student(db, student_id)
+    if not entry:
         raise HTTPException(status_code=404, detail=f"学生ID{student_id}不存在")
 
-    # 权限控制：学生只能查自己的信息
-    if current_user.role == "student" and current_user.id != student.user_id:
+    # 权限控制：学生只能查自己的信息（命中缓存也要检查）
+    if current_user.role == "student" and current_user.id != entry.user_id:
         raise HTTPException(status_code=403, detail="无权查询他人信息")
 
-    # 返回结果
-    return StudentBase(
-        id=student.id,
-        student_name=student.student_name,
-        gender=student.gender,
-        age=student.age,
-        phone=student.phone,
-        email=student.email,
-        clazz_id=student.clazz_id,
-        clazz_name=student.clazz.class_name,
-        username=student.user.username,
-        create_time=student.create_time
-    )
+    # 条件请求：客户端手里的数据没变化，直接返回304（不带响应体）
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+
+    # 返回结果（缓存里就是编码好的JSON）
+    return Response(content=entry.body, media_type="application/json", headers=headers)
 
 
 # 4. 更新学生信息（只有管理员/教师能操作）
@@ -162,11 +369,6 @@ async def update_student(
         db: AsyncSession = Depends(get_db),
         current_user: User = Depends(role_required(["admin", "teacher"]))
 ):
-    # 查询学生是否存在
-    student = await db.scalar(select(Student).join(Clazz).filter(Student.id == student_id))
-    if not student:
-        raise HTTPException(status_code=404, detail=f"学生ID{student_id}不存在")
-
     # 校验：如果更新班级ID，要确保班级存在
     if student_in.clazz_id:
         clazz = await db.get(Clazz, student_in.clazz_id)
@@ -175,26 +377,36 @@ async def update_student(
 
     # 更新字段：只更新传入的非空字段（比如只传了姓名，就只改姓名）
     update_data = student_in.model_dump(exclude_unset=True)  # 把校验模型转成字典，排除未设置的字段
-    for key, value in update_data.items():
-        setattr(student, key, value)  # 给学生对象赋值
-
-    db.add(student)  # 添加到会话
-    await db.commit()  # 提交事务
-    await db.refresh(student)  # 刷新数据
+    check_not_null(update_data)
+    if update_data:
+        # 转班时要知道原来的班级，用来更新两个班的学生人数
+        # FOR UPDATE：两个请求同时给这个学生转班时，后一个要等前一个提交，读到的才是新班级（和批量修改一样）
+        old_clazz_id = None
+        if "clazz_id" in update_data:
+            old_clazz_id = await db.scalar(
+                select(Student.clazz_id).where(Student.id == student_id).with_for_update()
+            )
+        # 改了姓名/班级时，这个学生有成绩的课程的统计缓存要失效
+        stats_course_ids = await score_course_ids(db, [student_id]) \
+            if any(field in update_data for field in SCORE_STATS_FIELDS) else set()
+        # 直接执行 UPDATE，不用先把学生对象查出来
+        result = await db.execute(update(Student).where(Student.id == student_id).values(**update_data))
+        if result.rowcount == 0:
+            raise HTTPException(status_code=404, detail=f"学生ID{student_id}不存在")
+        if old_clazz_id is not None and old_clazz_id != update_data["clazz_id"]:
+            await adjust_student_counts(db, {old_clazz_id: -1, update_data["clazz_id"]: 1})
+        if "student_name" in update_data or "phone" in update_data:
+            await reindex_students(db, [student_id])  # 姓名/手机号变了，重建搜索索引
+        await db.commit()  # 提交事务
+        invalidate_students([student_id])  # 单个学生的响应缓存失效
+        for course_id in stats_course_ids:
+            invalidate_course_stats(course_id)
 
-    # 返回更新后的结果
-    return StudentBase(
-        id=student.id,
-        student_name=student.student_name,
-        gender=student.gender,
-        age=student.age,
-        phone=student.phone,
-        email=student.email,
-        clazz_id=student.clazz_id,
-        clazz_name=student.clazz.class_name,
-        username=student.user.username,
-        create_time=student.create_time
-    )
+    # 返回更新后的结果（一条SQL查出学生、班级名、用户名）
+    row = await fetch_student(db, student_id)
+    if not row:
+        raise HTTPException(status_code=404, detail=f"学生ID{student_id}不存在")
+    return FastJSONResponse(student_row_dict(row))
 
 
 # 5. 删除学生（只有管理员能操作）
@@ -209,9 +421,20 @@ async def delete_student(
     if not student:
         raise HTTPException(status_code=404, detail=f"学生ID{student_id}不存在")
 
+    # 学生的成绩会被级联删除，先记下有成绩的课程，提交后让它们的统计缓存失效
+    stats_course_ids = await score_course_ids(db, [student_id])
+    # 先退掉这个学生选的课：已选的名额还给课程，候补的人补上
+    await release_enrollments(db, [student_id])
     # 删除学生（会级联删除关联的用户账号）
     await db.delete(student)
+    await db.flush()
+    await reindex_students(db, [student_id])  # 学生已经删掉了，这里只会清掉搜索索引
+    await adjust_student_counts(db, {student.clazz_id: -1})  # 班级学生人数-1
     await db.commit()  # 提交事务
+    invalidate_user(student.user_id)  # 登录缓存里的这个账号立即失效
+    invalidate_students([student_id])  # 单个学生的响应缓存失效
+    for course_id in stats_course_ids:
+        invalidate_course_stats(course_id)
 
     # 返回成功信息
     return {"code": 200, "msg": f"学生ID{student_id}删除成功"}
\ No newline at end of file
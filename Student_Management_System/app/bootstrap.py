@@ -0,0 +1,185 @@
+import hashlib
+import time
+from contextlib import contextmanager
+
+
+# 启动加速
+# 1. 启动耗时报告：按阶段（导入、配置、数据库引擎、路由、表结构）计时，启动完成后打印，超过预算时提醒
+# 2. 表结构版本号：原来每次启动都执行 create_all（每张表都要去数据库查一次存不存在），
+#    worker 多、发布频繁时就是一波“启动风暴”。现在根据模型算出表结构的指纹，存在 schema_version 表里，
+#    启动时只查这一行：一致就跳过，不一致才执行 create_all，检查已有的表没有缺列/缺索引，补好数据后再更新版本号
+# 注意：这个模块最先被导入（用来给导入阶段计时），所以文件顶部只导入标准库，SQLAlchemy 等在函数里再导入
+
+class StartupTimer:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases = []  # [(阶段名, 秒, 备注)]
+        self._current = None  # 正在计时的阶段 (阶段名, 开始时间)
+
+    def start(self, name: str):
+        """开始一个阶段（代码块不方便缩进时用，和 end 成对调用）"""
+        self._current = (name, time.perf_counter())
+
+    def end(self):
+        name, start = self._current
+        self.phases.append([name, time.perf_counter() - start, ""])
+        self._current = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """给一个启动阶段计时：with startup_timer.phase("engine"): ..."""
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def note(self, text: str):
+        """给最后一个阶段加备注（比如表结构是否跳过）"""
+        if self.phases:
+            self.phases[-1][2] = text
+
+    @property
+    def total(self) -> float:
+        return sum(seconds for _, seconds, _ in self.phases)
+
+    def report(self, budget_ms: float) -> str:
+        parts = [f"{name} {seconds * 1000:.1f}ms" + (f"（{note}）" if note else "")
+                 for name, seconds, note in self.phases]
+        total_ms = self.total * 1000
+        text = "启动耗时：" + " | ".join(parts) + f" | 合计 {total_ms:.1f}ms（预算 {budget_ms:.0f}ms）"
+        if total_ms > budget_ms:
+            text += " —— 超出预算！"
+        return text
+
+    def as_dict(self) -> dict:
+        """{阶段名: 秒}，给监控接口用"""
+        return {name: round(seconds, 6) for name, seconds, _ in self.phases}
+
+
+startup_timer = StartupTimer()
+
+
+def schema_fingerprint(metadata) -> str:
+    """
+    表结构指纹：由所有表的列（名字、类型、能否为空、是否主键）、索引、唯一约束算出来
+    改了模型（加表、加列、加索引）指纹就会变
+    """
+    from sqlalchemy import UniqueConstraint
+
+    lines = []
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        lines.append(f"table {table.name}")
+        for column in table.columns:
+            lines.append(f"  column {column.name} {column.type!r} nullable={column.nullable} pk={column.primary_key}")
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            lines.append(f"  index {index.name} {[c.name for c in index.columns]} unique={index.unique}")
+        for constraint in sorted((c for c in table.constraints if isinstance(c, UniqueConstraint)),
+                                 key=lambda c: c.name or ""):
+            lines.append(f"  unique {constraint.name} {[c.name for c in constraint.columns]}")
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()[:16]
+
+
+def schema_differences(conn, metadata) -> list:
+    """
+    对比数据库里已有的表和模型：缺少的列、缺少的索引（同步函数，用 conn.run_sync 调用）
+    create_all 只会新建缺少的表，已有的表少了列/索引它不会管，这里把它们找出来
+    """
+    from sqlalchemy import inspect
+
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    problems = []
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        if table.name not in existing_tables:
+            problems.append(f"缺少表 {table.name}")
+            continue
+        live_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in live_columns:
+                problems.append(f"表 {table.name} 缺少列 {column.name}")
+        live_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            if index.name not in live_indexes:
+                problems.append(f"表 {table.name} 缺少索引 {index.name}")
+    return problems
+
+
+async def upgrade_data(engine):
+    """
+    表结构升级后要补的数据（可以重复执行）：按学生表重新统计班级人数，给老学生补建搜索索引
+    SCHEMA_BOOTSTRAP=skip 时不会执行，发布流程里要自己调用 POST /api/clazzes/recount 和 /api/students/search/reindex
+    """
+    from Student_Management_System.app.database import AsyncSessionLocal
+    from Student_Management_System.app.queries import recount_students
+    from Student_Management_System.app.search import backfill_search_index
+
+    async with AsyncSessionLocal(bind=engine) as db:
+        await recount_students(db)  # 老库加上 clazz.student_count 列后全是默认值，要按实际人数算一遍
+        await db.commit()
+        # 升级前就存在的学生在索引表里没有片段，不补的话按姓名筛选、搜索都查不到他们
+        await backfill_search_index(db)
+
+
+async def ensure_schema(engine, mode: str = "auto", retries: int = 3) -> str:
+    """
+    按版本号决定要不要建表，返回结果说明（写进启动报告）
+    mode：auto（版本不一致时建表）/ skip（启动时完全不碰表结构，由发布流程单独处理）/ force（每次都执行 create_all）
+    已有的表和模型对不上（少了列或索引）时直接报错，不写版本号：需要先手动 ALTER TABLE，再重新启动
+    """
+    if mode == "skip":
+        return "已跳过"
+
+    import asyncio
+    from datetime import datetime
+    from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, select, delete, insert
+    from sqlalchemy.exc import DBAPIError
+    from Student_Management_System.app.database import Base
+    import Student_Management_System.app.models  # noqa: F401 确保所有模型都注册到了 Base.metadata
+
+    version_table = Table(
+        "schema_version", MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("version", String(32), nullable=False),
+        Column("applied_at", DateTime, nullable=False),
+    )
+    expected = schema_fingerprint(Base.metadata)
+
+    async def current_version():
+        """读当前版本号；表还不存在时返回 None"""
+        try:
+            async with engine.connect() as conn:
+                return await conn.scalar(select(version_table.c.version).where(version_table.c.id == 1))
+        except DBAPIError:
+            return None
+
+    for attempt in range(retries):
+        current = await current_version()
+        if current == expected and mode != "force":
+            return f"版本 {expected} 已是最新，跳过建表"
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)  # 只会新建缺少的表，不会修改已有的表
+                problems = await conn.run_sync(schema_differences, Base.metadata)
+            if problems:
+                # 不能写版本号：写了以后每次启动都会跳过检查，程序运行到缺少的列才报错
+                raise RuntimeError(
+                    f"数据库表结构和模型不一致，请先手动执行 ALTER TABLE / 迁移脚本再启动：{'；'.join(problems)}"
+                )
+            await upgrade_data(engine)
+            async with engine.begin() as conn:
+                await conn.run_sync(version_table.metadata.create_all)
+                await conn.execute(delete(version_table))
+                await conn.execute(insert(version_table).values(id=1, version=expected, applied_at=datetime.utcnow()))
+        except DBAPIError:
+            # 多个 worker 同时启动，别的 worker 正在建表：等一下重新检查版本号
+            if attempt == retries - 1:
+                raise
+            await asyncio.sleep(0.5 * (attempt + 1))
+            continue
+        if current is None:
+            return f"已建表，版本 {expected}"
+        if current == expected:
+            return f"版本 {expected}，已强制执行建表"
+        return f"版本 {current} -> {expected}，已补建缺少的表"
+    return f"版本 {expected}"
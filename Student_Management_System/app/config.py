@@ -7,10 +7,68 @@ load_dotenv()
 class Settings:
     # 数据库配置
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # 数据库连接池配置（按 worker 数量调整：每个 worker 进程各有一个连接池）
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))  # 常驻连接数
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))  # 高峰时最多再多开几个
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # 等连接最多等多少秒
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))  # 连接用多久后重建（秒），要小于MySQL的wait_timeout
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # 取连接前先检查是否有效
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))  # 超过多少毫秒算慢查询
+    # Prometheus 抓取 /metrics 用的固定令牌（请求头 Authorization: Bearer <令牌>）；为空时不校验，只能在内网开放
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+
+    # 只读副本（可选）：配置后 GET 接口的查询走副本，写操作仍然走主库；不配置时读写都走主库
+    DATABASE_REPLICA_URL: str = os.getenv("DATABASE_REPLICA_URL", "")
+    # 读自己的写：修改数据后多少秒内，这个客户端的读请求仍然走主库（副本同步有延迟）
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+    # 启动配置
+    # 表结构初始化：auto（表结构版本变了才建表）/ skip（启动时不碰表结构）/ force（每次启动都执行 create_all）
+    SCHEMA_BOOTSTRAP: str = os.getenv("SCHEMA_BOOTSTRAP", "auto")
+    STARTUP_BUDGET_MS: float = float(os.getenv("STARTUP_BUDGET_MS", "3000"))  # 启动耗时预算，超过时在启动报告里提醒
 
     # JWT 配置
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY")
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES"))
+    # 注销的Token多少秒同步到其它进程（每个进程定时从数据库拉取新的注销记录）
+    TOKEN_REVOCATION_SYNC_SECONDS: float = float(os.getenv("TOKEN_REVOCATION_SYNC_SECONDS", "5"))
+
+    # 登录限流配置（令牌桶：允许连续尝试 BURST 次，之后每分钟恢复 PER_MINUTE 次；超过返回429）
+    LOGIN_RATE_LIMIT_ENABLED: bool = os.getenv("LOGIN_RATE_LIMIT_ENABLED", "true").lower() == "true"
+    LOGIN_RATE_IP_BURST: float = float(os.getenv("LOGIN_RATE_IP_BURST", "20"))  # 每个IP
+    LOGIN_RATE_IP_PER_MINUTE: float = float(os.getenv("LOGIN_RATE_IP_PER_MINUTE", "30"))
+    LOGIN_RATE_USERNAME_BURST: float = float(os.getenv("LOGIN_RATE_USERNAME_BURST", "5"))  # 每个用户名
+    LOGIN_RATE_USERNAME_PER_MINUTE: float = float(os.getenv("LOGIN_RATE_USERNAME_PER_MINUTE", "5"))
+    LOGIN_RATE_MAX_KEYS: int = int(os.getenv("LOGIN_RATE_MAX_KEYS", "100000"))  # 最多记多少个IP/用户名（超过淘汰最久没用的）
+
+    # 登录用户缓存配置（减少每个请求查用户表的次数）
+    AUTH_CACHE_TTL_SECONDS: float = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))  # 缓存多少秒
+    AUTH_CACHE_MAX_SIZE: int = int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000"))  # 最多缓存多少个用户/Token
+
+    # 单个学生查询的响应缓存配置
+    STUDENT_CACHE_TTL_SECONDS: float = float(os.getenv("STUDENT_CACHE_TTL_SECONDS", "30"))  # 其它进程改了数据，最多30秒后生效
+    STUDENT_CACHE_MAX_SIZE: int = int(os.getenv("STUDENT_CACHE_MAX_SIZE", "10000"))
+
+    # 成绩统计/排名的缓存配置（录入成绩、删除或修改学生时，本进程里相关课程的缓存会立即失效；
+    # 其它进程（多个 worker）不知道数据变了，要等缓存过期，所以最多晚 TTL 秒看到新结果）
+    SCORE_STATS_CACHE_TTL_SECONDS: float = float(os.getenv("SCORE_STATS_CACHE_TTL_SECONDS", "30"))  # 其它进程改了数据，最多30秒后生效
+    SCORE_STATS_CACHE_MAX_SIZE: int = int(os.getenv("SCORE_STATS_CACHE_MAX_SIZE", "2000"))
+
+    # 密码加密线程池配置
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))  # 同时计算的数量
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # thread（线程池）或 process（进程池）
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "100"))  # 最多排队数量，超过返回503
+
+    def validate(self):
+        """启动时检查配置，写错了直接报错，而不是等到请求时才出问题"""
+        # 恢复速度是 0 时令牌桶算等待时间会除以 0；容量小于 1 时一次都登录不了
+        for name in ("LOGIN_RATE_IP_PER_MINUTE", "LOGIN_RATE_USERNAME_PER_MINUTE"):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"配置 {name} 必须大于 0（要关闭登录限流请设置 LOGIN_RATE_LIMIT_ENABLED=false）")
+        for name in ("LOGIN_RATE_IP_BURST", "LOGIN_RATE_USERNAME_BURST"):
+            if getattr(self, name) < 1:
+                raise ValueError(f"配置 {name} 不能小于 1")
 
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
+settings.validate()
\ No newline at end of file
@@ -1,13 +1,34 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import Request
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
-from app.config import settings
+from Student_Management_System.app.cache import TTLCache
+from Student_Management_System.app.config import settings
+from Student_Management_System.app.metrics import InstrumentedQueuePool, instrument_pool, instrument_queries
 
 #创建数据库引擎
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,  # 开发时可以改成True，会打印执行的SQL语句（方便调试）
-    pool_pre_ping=True  # 自动检查连接是否有效
-)
+def create_engine_with_pool(url: str):
+    """按配置创建引擎（主库和只读副本用同样的连接池配置）"""
+    new_engine = create_async_engine(
+        url,
+        echo=False,  # 开发时可以改成True，会打印执行的SQL语句（方便调试）
+        poolclass=InstrumentedQueuePool,  # 带监控的连接池（记录取连接的等待时间）
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING  # 自动检查连接是否有效
+    )
+    instrument_pool(new_engine)  # 注册连接池监控事件
+    instrument_queries(new_engine)  # 注册SQL耗时统计事件
+    return new_engine
+
+
+engine = create_engine_with_pool(settings.DATABASE_URL)  # 主库：所有写操作
+# 只读副本：没配置时就是主库
+replica_engine = create_engine_with_pool(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else engine
 
 #创建会话工厂
 AsyncSessionLocal = sessionmaker(
@@ -17,6 +38,14 @@ AsyncSessionLocal = sessionmaker(
     autocommit=False,
     expire_on_commit=False
 )
+# 只读会话工厂（连副本）
+ReadSessionLocal = sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    autocommit=False,
+    expire_on_commit=False
+)
 
 Base = declarative_base()
 
@@ -30,4 +59,90 @@ async def get_db():
             await session.rollback()  #回滚数据
             raise e  # 抛出错误
         finally:
-            await session.close()  # 关闭会话
\ No newline at end of file
+            await session.close()  # 关闭会话
+
+
+# ---------------- 只读会话 ----------------
+# GET 接口只查数据，不需要提交事务：用 get_read_db，结束时直接回滚（只读事务回滚没有开销），少一次 COMMIT。
+# 配置了只读副本时查询走副本，分担主库压力；副本同步有延迟，所以“刚改完数据马上查”的请求要走主库：
+# - 请求里修改了数据（调用了 mark_written）并且成功后，中间件下发一个 Cookie（db_primary_until=截止时间戳），
+#   截止之前这个客户端的读请求走主库；登录、注销这类没改业务数据的请求不下发，读请求照样走副本
+# - 不带 Cookie 的客户端（比如脚本）可以在读请求里加请求头 X-Read-Your-Writes: 1 强制走主库
+
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+READ_YOUR_WRITES_HEADER = "x-read-your-writes"
+
+# 只读会话分别走了主库和副本多少次
+read_routing = {"primary": 0, "replica": 0}
+
+# 刚被修改过的数据（副本可能还没同步到）：这段时间内从副本读到的结果不放进缓存，免得把旧数据缓存起来
+recent_writes = TTLCache(max_size=10000, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+
+# 当前请求有没有修改数据（中间件里设置，mark_written 里标记）
+current_request_writes: ContextVar[Optional[dict]] = ContextVar("current_request_writes", default=None)
+
+
+def mark_written(*keys):
+    """
+    记录这些数据刚被修改过（在清缓存的地方调用；写接口提交后也要调用，不传 key 也可以）
+    同时标记当前请求修改了数据，响应时下发读主库的 Cookie
+    """
+    if replica_engine is engine:
+        return
+    flag = current_request_writes.get()
+    if flag is not None:
+        flag["written"] = True
+    for key in keys:
+        recent_writes.set(key, True)
+
+
+def cacheable(db: AsyncSession, *keys) -> bool:
+    """查到的结果能不能放进缓存：主库读到的都可以；副本读到的，相关数据最近被修改过就不行"""
+    if replica_engine is engine or db.bind is engine:
+        return True
+    return all(recent_writes.get(key) is None for key in keys)
+
+
+def read_from_primary(request: Request) -> bool:
+    """这个读请求是不是要走主库"""
+    if replica_engine is engine:
+        return True
+    if request.headers.get(READ_YOUR_WRITES_HEADER) == "1":
+        return True
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, "0")) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db(request: Request):
+    """只读会话：不提交事务；配置了副本时默认连副本"""
+    primary = read_from_primary(request)
+    read_routing["primary" if primary else "replica"] += 1
+    session_factory = AsyncSessionLocal if primary else ReadSessionLocal
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()  # 只读事务，直接回滚（归还连接前本来也会回滚）
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """HTTP中间件：修改了数据的请求成功后下发 Cookie，接下来几秒这个客户端的读请求走主库"""
+    flag = {"written": False}
+    token = current_request_writes.set(flag)
+    try:
+        response = await call_next(request)
+    finally:
+        current_request_writes.reset(token)
+    if (replica_engine is not engine and flag["written"]
+            and response.status_code < 400 and settings.READ_YOUR_WRITES_SECONDS > 0):
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(round(time.time() + settings.READ_YOUR_WRITES_SECONDS, 3)),
+            max_age=int(settings.READ_YOUR_WRITES_SECONDS) + 1,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
@@ -1,30 +1,64 @@
+import time
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt  import PyJWTError
 import jwt
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 
 
+from Student_Management_System.app.cache import TTLCache
 from Student_Management_System.app.config import settings
-from Student_Management_System.app.database import get_db
+from Student_Management_System.app.database import get_read_db
 from Student_Management_System.app.models import User
+from Student_Management_System.app.revocation import revocations
 from Student_Management_System.app.schemas.user import TokenData
 
 # 从请求头获取Token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-# 依赖1：验证Token，获取当前登录的用户
-async def get_current_user(
-    db: AsyncSession = Depends(get_db),  # 获取数据库会话
-    token: str = Depends(oauth2_scheme)  # 从请求头获取Token
-) -> User:
-    # Token无效时返回
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="登录失效或未登录，请重新登录",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+# 当前登录用户的信息（从数据库查出来后缓存，接口里只用到这几个字段）
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    username: str
+    role: str
+    status: int
+
+
+# 缓存1：用户ID -> Principal，避免每个请求都查一次用户表
+principal_cache = TTLCache(max_size=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+# Token 里的信息（解码、验签之后）
+@dataclass(frozen=True)
+class TokenClaims:
+    user_id: int
+    role: str
+    exp: float  # 过期时间戳
+    jti: Optional[str]  # Token编号（注销单个Token用；旧版本签发的Token没有）
+    issued_at: float  # 签发时间戳（注销用户全部Token用；旧版本签发的Token没有，按0算）
+
+
+# 缓存2：Token字符串 -> TokenClaims，避免每个请求都重新解码、验签
+token_cache = TTLCache(max_size=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int):
+    """用户被禁用、删除或者修改角色后调用，让缓存立即失效"""
+    principal_cache.delete(user_id)
+
+
+def auth_cache_stats() -> dict:
+    return {"principal": principal_cache.stats(), "token": token_cache.stats()}
+
+
+def decode_token(token: str) -> Optional[TokenClaims]:
+    """解码并验证Token（签名、有效期），无效时返回 None"""
+    claims = token_cache.get(token)
+    if claims is not None and claims.exp > time.time():
+        # 解码过的Token，并且还没过期，直接用
+        return claims
     try:
         # 解码Token，获取用户信息
         payload = jwt.decode(
@@ -33,28 +67,58 @@ async def get_current_user(
             algorithms=["HS256"],  # 加密算法（和生成Token时一致）
             options={"verify_exp": True}  # 验证Token是否过期
         )
-        # 从Token里提取用户ID和角色
-        user_id: str = payload.get("sub")
-        role: str = payload.get("role")
-        if user_id is None or role is None:
-            raise credentials_exception
-        token_data = TokenData(user_id=int(user_id), role=role)
     except PyJWTError:
-        raise credentials_exception
+        return None
+    # 从Token里提取用户ID和角色
+    user_id = payload.get("sub")
+    role = payload.get("role")
+    if user_id is None or role is None:
+        return None
+    claims = TokenClaims(user_id=int(user_id), role=role, exp=payload.get("exp", time.time() + token_cache.ttl),
+                         jti=payload.get("jti"), issued_at=payload.get("iat", 0))
+    # 缓存时间不超过Token本身的有效期
+    token_cache.set(token, claims, ttl=min(token_cache.ttl, claims.exp - time.time()))
+    return claims
+
 
-    # 用户是否存在
-    user = await db.get(User, token_data.user_id)
-    if user is None:
+# 依赖1：验证Token，获取当前登录的用户
+async def get_current_user(
+    db: AsyncSession = Depends(get_read_db),  # 只读会话（只查用户表，不用提交；缓存命中时不会取连接）
+    token: str = Depends(oauth2_scheme)  # 从请求头获取Token
+) -> Principal:
+    # Token无效时返回
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="登录失效或未登录，请重新登录",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    claims = decode_token(token)
+    if claims is None:
+        raise credentials_exception
+    # 是否已经注销（只查内存，不查数据库）
+    if revocations.is_revoked(claims.user_id, claims.jti, claims.issued_at):
         raise credentials_exception
+    token_data = TokenData(user_id=claims.user_id, role=claims.role)
+
+    # 用户是否存在（先查缓存，缓存没有才查数据库）
+    principal = principal_cache.get(token_data.user_id)
+    if principal is None:
+        row = (await db.execute(
+            select(User.id, User.username, User.role, User.status).where(User.id == token_data.user_id)
+        )).first()
+        if row is None:
+            raise credentials_exception
+        principal = Principal(id=row.id, username=row.username, role=row.role, status=row.status)
+        principal_cache.set(principal.id, principal)
     # 检查用户是否被禁用
-    if user.status != 1:
+    if principal.status != 1:
         raise HTTPException(status_code=403, detail="账号已被禁用")
-    return user
+    return principal
 
 # 3. 依赖2：角色权限控制（比如只允许管理员访问）
 def role_required(allowed_roles: List[str]):
     # 内部函数，接收当前登录用户
-    def decorator(current_user: User = Depends(get_current_user)):
+    def decorator(current_user: Principal = Depends(get_current_user)):
         # 检查用户角色是否在允许的列表里
         if current_user.role not in allowed_roles:
             raise HTTPException(
@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+from typing import AsyncIterator
+
+from Student_Management_System.app.database import ReadSessionLocal
+from Student_Management_System.app.models import Student
+from Student_Management_System.app.queries import select_students
+from Student_Management_System.app.schemas.student import DataFormatEnum
+
+
+# 学生导出
+# 用服务器端游标（stream + yield_per）一批一批地读，读一批写一批，
+# 不管表里有多少学生，内存里最多只有一批数据。
+
+# 可以导出的列（和 StudentBase 响应模型的字段一致）
+EXPORT_COLUMNS = ["id", "student_name", "gender", "age", "phone", "email",
+                  "clazz_id", "clazz_name", "username", "create_time"]
+
+
+def encode_value(value):
+    """时间转ISO字符串，其它保持原样"""
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+async def export_students(conditions: list, columns: list, fmt: DataFormatEnum,
+                          batch_size: int = 1000, session_factory=ReadSessionLocal) -> AsyncIterator[bytes]:
+    """
+    按筛选条件导出学生，逐批生成 CSV/NDJSON 字节块
+    这里自己开一个会话：响应是边查边发的，不能依赖请求结束时就关闭的 get_db 会话
+    默认用只读会话（配置了副本时连副本）
+    """
+    stmt = select_students(*conditions).order_by(Student.id).execution_options(yield_per=batch_size)
+    async with session_factory() as session:
+        result = await session.stream(stmt)
+        if fmt == DataFormatEnum.csv:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerow(columns)  # 表头
+            async for rows in result.partitions():
+                for row in rows:
+                    mapping = row._mapping
+                    writer.writerow([encode_value(mapping[c]) for c in columns])
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode("utf-8")
+        else:
+            async for rows in result.partitions():
+                lines = []
+                for row in rows:
+                    mapping = row._mapping
+                    lines.append(json.dumps({c: encode_value(mapping[c]) for c in columns}, ensure_ascii=False))
+                yield ("\n".join(lines) + "\n").encode("utf-8")
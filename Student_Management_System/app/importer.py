@@ -0,0 +1,214 @@
+import csv
+import json
+import time
+from typing import AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Student_Management_System.app.models import User, Clazz, Student
+from Student_Management_System.app.passwords import password_hasher
+from Student_Management_System.app.queries import adjust_student_counts, count_by_clazz
+from Student_Management_System.app.search import reindex_students
+from Student_Management_System.app.schemas.student import StudentCreate, DataFormatEnum
+
+
+# 学生批量导入
+# 请求体按行流式读取（不把整个文件读进内存），每攒够一批就：
+# 1. 用 StudentCreate 校验每一行
+# 2. 用户名、班级ID 各用一条 IN (...) 查询批量校验
+# 3. 在密码加密线程池里并行加密（bcrypt 计算时会释放GIL，可以真正并行）
+# 4. 用户表、学生表各用一条多行 INSERT 写入，生成搜索索引、更新班级人数，然后提交
+
+
+def decode_line(line: bytes):
+    """解码一行；不是合法的 UTF-8 时返回异常对象（交给 iter_records 报成这一行的错误，不中断整个导入）"""
+    try:
+        return line.rstrip(b"\r").decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        return e
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """把字节流切成一行一行的文本（跨块的行会拼起来）；解码失败的行是 UnicodeDecodeError 对象"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()  # 最后一段可能还不完整，留到下一块
+        for line in lines:
+            yield decode_line(line)
+    if buffer:
+        yield decode_line(buffer)
+
+
+async def iter_records(lines: AsyncIterator[str], fmt: DataFormatEnum) -> AsyncIterator[tuple]:
+    """
+    把文本行解析成 (行号, 字典或错误信息)
+    CSV 第一行是表头；NDJSON 每行一个JSON对象；空行跳过
+    CSV 里用双引号括起来的单元格可以包含换行：引号没闭合时把下一行拼上来，凑成一条完整记录再解析
+    """
+    header = None
+    row_no = 0
+    pending = ""  # CSV：还没凑完整的记录（单元格里有换行）
+    async for line in lines:
+        if isinstance(line, UnicodeDecodeError):
+            # 这一行（CSV 里连同没凑完整的记录）作废，报成一行错误
+            row_no += 1
+            pending = ""
+            yield row_no, f"编码错误：不是UTF-8文本（第{line.start + 1}个字节）"
+            continue
+        if fmt == DataFormatEnum.csv:
+            pending = f"{pending}\n{line}" if pending else line
+            # 双引号个数是奇数：还在引号里面（转义的引号 "" 成对出现，不影响奇偶），等下一行
+            if pending.count('"') % 2 == 1:
+                continue
+            line, pending = pending, ""
+        if not line.strip():
+            continue
+        if fmt == DataFormatEnum.csv and header is None:
+            header = [h.strip() for h in next(csv.reader(line.splitlines(keepends=True)))]
+            continue
+        row_no += 1
+        try:
+            if fmt == DataFormatEnum.csv:
+                values = next(csv.reader(line.splitlines(keepends=True)))
+                # CSV 里的空单元格当作没填（比如可选的手机号、邮箱）
+                record = {k: v for k, v in zip(header, values) if v != ""}
+            else:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("每一行必须是一个JSON对象")
+            yield row_no, record
+        except (ValueError, csv.Error) as e:
+            yield row_no, f"格式错误：{e}"
+    if pending:
+        yield row_no + 1, "格式错误：双引号没有闭合"
+
+
+def format_validation_error(e: ValidationError) -> str:
+    """把 pydantic 的校验错误压缩成一行文字"""
+    return "；".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors())
+
+
+class StudentImporter:
+    def __init__(self, db: AsyncSession, batch_size: int = 1000):
+        self.db = db
+        self.batch_size = batch_size
+        self.known_clazz_ids = set()  # 已确认存在的班级ID，后面的批次不用再查
+        self.total = 0
+        self.created = 0
+        self.errors = []
+
+    def add_error(self, row_no: int, username, error: str):
+        self.errors.append({"row": row_no, "username": username, "error": error})
+
+    async def run(self, records: AsyncIterator[tuple]) -> dict:
+        """读取全部记录，按批次导入，返回导入报告"""
+        start = time.perf_counter()
+        batch = []
+        async for row_no, record in records:
+            self.total += 1
+            if isinstance(record, str):  # 解析阶段就出错了
+                self.add_error(row_no, None, record)
+                continue
+            try:
+                batch.append((row_no, StudentCreate(**record)))
+            except ValidationError as e:
+                username = record.get("username")
+                # 用户名本身格式就不对时（比如写成了数字），转成字符串放进报告，报告里的 username 必须是字符串
+                self.add_error(row_no, None if username is None else str(username), format_validation_error(e))
+                continue
+            if len(batch) >= self.batch_size:
+                await self.import_batch(batch)
+                batch = []
+        if batch:
+            await self.import_batch(batch)
+
+        elapsed = time.perf_counter() - start
+        return {
+            "total": self.total,
+            "created": self.created,
+            "failed": len(self.errors),
+            "errors": sorted(self.errors, key=lambda e: e["row"]),  # 按行号排序，方便对照原文件
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.total / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+    async def import_batch(self, batch: list):
+        """导入一批已经通过格式校验的学生"""
+        # 校验1：同一批里用户名不能重复
+        seen = set()
+        unique = []
+        for row_no, item in batch:
+            if item.username in seen:
+                self.add_error(row_no, item.username, f"用户名{item.username}在导入数据中重复")
+                continue
+            seen.add(item.username)
+            unique.append((row_no, item))
+
+        # 校验2：用户名在数据库里不能已存在（一条 IN 查询）
+        existing = set(await self.db.scalars(
+            select(User.username).where(User.username.in_([item.username for _, item in unique]))
+        ))
+
+        # 校验3：班级必须存在（只查还没确认过的班级ID）
+        unknown_ids = {item.clazz_id for _, item in unique} - self.known_clazz_ids
+        if unknown_ids:
+            self.known_clazz_ids.update(await self.db.scalars(select(Clazz.id).where(Clazz.id.in_(unknown_ids))))
+
+        valid = []
+        for row_no, item in unique:
+            if item.username in existing:
+                self.add_error(row_no, item.username, f"用户名{item.username}已存在")
+            elif item.clazz_id not in self.known_clazz_ids:
+                self.add_error(row_no, item.username, f"班级ID{item.clazz_id}不存在")
+            else:
+                valid.append((row_no, item))
+        if not valid:
+            return
+
+        # 并行加密密码（在线程池里跑，不阻塞事件循环）
+        hashed = await password_hasher.hash_many([item.password for _, item in valid])
+
+        try:
+            # 写入用户表（多行INSERT），再按用户名查回自动生成的ID
+            await self.db.execute(insert(User), [
+                {"username": item.username, "password": pw, "role": "student", "status": 1}
+                for (_, item), pw in zip(valid, hashed)
+            ])
+            user_ids = dict((await self.db.execute(
+                select(User.username, User.id).where(User.username.in_([item.username for _, item in valid]))
+            )).all())
+
+            # 写入学生表（多行INSERT）
+            await self.db.execute(insert(Student), [
+                {
+                    "user_id": user_ids[item.username],
+                    "student_name": item.student_name,
+                    "gender": item.gender.value,
+                    "age": item.age,
+                    "phone": item.phone,
+                    "email": item.email,
+                    "clazz_id": item.clazz_id,
+                }
+                for _, item in valid
+            ])
+
+            # 生成这批学生的搜索索引
+            student_ids = list(await self.db.scalars(
+                select(Student.id).where(Student.user_id.in_(list(user_ids.values())))
+            ))
+            await reindex_students(self.db, student_ids)
+            # 更新各班级的学生人数
+            await adjust_student_counts(self.db, count_by_clazz(item.clazz_id for _, item in valid))
+            await self.db.commit()  # 每批提交一次，前面的批次不会因为后面出错而丢失
+        except IntegrityError:
+            # 校验之后又有人抢先插入了同名用户，整批回滚并记为失败
+            await self.db.rollback()
+            for row_no, item in valid:
+                self.add_error(row_no, item.username, "写入失败：数据冲突（可能被其他请求同时创建），请重试")
+            return
+        self.created += len(valid)
@@ -0,0 +1,261 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from Student_Management_System.app.config import settings
+
+
+# 数据库连接池监控
+# 记录：取连接的等待时间、正在使用的连接数、溢出连接数、pre-ping 检测失败次数、取连接超时次数
+# 用来判断连接池大小和 worker 数量是否匹配（等待时间变长 = 连接不够用）
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0  # 取连接次数
+        self.wait_total = 0.0  # 累计等待时间（秒）
+        self.wait_max = 0.0
+        self.timeouts = 0  # 等连接超时的次数
+        self.connects = 0  # 新建物理连接的次数
+        self.pre_ping_failures = 0  # pre-ping 发现连接已失效的次数
+        self.invalidations = 0  # 连接被作废的次数
+
+    def record_wait(self, seconds: float):
+        self.checkouts += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    在取连接时计时的连接池（SQLAlchemy 的连接池事件里没有“开始等待”这个时间点，所以在这里计时）
+    等待时间包括排队等空闲连接，以及连接池没建满时新建连接的时间
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - start)
+
+
+def instrument_pool(engine):
+    """给引擎注册连接池事件"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        pool_metrics.connects += 1
+
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        pool_metrics.invalidations += 1
+
+    @event.listens_for(sync_engine, "handle_error")
+    def on_error(context):
+        if context.is_pre_ping:
+            pool_metrics.pre_ping_failures += 1
+
+
+def pool_stats(engine) -> dict:
+    """连接池当前状态 + 累计统计"""
+    pool = engine.pool
+    return {
+        "size": pool.size() if hasattr(pool, "size") else None,  # 连接池大小
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,  # 正在使用的连接数
+        "overflow": pool.overflow() if hasattr(pool, "overflow") else None,  # 超出连接池大小的连接数（负数表示还没建满）
+        "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,  # 空闲连接数
+        "checkouts": pool_metrics.checkouts,
+        "wait_avg": round(pool_metrics.wait_total / pool_metrics.checkouts, 6) if pool_metrics.checkouts else 0.0,
+        "wait_max": round(pool_metrics.wait_max, 6),
+        "timeouts": pool_metrics.timeouts,
+        "connects": pool_metrics.connects,
+        "pre_ping_failures": pool_metrics.pre_ping_failures,
+        "invalidations": pool_metrics.invalidations,
+    }
+
+
+# ---------------- SQL 监控 ----------------
+# 每个请求：执行了几条SQL、数据库总耗时、最慢的一条 -> 写到 Server-Timing 响应头
+# 全局：按接口统计请求数/耗时/SQL数，SQL耗时分布，慢查询次数 -> /metrics（Prometheus格式）
+# 超过阈值的SQL写慢查询日志（参数不打印具体值，避免泄露密码、手机号等）
+
+slow_query_logger = logging.getLogger("student_management.slow_query")
+
+# 耗时分布的分桶（秒）
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Prometheus 直方图：每个分桶的累计次数 + 总和 + 总次数"""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+
+    def render(self, name: str, labels: str = "") -> list:
+        prefix = labels + "," if labels else ""
+        lines = [f'{name}_bucket{{{prefix}le="{upper}"}} {count}' for upper, count in zip(self.buckets, self.counts)]
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.sum}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+class RequestSqlStats:
+    """一个请求里的SQL统计"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0  # 秒
+        self.slowest = 0.0
+        self.slowest_statement = ""
+
+    def add(self, statement: str, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.slowest:
+            self.slowest = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self, total_seconds: float) -> str:
+        """生成 Server-Timing 响应头（浏览器开发者工具里能直接看到）"""
+        return (f'db;desc="{self.count} queries";dur={self.total * 1000:.1f}, '
+                f'db-slowest;dur={self.slowest * 1000:.1f}, '
+                f'total;dur={total_seconds * 1000:.1f}')
+
+
+# 当前请求的SQL统计（中间件里设置，SQL事件里累加）
+current_sql_stats: ContextVar[Optional[RequestSqlStats]] = ContextVar("current_sql_stats", default=None)
+
+
+class SqlMetrics:
+    def __init__(self):
+        self.query_duration = Histogram()
+        self.slow_queries = 0
+        self.routes = {}  # (请求方法, 路由, 状态码) -> 统计
+
+    def observe_query(self, statement: str, parameters, executemany: bool, seconds: float):
+        self.query_duration.observe(seconds)
+        stats = current_sql_stats.get()
+        if stats is not None:
+            stats.add(statement, seconds)
+        if seconds * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            self.slow_queries += 1
+            slow_query_logger.warning(
+                "慢查询 %.1fms: %s | 参数: %s",
+                seconds * 1000, " ".join(statement.split())[:1000], redact_parameters(parameters, executemany)
+            )
+
+    def observe_request(self, method: str, route: str, status_code: int, seconds: float, stats: RequestSqlStats):
+        key = (method, route, status_code)
+        item = self.routes.get(key)
+        if item is None:
+            item = self.routes[key] = {"duration": Histogram(), "queries": 0, "db_seconds": 0.0}
+        item["duration"].observe(seconds)
+        item["queries"] += stats.count
+        item["db_seconds"] += stats.total
+
+
+sql_metrics = SqlMetrics()
+
+
+def redact_parameters(parameters, executemany: bool) -> str:
+    """只记录参数的个数和名字，不记录具体值"""
+    if executemany:
+        return f"<批量执行 {len(parameters)} 组参数，已隐藏>"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}=?" for k in parameters) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return f"<{len(parameters)} 个参数，已隐藏>"
+    return "<已隐藏>"
+
+
+def instrument_queries(engine):
+    """给引擎注册SQL执行前后的事件，统计每条SQL的耗时"""
+    sync_engine = engine.sync_engine
+
+    # 开始时间存在这条SQL自己的执行上下文（context）上，不放在连接上：
+    # SQL 执行出错时不会触发 after_cursor_execute，放在连接上的开始时间会留下来，下一条SQL就算错了
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - context._query_start
+        sql_metrics.observe_query(statement, parameters, executemany, seconds)
+
+
+async def sql_metrics_middleware(request, call_next):
+    """HTTP中间件：统计每个请求的SQL数量和耗时，写入 Server-Timing 响应头"""
+    stats = RequestSqlStats()
+    token = current_sql_stats.set(stats)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_sql_stats.reset(token)
+    seconds = time.perf_counter() - start
+    # 用路由模板（比如 /api/students/{student_id}）而不是实际路径，避免每个ID都单独统计
+    route = request.scope.get("route")
+    sql_metrics.observe_request(request.method, route.path if route else "unmatched", response.status_code,
+                                seconds, stats)
+    response.headers["Server-Timing"] = stats.server_timing(seconds)
+    return response
+
+
+def render_prometheus(pool: dict, extra: dict) -> str:
+    """
+    生成 Prometheus 文本格式
+    pool：连接池统计（pool_stats 的结果）；extra：其它数值指标 {指标名: 值}
+    """
+    lines = [
+        "# HELP http_request_duration_seconds 请求耗时",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route, code), item in sorted(sql_metrics.routes.items()):
+        lines += item["duration"].render("http_request_duration_seconds",
+                                         f'method="{method}",route="{route}",status="{code}"')
+    lines += ["# HELP http_request_db_queries_total 请求里执行的SQL条数",
+              "# TYPE http_request_db_queries_total counter"]
+    for (method, route, code), item in sorted(sql_metrics.routes.items()):
+        lines.append(f'http_request_db_queries_total{{method="{method}",route="{route}",status="{code}"}} '
+                     f'{item["queries"]}')
+    lines += ["# HELP http_request_db_seconds_total 请求里的数据库耗时",
+              "# TYPE http_request_db_seconds_total counter"]
+    for (method, route, code), item in sorted(sql_metrics.routes.items()):
+        lines.append(f'http_request_db_seconds_total{{method="{method}",route="{route}",status="{code}"}} '
+                     f'{item["db_seconds"]}')
+    lines += ["# HELP db_query_duration_seconds 单条SQL耗时",
+              "# TYPE db_query_duration_seconds histogram"]
+    lines += sql_metrics.query_duration.render("db_query_duration_seconds")
+    lines += ["# HELP db_slow_queries_total 慢查询次数",
+              "# TYPE db_slow_queries_total counter",
+              f"db_slow_queries_total {sql_metrics.slow_queries}"]
+    for key, value in pool.items():
+        if isinstance(value, (int, float)):
+            lines.append(f"db_pool_{key} {value}")
+    for key, value in extra.items():
+        lines.append(f"{key} {value}")
+    return "\n".join(lines) + "\n"
@@ -1,5 +1,10 @@
 from .user import User
 from .clazz import Clazz
 from .student import Student
+from .search import StudentSearchGram
+from .course import Course
+from .score import Score
+from .enrollment import Enrollment
+from .token import TokenRevocation
 
-__all__ = ["User", "Clazz", "Student"]
\ No newline at end of file
+__all__ = ["User", "Clazz", "Student", "StudentSearchGram", "Course", "Score", "Enrollment", "TokenRevocation"]
\ No newline at end of file
@@ -20,6 +20,13 @@ class Clazz(Base):
         ForeignKey("user.id", ondelete="SET NULL"),  # 关联用户表的ID（班主任）
         comment="班主任ID"
     )
+    student_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="学生人数（冗余计数，学生增删、转班时同步更新，班级列表直接读它）"
+    )
     create_time = Column(DateTime, default=datetime.utcnow, comment="创建时间")
 
     # 关系映射：班级和班主任、学生的关联
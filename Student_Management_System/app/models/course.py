@@ -1,4 +1,27 @@
 from Student_Management_System.app.database import Base
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
\ No newline at end of file
+from sqlalchemy.orm import relationship
+
+class Course(Base):
+    __tablename__ = "course"
+    id = Column(Integer, primary_key=True, comment="课程ID")
+    course_name = Column(String(50), unique=True, nullable=False, comment="课程名称（比如：高等数学）")
+    credit = Column(Integer, nullable=False, default=2, comment="学分")
+    teacher_id = Column(
+        Integer,
+        ForeignKey("user.id", ondelete="SET NULL"),  # 关联用户表的ID（任课老师）
+        comment="任课老师ID"
+    )
+    capacity = Column(Integer, nullable=False, default=50, comment="选课人数上限")
+    enrolled_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="已选人数（选课时用 enrolled_count < capacity 条件原子加1，不会超员）"
+    )
+    create_time = Column(DateTime, default=datetime.utcnow, comment="创建时间")
+
+    # 关系映射：课程和任课老师的关联
+    teacher = relationship("User")
@@ -0,0 +1,39 @@
+from Student_Management_System.app.database import Base
+from datetime import datetime
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Enum, UniqueConstraint, Index
+from sqlalchemy.orm import relationship
+
+class Enrollment(Base):
+    __tablename__ = "enrollment"
+    __table_args__ = (
+        # 一个学生同一门课只能选一次（并发重复提交时由数据库拦截）
+        UniqueConstraint("course_id", "student_id", name="uq_enrollment_course_student"),
+        # 退课时按先来后到从候补里补位
+        Index("ix_enrollment_course_status_id", "course_id", "status", "id"),
+        # 查“我的选课”
+        Index("ix_enrollment_student_id", "student_id"),
+    )
+    id = Column(Integer, primary_key=True, comment="选课记录ID（越小越早，候补按它排队）")
+    course_id = Column(
+        Integer,
+        ForeignKey("course.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="课程ID"
+    )
+    student_id = Column(
+        Integer,
+        ForeignKey("student.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="学生ID"
+    )
+    status = Column(
+        Enum("enrolled", "waitlisted"),
+        nullable=False,
+        default="enrolled",
+        comment="状态：已选上/候补中"
+    )
+    create_time = Column(DateTime, default=datetime.utcnow, comment="选课时间")
+
+    # 关系映射：选课记录和课程、学生的关联
+    course = relationship("Course")
+    student = relationship("Student")
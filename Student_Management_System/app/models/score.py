@@ -1,4 +1,39 @@
 from Student_Management_System.app.database import Base
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
\ No newline at end of file
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, UniqueConstraint, Index
+from sqlalchemy.orm import relationship
+
+class Score(Base):
+    __tablename__ = "score"
+    __table_args__ = (
+        # 同一个学生同一门课同一场考试只有一个成绩（批量录入时按它覆盖更新）
+        UniqueConstraint("student_id", "course_id", "exam", name="uq_score_student_course_exam"),
+        # 按课程+考试统计、排名
+        Index("ix_score_course_exam_score", "course_id", "exam", "score"),
+    )
+    id = Column(Integer, primary_key=True, comment="成绩ID")
+    student_id = Column(
+        Integer,
+        ForeignKey("student.id", ondelete="CASCADE"),  # 删除学生时一起删除成绩
+        nullable=False,
+        comment="学生ID"
+    )
+    course_id = Column(
+        Integer,
+        ForeignKey("course.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="课程ID"
+    )
+    exam = Column(String(50), nullable=False, comment="考试名称（比如：2024春季期末）")
+    score = Column(Numeric(5, 2), nullable=False, comment="分数（0-100，保留两位小数）")
+    create_time = Column(DateTime, default=datetime.utcnow, comment="创建时间")
+    update_time = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        comment="更新时间"
+    )
+
+    # 关系映射：成绩和学生、课程的关联
+    student = relationship("Student")
+    course = relationship("Course")
@@ -0,0 +1,31 @@
+from Student_Management_System.app.database import Base
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Index
+
+
+class StudentSearchGram(Base):
+    """
+    学生搜索索引表（n-gram 倒排索引）
+    把姓名/用户名/手机号拆成1~3个字的片段（比如“张三丰” -> 张、三、丰、张三、三丰、张三丰），
+    每个片段一行。搜索时先按片段查出候选学生，不用对学生表做 LIKE '%xx%' 全表扫描。
+    注意：升级前就有的学生还没有索引，启动时建好这张表后会自动补建（见 bootstrap.upgrade_data）；
+    SCHEMA_BOOTSTRAP=skip 时要在发布流程里调用一次 POST /api/students/search/reindex，否则按姓名筛选、搜索都查不到这些学生。
+    """
+    __tablename__ = "student_search_gram"
+    # MySQL 默认的排序规则不区分全角半角、带不带音调（比如 "e" 和 "é" 算同一个），不同的片段会撞主键，
+    # 所以这一列按二进制比较（utf8mb4_bin）；SQLite 本来就是按二进制比较，不用设置
+    gram = Column(
+        String(3).with_variant(String(3, collation="utf8mb4_bin"), "mysql"),
+        primary_key=True,
+        comment="文字片段（1~3个字符，小写）"
+    )
+    field = Column(Enum("name", "username", "phone"), primary_key=True, comment="片段来自哪个字段")
+    student_id = Column(
+        Integer,
+        ForeignKey("student.id", ondelete="CASCADE"),  # 删除学生时一起删除索引
+        primary_key=True,
+        comment="学生ID"
+    )
+    __table_args__ = (
+        # 重建某个学生的索引时按学生ID删除
+        Index("ix_student_search_gram_student_id", "student_id"),
+    )
@@ -1,10 +1,14 @@
 from Student_Management_System.app.database import Base
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 
 class Student(Base):
     __tablename__ = "student"
+    __table_args__ = (
+        # 游标分页按 (create_time, id) 往后翻页，需要这个联合索引
+        Index("ix_student_create_time_id", "create_time", "id"),
+    )
     id = Column(Integer, primary_key=True, comment="学生ID")
     user_id = Column(
         Integer,
@@ -0,0 +1,23 @@
+from Student_Management_System.app.database import Base
+from sqlalchemy import Column, Integer, String, Double, ForeignKey, Index
+
+class TokenRevocation(Base):
+    __tablename__ = "token_revocation"
+    __table_args__ = (
+        # 各个进程定时拉取新增的记录
+        Index("ix_token_revocation_created_at", "created_at"),
+        # 清理已经过期的记录
+        Index("ix_token_revocation_expires_at", "expires_at"),
+    )
+    id = Column(Integer, primary_key=True, comment="记录ID（自动增长）")
+    user_id = Column(
+        Integer,
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="用户ID"
+    )
+    jti = Column(String(32), nullable=True, comment="注销的单个Token编号；为空表示注销这个用户的全部Token")
+    # 时间都存时间戳（秒，带小数）：DateTime 在 MySQL 里默认只精确到秒，同一秒内注销再登录会判断错
+    issued_before = Column(Double, nullable=True, comment="全部注销时：这个时间之前签发的Token都失效")
+    expires_at = Column(Double, nullable=False, comment="过期时间：之后相关Token都已自然过期，记录可以删除")
+    created_at = Column(Double, nullable=False, comment="创建时间")
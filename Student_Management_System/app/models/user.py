@@ -2,7 +2,7 @@ from datetime import datetime, timezone
 from sqlalchemy import Column, Integer, String, Enum, SmallInteger, DateTime
 from sqlalchemy.orm import relationship
 from Student_Management_System.app.database import Base
-import bcrypt
+from Student_Management_System.app.passwords import hash_password, check_password
 
 class User(Base):
     __tablename__ = "user"  # 数据库表名
@@ -47,12 +47,11 @@ class User(Base):
     clazzes = relationship("Clazz", back_populates="teacher", lazy="selectin")
 
     # 密码加密方法（把明文密码变成加密后的字符串）
+    # 注意：这两个方法是同步的，在 async 接口里请用 password_hasher（不阻塞事件循环）
     def set_password(self, raw_password: str):
-        salt = bcrypt.gensalt()  # 生成“盐”（让密码更难破解）
-        # 加密密码（先转成字节，加密后再转成字符串存储）
-        self.password = bcrypt.hashpw(raw_password.encode("utf-8"), salt).decode("utf-8")
+        self.password = hash_password(raw_password)
 
     # 密码验证方法（登录时验证输入的密码是否正确）
     def verify_password(self, raw_password: str) -> bool:
         # 把输入的明文密码和数据库里的加密密码对比
-        return bcrypt.checkpw(raw_password.encode("utf-8"), self.password.encode("utf-8"))
\ No newline at end of file
+        return check_password(raw_password, self.password)
\ No newline at end of file
@@ -0,0 +1,71 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# 游标（cursor）分页工具
+# 游标里记住“上一页最后一行”的排序键，下一页直接从它后面接着查（WHERE 排序键 > 上次的值），
+# 不用 OFFSET 跳过前面的记录，所以第5000页和第1页一样快。
+# 游标对客户端是“不透明”的字符串（base64编码的JSON），客户端原样传回即可。
+
+def encode_cursor(sort_key: str, values: list) -> str:
+    """把排序键和最后一行的值编码成游标字符串"""
+    # datetime 不能直接转JSON，先转成ISO格式字符串
+    plain = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps({"k": sort_key, "v": plain}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> list:
+    """解码游标，返回最后一行的排序值；游标不合法或排序方式不一致时返回400"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)  # 补回编码时去掉的 "="
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if data["k"] != sort_key:
+            raise ValueError("sort key mismatch")
+        values = data["v"]
+        if sort_key == "create_time":
+            return [datetime.fromisoformat(values[0]), int(values[1])]
+        return [int(values[0])]
+    except (ValueError, KeyError, TypeError, IndexError):
+        raise HTTPException(status_code=400, detail="分页游标无效（或与当前排序方式不一致）")
+
+
+async def estimate_table_rows(db: AsyncSession, table_name: str) -> Optional[int]:
+    """
+    读取数据库统计信息里的表行数（估算值，不扫表）
+    MySQL 读 information_schema，PostgreSQL 读 pg_class；其它数据库返回 None
+    """
+    dialect = db.bind.dialect.name
+    if dialect == "mysql":
+        sql = text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :t"
+        )
+    elif dialect == "postgresql":
+        sql = text("SELECT reltuples::bigint FROM pg_class WHERE relname = :t")
+    else:
+        return None
+    rows = await db.scalar(sql, {"t": table_name})
+    return max(int(rows), 0) if rows is not None else None
+
+
+async def count_rows(db: AsyncSession, column, conditions: list, mode: str, table_name: str) -> Optional[int]:
+    """
+    按指定方式统计总数：
+    - exact：精确 COUNT（大表会慢）
+    - estimated：无筛选条件时用统计信息估算；有筛选条件或数据库不支持时退回精确统计
+    - none：不统计，返回 None
+    """
+    if mode == "none":
+        return None
+    if mode == "estimated" and not conditions:
+        estimated = await estimate_table_rows(db, table_name)
+        if estimated is not None:
+            return estimated
+    return await db.scalar(select(func.count(column)).where(*conditions))
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Optional
+
+import bcrypt
+from fastapi import HTTPException, status
+
+from Student_Management_System.app.config import settings
+
+
+# 密码加密/校验服务
+# bcrypt 故意算得很慢（一次100~300毫秒），直接在 async 接口里调用会卡住整个事件循环，
+# 所以放到线程池（或进程池）里执行，并且：
+# - 同时计算的数量不超过 workers（并发上限）
+# - 排队等待的请求超过 max_queue 时直接返回503，不让登录高峰把服务拖垮
+# - 记录排队时间和计算时间，方便观察
+
+def hash_password(raw_password: str) -> str:
+    """加密密码（同步函数，在工作线程/进程里执行）"""
+    salt = bcrypt.gensalt()  # 生成“盐”（让密码更难破解）
+    # 加密密码（先转成字节，加密后再转成字符串存储）
+    return bcrypt.hashpw(raw_password.encode("utf-8"), salt).decode("utf-8")
+
+
+def check_password(raw_password: str, hashed_password: str) -> bool:
+    """校验密码（同步函数，在工作线程/进程里执行）"""
+    return bcrypt.checkpw(raw_password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+class PasswordHasher:
+    def __init__(self, workers: int = 4, executor_type: str = "thread", max_queue: int = 100):
+        self.workers = workers
+        self.executor_type = executor_type  # "thread" 或 "process"
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None  # 第一次用到时再创建
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # 统计数据
+        self.waiting = 0  # 正在排队的数量
+        self.running = 0  # 正在计算的数量
+        self.calls = {"hash": 0, "verify": 0}
+        self.rejected = 0  # 因为排队太长被拒绝的次数
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                # 用到时再导入（会带上 multiprocessing，默认的线程池模式用不到，不拖慢启动）
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, kind: str, func, *args):
+        """排队 → 拿到名额 → 在线程池/进程池里计算"""
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="服务繁忙，请稍后再试",
+                headers={"Retry-After": "1"},
+            )
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+
+        self.waiting += 1
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            started_at = time.perf_counter()
+            wait = started_at - queued_at
+            self.queue_wait_total += wait
+            self.queue_wait_max = max(self.queue_wait_max, wait)
+            self.running += 1
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+            cost = time.perf_counter() - started_at
+            self.calls[kind] += 1
+            self.hash_time_total += cost
+            self.hash_time_max = max(self.hash_time_max, cost)
+            return result
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+    async def hash(self, raw_password: str) -> str:
+        """异步加密密码"""
+        return await self._run("hash", hash_password, raw_password)
+
+    async def verify(self, raw_password: str, hashed_password: str) -> bool:
+        """异步校验密码"""
+        return await self._run("verify", check_password, raw_password, hashed_password)
+
+    async def hash_many(self, raw_passwords: list) -> list:
+        """
+        批量加密（批量导入用）
+        每次只提交 workers 个，避免一次性塞满队列，让登录请求也能插进来
+        """
+        hashed = []
+        for i in range(0, len(raw_passwords), self.workers):
+            chunk = raw_passwords[i:i + self.workers]
+            hashed.extend(await asyncio.gather(*(self.hash(pw) for pw in chunk)))
+        return hashed
+
+    def stats(self) -> dict:
+        """统计数据（平均值、最大值单位都是秒）"""
+        done = self.calls["hash"] + self.calls["verify"]
+        return {
+            "executor": self.executor_type,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "waiting": self.waiting,
+            "running": self.running,
+            "hash_calls": self.calls["hash"],
+            "verify_calls": self.calls["verify"],
+            "rejected": self.rejected,
+            "queue_wait_avg": round(self.queue_wait_total / done, 6) if done else 0.0,
+            "queue_wait_max": round(self.queue_wait_max, 6),
+            "hash_time_avg": round(self.hash_time_total / done, 6) if done else 0.0,
+            "hash_time_max": round(self.hash_time_max, 6),
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
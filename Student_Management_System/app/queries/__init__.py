@@ -0,0 +1,17 @@
+from .student import STUDENT_COLUMNS, student_filters, select_students, row_to_student, fetch_student, \
+    CachedStudent, get_cached_student, invalidate_students, student_cache
+from .clazz import CLAZZ_COLUMNS, select_clazzes, select_clazzes_exact, row_to_clazz, fetch_clazz, \
+    adjust_student_counts, count_by_clazz, recount_students
+from .course import COURSE_COLUMNS, select_courses, row_to_course, fetch_course, enroll, drop, \
+    release_enrollments, change_capacity, select_my_enrollments
+from .score import upsert_scores_statement, compute_stats, compute_ranking, invalidate_course_stats, \
+    score_course_ids
+
+__all__ = ["STUDENT_COLUMNS", "student_filters", "select_students", "row_to_student", "fetch_student",
+           "CachedStudent", "get_cached_student", "invalidate_students", "student_cache",
+           "CLAZZ_COLUMNS", "select_clazzes", "select_clazzes_exact", "row_to_clazz", "fetch_clazz",
+           "adjust_student_counts", "count_by_clazz", "recount_students",
+           "COURSE_COLUMNS", "select_courses", "row_to_course", "fetch_course", "enroll", "drop",
+           "release_enrollments", "change_capacity", "select_my_enrollments",
+           "upsert_scores_statement", "compute_stats", "compute_ranking", "invalidate_course_stats",
+           "score_course_ids"]
@@ -0,0 +1,92 @@
+from collections import Counter
+from typing import Optional
+from sqlalchemy import select, update, func, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from Student_Management_System.app.models import Clazz, User, Student
+from Student_Management_System.app.schemas.clazz import ClazzBase
+
+# 班级响应需要的列：班主任名字一起 JOIN 出来，学生人数直接读冗余计数列（不加载 Clazz.students）
+CLAZZ_COLUMNS = (
+    Clazz.id,
+    Clazz.class_name,
+    Clazz.grade,
+    Clazz.major,
+    Clazz.teacher_id,
+    User.username.label("teacher_name"),
+    Clazz.student_count,
+    Clazz.create_time,
+)
+
+
+def select_clazzes(*conditions):
+    """构建班级查询：班级表 LEFT JOIN 用户表（班主任可以为空）"""
+    return (
+        select(*CLAZZ_COLUMNS)
+        .select_from(Clazz)
+        .outerjoin(User, Clazz.teacher_id == User.id)
+        .where(*conditions)
+    )
+
+
+def select_clazzes_exact(*conditions):
+    """
+    同上，但学生人数用 GROUP BY 现算（一条SQL，不读冗余计数）
+    数据量大时比较慢，用来核对或重建计数
+    """
+    student_count = (
+        select(Student.clazz_id, func.count(Student.id).label("student_count"))
+        .group_by(Student.clazz_id)
+        .subquery()
+    )
+    columns = [c for c in CLAZZ_COLUMNS if c.key != "student_count"]
+    return (
+        select(*columns, func.coalesce(student_count.c.student_count, 0).label("student_count"))
+        .select_from(Clazz)
+        .outerjoin(User, Clazz.teacher_id == User.id)
+        .outerjoin(student_count, student_count.c.clazz_id == Clazz.id)
+        .where(*conditions)
+    )
+
+
+def row_to_clazz(row) -> ClazzBase:
+    """把一行查询结果直接转成响应模型"""
+    return ClazzBase(**row._mapping)
+
+
+async def fetch_clazz(db: AsyncSession, clazz_id: int) -> Optional[Row]:
+    """按ID查一个班级，返回查询行（不存在返回 None）"""
+    result = await db.execute(select_clazzes(Clazz.id == clazz_id))
+    return result.first()
+
+
+async def adjust_student_counts(db: AsyncSession, deltas: dict):
+    """
+    更新班级的学生人数：deltas 是 {班级ID: 增加的人数}（减少传负数）
+    用 student_count = student_count + n 原子更新，并发时不会算错；在提交事务前调用
+    按班级ID从小到大更新（加锁顺序固定），两个事务同时转班时不会互相等待形成死锁
+    """
+    for clazz_id in sorted(deltas):
+        delta = deltas[clazz_id]
+        if delta:
+            await db.execute(
+                update(Clazz).where(Clazz.id == clazz_id).values(student_count=Clazz.student_count + delta)
+            )
+
+
+def count_by_clazz(clazz_ids) -> dict:
+    """把学生的班级ID列表统计成 {班级ID: 人数}"""
+    return dict(Counter(clazz_ids))
+
+
+async def recount_students(db: AsyncSession) -> int:
+    """按学生表重新统计所有班级的人数（冗余计数和实际不一致时用），返回更新的班级数"""
+    rows = (await db.execute(select_clazzes_exact())).all()
+    changed = 0
+    for row in rows:
+        result = await db.execute(
+            update(Clazz)
+            .where(Clazz.id == row.id, Clazz.student_count != row.student_count)
+            .values(student_count=row.student_count)
+        )
+        changed += result.rowcount
+    return changed
@@ -0,0 +1,227 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import select, insert, update, delete, func, case, Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from Student_Management_System.app.database import mark_written
+from Student_Management_System.app.models import Course, User, Enrollment
+from Student_Management_System.app.schemas.course import CourseBase
+
+# 课程响应需要的列：任课老师名字一起 JOIN 出来，已选人数直接读计数列
+COURSE_COLUMNS = (
+    Course.id,
+    Course.course_name,
+    Course.credit,
+    Course.teacher_id,
+    User.username.label("teacher_name"),
+    Course.capacity,
+    Course.enrolled_count,
+    Course.create_time,
+)
+
+
+def select_courses(*conditions):
+    """构建课程查询：课程表 LEFT JOIN 用户表（任课老师可以为空）"""
+    return (
+        select(*COURSE_COLUMNS)
+        .select_from(Course)
+        .outerjoin(User, Course.teacher_id == User.id)
+        .where(*conditions)
+    )
+
+
+def row_to_course(row) -> CourseBase:
+    """把一行查询结果直接转成响应模型"""
+    return CourseBase(**row._mapping)
+
+
+async def fetch_course(db: AsyncSession, course_id: int) -> Optional[Row]:
+    """按ID查一门课程，返回查询行（不存在返回 None）"""
+    result = await db.execute(select_courses(Course.id == course_id))
+    return result.first()
+
+
+# ---------------- 选课 ----------------
+# 选课高峰时几千人同时抢同一门课，名额不能在 Python 里“先查剩几个、再写回去”（两个请求会看到同一个剩余名额）。
+# 这里让数据库来保证：
+# - 抢名额：UPDATE course SET enrolled_count = enrolled_count + 1 WHERE id = ? AND enrolled_count < capacity
+#   这一条语句是原子的（数据库给这一行加锁、重新判断条件），影响行数为1就是抢到了，为0就是满了
+# - 防重复：enrollment 表上 (course_id, student_id) 唯一约束，重复提交时插入失败，连同抢到的名额一起回滚
+# - 候补：满了就以 waitlisted 状态插入，按选课记录ID先来后到；有人退课或扩容时按顺序补上
+# 先 UPDATE 课程再 INSERT 选课记录：INSERT 的外键检查会给课程行加共享锁，
+# 如果反过来先 INSERT，两个事务都拿着共享锁再去 UPDATE，就会互相等待（死锁）
+
+
+async def waitlist_position(db: AsyncSession, course_id: int, enrollment_id: int) -> int:
+    """候补排在第几位（前面还有几个候补 + 1）"""
+    return await db.scalar(
+        select(func.count(Enrollment.id))
+        .where(Enrollment.course_id == course_id, Enrollment.status == "waitlisted", Enrollment.id <= enrollment_id)
+    )
+
+
+async def enroll(db: AsyncSession, course_id: int, student_id: int) -> dict:
+    """选课：抢到名额就选上，满了进候补；重复选课返回409。会提交事务"""
+    # 1. 原子地抢一个名额（不需要先把课程读出来）
+    result = await db.execute(
+        update(Course)
+        .where(Course.id == course_id, Course.enrolled_count < Course.capacity)
+        .values(enrolled_count=Course.enrolled_count + 1)
+    )
+    seated = result.rowcount == 1
+    if not seated and not await db.scalar(select(Course.id).where(Course.id == course_id)):
+        raise HTTPException(status_code=404, detail=f"课程ID{course_id}不存在")
+
+    # 2. 写选课记录（唯一约束拦住重复选课）
+    try:
+        result = await db.execute(insert(Enrollment).values(
+            course_id=course_id,
+            student_id=student_id,
+            status="enrolled" if seated else "waitlisted",
+            create_time=datetime.utcnow(),
+        ))
+    except IntegrityError:
+        await db.rollback()  # 第1步抢到的名额也一起退回
+        raise HTTPException(status_code=409, detail=f"已经选过课程ID{course_id}（或正在候补）")
+    enrollment_id = result.inserted_primary_key[0]
+
+    position = None if seated else await waitlist_position(db, course_id, enrollment_id)
+    await db.commit()  # 尽快提交，课程行上的锁只持有这么一小段
+    mark_written(("course", course_id))
+    return {
+        "course_id": course_id,
+        "student_id": student_id,
+        "status": "enrolled" if seated else "waitlisted",
+        "waitlist_position": position,
+    }
+
+
+async def fill_from_waitlist(db: AsyncSession, course_id: int) -> int:
+    """
+    有空位时按先来后到把候补转成已选，返回补上的人数（调用前要先锁住课程行）
+    空位数 = capacity - enrolled_count，一次补满
+    """
+    course = (await db.execute(
+        select(Course.capacity, Course.enrolled_count).where(Course.id == course_id)
+    )).first()
+    free = course.capacity - course.enrolled_count
+    if free <= 0:
+        return 0
+    ids = list(await db.scalars(
+        select(Enrollment.id)
+        .where(Enrollment.course_id == course_id, Enrollment.status == "waitlisted")
+        .order_by(Enrollment.id)
+        .limit(free)
+    ))
+    if ids:
+        await db.execute(update(Enrollment).where(Enrollment.id.in_(ids)).values(status="enrolled"))
+        await db.execute(
+            update(Course).where(Course.id == course_id).values(enrolled_count=Course.enrolled_count + len(ids))
+        )
+    return len(ids)
+
+
+async def lock_course(db: AsyncSession, course_id: int) -> bool:
+    """锁住课程行（SELECT ... FOR UPDATE），和并发的选课请求排队，返回课程是否存在"""
+    return await db.scalar(select(Course.id).where(Course.id == course_id).with_for_update()) is not None
+
+
+async def drop(db: AsyncSession, course_id: int, student_id: int) -> dict:
+    """退课：删除选课记录；退掉的是已选名额时，由候补第一位补上。会提交事务"""
+    # 先锁课程行：和正在抢名额的请求排队，避免“刚退出一个空位，同时有人因为满了进了候补”却没补上
+    if not await lock_course(db, course_id):
+        raise HTTPException(status_code=404, detail=f"课程ID{course_id}不存在")
+    status = await db.scalar(
+        select(Enrollment.status).where(Enrollment.course_id == course_id, Enrollment.student_id == student_id)
+    )
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"没有选过课程ID{course_id}")
+
+    await db.execute(
+        delete(Enrollment).where(Enrollment.course_id == course_id, Enrollment.student_id == student_id)
+    )
+    promoted = 0
+    if status == "enrolled":
+        await db.execute(
+            update(Course).where(Course.id == course_id).values(enrolled_count=Course.enrolled_count - 1)
+        )
+        promoted = await fill_from_waitlist(db, course_id)
+    await db.commit()
+    mark_written(("course", course_id))
+    return {"course_id": course_id, "student_id": student_id, "dropped": status, "promoted": promoted}
+
+
+async def release_enrollments(db: AsyncSession, student_ids: list) -> list:
+    """
+    删除学生之前调用：删掉这些学生的选课记录，把占着的名额还给课程，并从候补里补人（不提交事务）
+    不能只靠外键级联删除：级联不会减 enrolled_count，也不会补候补（SQLite 没开外键时连记录都不会删）
+    返回受影响的课程ID
+    """
+    rows = (await db.execute(
+        select(Enrollment.course_id, Enrollment.status).where(Enrollment.student_id.in_(student_ids))
+    )).all()
+    if not rows:
+        return []
+    seats = {}  # 课程ID -> 要还回去的名额数
+    for row in rows:
+        seats.setdefault(row.course_id, 0)
+        if row.status == "enrolled":
+            seats[row.course_id] += 1
+    # 按课程ID从小到大加锁，和其它同时锁多门课的事务顺序一致，避免死锁
+    for course_id in sorted(seats):
+        await lock_course(db, course_id)
+    await db.execute(delete(Enrollment).where(Enrollment.student_id.in_(student_ids)))
+    for course_id in sorted(seats):
+        if seats[course_id]:
+            await db.execute(
+                update(Course).where(Course.id == course_id)
+                .values(enrolled_count=Course.enrolled_count - seats[course_id])
+            )
+            await fill_from_waitlist(db, course_id)
+    return sorted(seats)
+
+
+async def change_capacity(db: AsyncSession, course_id: int, capacity: int) -> int:
+    """
+    修改选课人数上限：不能小于已选人数（条件 UPDATE，不会和抢名额冲突）；
+    扩容后自动从候补里补人，返回补上的人数（不提交事务）
+    """
+    if not await lock_course(db, course_id):
+        raise HTTPException(status_code=404, detail=f"课程ID{course_id}不存在")
+    result = await db.execute(
+        update(Course)
+        .where(Course.id == course_id, Course.enrolled_count <= capacity)
+        .values(capacity=capacity)
+    )
+    if result.rowcount == 0:
+        raise HTTPException(status_code=400, detail="人数上限不能小于已选人数")
+    return await fill_from_waitlist(db, course_id)
+
+
+def select_my_enrollments(student_id: int):
+    """
+    一个学生的全部选课（一条SQL）：课程信息 JOIN 出来，候补的同时算出排第几位
+    候补位置用关联子查询按 (course_id, status, id) 索引计数，不用逐门课再查
+    """
+    ahead = aliased(Enrollment)
+    position = (
+        select(func.count(ahead.id))
+        .where(ahead.course_id == Enrollment.course_id, ahead.status == "waitlisted", ahead.id <= Enrollment.id)
+        .correlate(Enrollment)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Enrollment.course_id,
+            Course.course_name,
+            Course.credit,
+            Enrollment.status,
+            case((Enrollment.status == "waitlisted", position), else_=None).label("waitlist_position"),
+            Enrollment.create_time,
+        )
+        .join(Course, Enrollment.course_id == Course.id)
+        .where(Enrollment.student_id == student_id)
+        .order_by(Enrollment.id)
+    )
@@ -0,0 +1,172 @@
+import math
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from Student_Management_System.app.cache import TTLCache
+from Student_Management_System.app.config import settings
+from Student_Management_System.app.database import mark_written, cacheable
+from Student_Management_System.app.models import Score, Student
+
+# 成绩统计
+# - 人数/平均分/最高最低/标准差：一条聚合SQL
+# - 中位数/百分位数：先知道人数，再用 ROW_NUMBER() 窗口函数只取需要的那几行来插值（不把全部成绩拉回来）
+# - 等级分布：GROUP BY
+# - 排名：RANK() 窗口函数，数据库里一次算完，不在Python里逐行排序
+# 统计结果会缓存，录入成绩后对应课程的缓存失效；删除学生、改学生的姓名或班级后，这些学生有成绩的课程也失效
+# （失效只在当前进程里；多个 worker 时，其它 worker 最多在 SCORE_STATS_CACHE_TTL_SECONDS 秒后看到新结果）
+
+PERCENTILES = (25, 50, 75, 90, 95)
+
+# 等级分布：(等级, 最低分)
+GRADE_LEVELS = (("A", 90), ("B", 80), ("C", 70), ("D", 60), ("F", 0))
+
+stats_cache = TTLCache(max_size=settings.SCORE_STATS_CACHE_MAX_SIZE, ttl=settings.SCORE_STATS_CACHE_TTL_SECONDS)
+# 每门课的“版本号”：录入成绩时加1，缓存的键里带着版本号，旧结果自然就用不到了（只在当前进程里有效）
+course_versions = {}
+
+
+def invalidate_course_stats(course_id: int):
+    course_versions[course_id] = course_versions.get(course_id, 0) + 1
+    mark_written(("course", course_id))
+
+
+async def score_course_ids(db: AsyncSession, student_ids: list, chunk_size: int = 1000) -> set:
+    """
+    这些学生有成绩的课程ID（删除或修改学生前调用，提交后对这些课程调用 invalidate_course_stats）
+    统计和排名里有学生的班级、姓名，学生删了或改了，这些课程缓存的结果就不对了
+    """
+    course_ids = set()
+    for i in range(0, len(student_ids), chunk_size):
+        course_ids.update(await db.scalars(
+            select(Score.course_id).where(Score.student_id.in_(student_ids[i:i + chunk_size])).distinct()
+        ))
+    return course_ids
+
+
+def score_conditions(course_id: int, exam: str, clazz_id: Optional[int] = None) -> list:
+    conditions = [Score.course_id == course_id, Score.exam == exam]
+    if clazz_id:
+        conditions.append(Student.clazz_id == clazz_id)
+    return conditions
+
+
+def upsert_scores_statement(dialect: str, rows: list):
+    """
+    批量“新增或覆盖”成绩的SQL（一条多行INSERT，冲突时更新分数）
+    MySQL 用 ON DUPLICATE KEY UPDATE，PostgreSQL/SQLite 用 ON CONFLICT DO UPDATE
+    """
+    now = datetime.utcnow()
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(Score).values(rows)
+        return stmt.on_duplicate_key_update(score=stmt.inserted.score, update_time=now)
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(Score).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["student_id", "course_id", "exam"],
+        set_={"score": stmt.excluded.score, "update_time": now}
+    )
+
+
+def interpolate(values: dict, n: int, p: float) -> float:
+    """线性插值求百分位数（和 numpy.percentile 默认算法一致）；values 是 {排序后的位置: 分数}"""
+    pos = p / 100 * (n - 1)
+    low, high = math.floor(pos), math.ceil(pos)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+async def compute_stats(db: AsyncSession, course_id: int, exam: str, clazz_id: Optional[int]) -> dict:
+    """计算成绩统计（带缓存）"""
+    key = ("stats", course_id, exam, clazz_id, course_versions.get(course_id, 0))
+    cached = stats_cache.get(key)
+    if cached is not None:
+        return cached
+
+    conditions = score_conditions(course_id, exam, clazz_id)
+
+    def joined(stmt):
+        return stmt.select_from(Score).join(Student, Score.student_id == Student.id).where(*conditions)
+
+    # 1. 聚合：人数、平均分、最低最高分、平方和（算标准差用，SQLite没有STDDEV函数）
+    agg = (await db.execute(joined(select(
+        func.count(Score.id), func.avg(Score.score), func.min(Score.score), func.max(Score.score),
+        func.sum(Score.score * Score.score)
+    )))).one()
+    n = agg[0]
+    stats = {
+        "course_id": course_id, "exam": exam, "clazz_id": clazz_id, "count": n,
+        "mean": None, "median": None, "stddev": None, "min": None, "max": None,
+        "percentiles": {}, "histogram": {level: 0 for level, _ in GRADE_LEVELS},
+    }
+    if n:
+        mean = float(agg[1])
+        stats["mean"] = round(mean, 2)
+        stats["min"] = float(agg[2])
+        stats["max"] = float(agg[3])
+        stats["stddev"] = round(math.sqrt(max(float(agg[4]) / n - mean * mean, 0.0)), 2)
+
+        # 2. 百分位数：只取插值需要的那几行（第 floor/ceil(p*(n-1)) 名）
+        positions = set()
+        for p in PERCENTILES:
+            pos = p / 100 * (n - 1)
+            positions.update({math.floor(pos), math.ceil(pos)})
+        ranked = joined(select(
+            Score.score, (func.row_number().over(order_by=Score.score) - 1).label("pos")
+        )).subquery()
+        values = {pos: float(score) for score, pos in
+                  await db.execute(select(ranked.c.score, ranked.c.pos).where(ranked.c.pos.in_(positions)))}
+        stats["percentiles"] = {f"p{p}": round(interpolate(values, n, p), 2) for p in PERCENTILES}
+        stats["median"] = stats["percentiles"]["p50"]
+
+        # 3. 等级分布
+        level = case(*((Score.score >= low, name) for name, low in GRADE_LEVELS[:-1]), else_="F").label("level")
+        for name, count in await db.execute(joined(select(level, func.count(Score.id))).group_by(level)):
+            stats["histogram"][name] = count
+
+    if cacheable(db, ("course", course_id)):  # 副本上可能还是录入之前的成绩
+        stats_cache.set(key, stats)
+    return stats
+
+
+async def compute_ranking(db: AsyncSession, course_id: int, exam: str, clazz_id: Optional[int],
+                          page: int, size: int) -> dict:
+    """班内排名 + 全部学生排名（RANK() 窗口函数，同分同名次）"""
+    key = ("ranking", course_id, exam, clazz_id, page, size, course_versions.get(course_id, 0))
+    cached = stats_cache.get(key)
+    if cached is not None:
+        return cached
+
+    ranked = (
+        select(
+            Score.student_id,
+            Student.student_name,
+            Student.clazz_id,
+            Score.score,
+            func.rank().over(partition_by=Student.clazz_id, order_by=Score.score.desc()).label("clazz_rank"),
+            func.rank().over(order_by=Score.score.desc()).label("overall_rank"),
+        )
+        .select_from(Score)
+        .join(Student, Score.student_id == Student.id)
+        .where(*score_conditions(course_id, exam))  # 全部学生一起算，全体排名才准确
+        .subquery()
+    )
+    conditions = [ranked.c.clazz_id == clazz_id] if clazz_id else []
+    rows = await db.execute(
+        select(ranked).where(*conditions)
+        .order_by(ranked.c.overall_rank, ranked.c.student_id)
+        .offset((page - 1) * size).limit(size)
+    )
+    total = await db.scalar(select(func.count()).select_from(ranked).where(*conditions))
+    result = {
+        "items": [{**row._mapping, "score": float(row.score)} for row in rows],
+        "total": total,
+        "page": page,
+        "size": size,
+    }
+    if cacheable(db, ("course", course_id)):
+        stats_cache.set(key, result)
+    return result
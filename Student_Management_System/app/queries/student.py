@@ -0,0 +1,107 @@
+import hashlib
+from typing import Optional, NamedTuple
+from sqlalchemy import select, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from Student_Management_System.app.cache import TTLCache
+from Student_Management_System.app.config import settings
+from Student_Management_System.app.database import mark_written, cacheable
+from Student_Management_System.app.models import Student, User, Clazz
+from Student_Management_System.app.schemas.student import StudentBase
+from Student_Management_System.app.search import search_conditions
+from Student_Management_System.app.serialization import dumps, student_row_dict
+
+# 学生响应需要的列：一次 JOIN 全部查出来，不创建 ORM 对象，也不会再去懒加载 student.clazz / student.user
+STUDENT_COLUMNS = (
+    Student.id,
+    Student.student_name,
+    Student.gender,
+    Student.age,
+    Student.phone,
+    Student.email,
+    Student.clazz_id,
+    Clazz.class_name.label("clazz_name"),
+    User.username,
+    Student.create_time,
+    Student.user_id,  # 权限判断用（学生只能查自己），不会出现在响应里
+)
+
+
+def student_filters(name: Optional[str] = None, clazz_id: Optional[int] = None) -> list:
+    """学生列表/导出共用的筛选条件"""
+    conditions = []
+    if name:
+        # 模糊查询：姓名包含name的学生（比如name=张三，会查到张三、张三丰），走搜索索引
+        conditions.extend(search_conditions(name, ["name"]))
+    if clazz_id:
+        # 精确查询：指定班级ID的学生
+        conditions.append(Student.clazz_id == clazz_id)
+    return conditions
+
+
+def select_students(*conditions):
+    """构建学生查询：学生表 JOIN 用户表、班级表，只查响应需要的列"""
+    return (
+        select(*STUDENT_COLUMNS)
+        .select_from(Student)
+        .join(User, Student.user_id == User.id)
+        .join(Clazz, Student.clazz_id == Clazz.id)
+        .where(*conditions)
+    )
+
+
+def row_to_student(row) -> StudentBase:
+    """把一行查询结果转成响应模型（会逐个字段校验；接口里返回学生用更快的 student_row_dict）"""
+    return StudentBase(**row._mapping)
+
+
+async def fetch_student(db: AsyncSession, student_id: int) -> Optional[Row]:
+    """按ID查一个学生，返回查询行（不存在返回 None）"""
+    result = await db.execute(select_students(Student.id == student_id))
+    return result.first()
+
+
+# ---------------- 单个学生的响应缓存 ----------------
+# 缓存查询结果和ETag：客户端带 If-None-Match 轮询时，命中缓存就不用再查三张表
+# 缓存的是已经编码好的 JSON 字节串，命中时连序列化也省了
+# 学生信息被修改/删除时要调用 invalidate_students
+
+class CachedStudent(NamedTuple):
+    body: bytes  # 响应体（JSON）
+    user_id: int  # 权限判断用（学生只能查自己）
+    etag: str
+
+
+student_cache = TTLCache(max_size=settings.STUDENT_CACHE_MAX_SIZE, ttl=settings.STUDENT_CACHE_TTL_SECONDS)
+
+
+def student_etag(body: bytes) -> str:
+    """
+    强ETag：对编码好的响应体算哈希，响应内容不变 ETag 就不变，内容变了 ETag 一定变
+    （不用更新时间：MySQL 的时间只精确到秒，同一秒里改两次 ETag 不变，客户端会拿到旧数据）
+    """
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+
+async def get_cached_student(db: AsyncSession, student_id: int) -> Optional[CachedStudent]:
+    """先查缓存，没有再查数据库并放进缓存；学生不存在返回 None"""
+    entry = student_cache.get(student_id)
+    if entry is None:
+        row = await fetch_student(db, student_id)
+        if row is None:
+            return None
+        body = dumps(student_row_dict(row))
+        entry = CachedStudent(body, row.user_id, student_etag(body))
+        if cacheable(db, ("student", student_id), ("student", "*")):  # 副本上可能还是改之前的数据
+            student_cache.set(student_id, entry)
+    return entry
+
+
+def invalidate_students(student_ids: Optional[list] = None):
+    """让缓存失效：传学生ID只清这些，不传就全部清空（比如班级改名影响很多学生）"""
+    if student_ids is None:
+        student_cache.clear()
+        mark_written(("student", "*"))
+        return
+    for student_id in student_ids:
+        student_cache.delete(student_id)
+    mark_written(*(("student", student_id) for student_id in student_ids))
@@ -0,0 +1,122 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+from Student_Management_System.app.config import settings
+
+
+# 登录限流（令牌桶）
+# 登录要查一次数据库、算一次 bcrypt（几十毫秒的 CPU），撞库/密码喷洒时大量登录请求会把 CPU 占满，拖慢所有接口。
+# 每个 IP、每个用户名各有一个“桶”：桶里最多 burst 个令牌，每秒补充 rate 个，每次登录尝试拿走一个，
+# 桶空了就直接返回 429（带 Retry-After），不查数据库、不算 bcrypt。
+# 登录成功时退回用户名桶的令牌，所以用户名的额度只算密码错误的次数。
+# 内存有上限：按 key 的哈希分成若干个分片，每个分片是一个 LRU，超过上限时淘汰最久没用的桶
+# （被淘汰的桶下次重新装满，相当于对这个 key 放宽，不会误伤）。
+# 注意：每个 uvicorn 进程各有一份，总限额是 进程数 × 配置值
+
+class TokenBucketLimiter:
+    def __init__(self, burst: float, rate: float, max_keys: int = 100000, shards: int = 16):
+        self.burst = burst  # 桶的容量（允许连续尝试几次）
+        self.rate = rate  # 每秒补充多少个令牌
+        self.max_keys_per_shard = max(1, max_keys // shards)
+        self._shards = [OrderedDict() for _ in range(shards)]  # 每个分片：key -> [剩余令牌数, 上次更新时间]
+        self.allowed = 0
+        self.rejected = 0
+        self.evictions = 0
+
+    def _shard(self, key: Hashable) -> OrderedDict:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def retry_after(self, key: Hashable) -> float:
+        """还要等多少秒才能再试（0 表示现在就可以），不消耗令牌"""
+        bucket = self._shard(key).get(key)
+        if bucket is None:
+            return 0.0
+        tokens = min(self.burst, bucket[0] + (time.monotonic() - bucket[1]) * self.rate)
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def consume(self, key: Hashable):
+        """拿走一个令牌（先用 retry_after 确认过可以）"""
+        shard = self._shard(key)
+        now = time.monotonic()
+        bucket = shard.get(key)
+        if bucket is None:
+            shard[key] = [self.burst - 1, now]
+            while len(shard) > self.max_keys_per_shard:
+                shard.popitem(last=False)
+                self.evictions += 1
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate) - 1
+            bucket[1] = now
+            shard.move_to_end(key)  # 标记为最近使用
+        self.allowed += 1
+
+    def refund(self, key: Hashable):
+        """退回一个令牌（不超过桶的容量）"""
+        bucket = self._shard(key).get(key)
+        if bucket is not None:
+            bucket[0] = min(self.burst, bucket[0] + 1)
+
+    def __len__(self):
+        return sum(len(shard) for shard in self._shards)
+
+    def memory_bytes(self) -> int:
+        """估算占用的内存（分片字典 + 里面的 key 和桶）"""
+        size = sum(sys.getsizeof(shard) for shard in self._shards)
+        for shard in self._shards:
+            size += sum(sys.getsizeof(key) + sys.getsizeof(bucket) + 2 * sys.getsizeof(0.0)
+                        for key, bucket in shard.items())
+        return size
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "evictions": self.evictions,
+            "memory_bytes": self.memory_bytes(),
+        }
+
+
+# 每个 IP：防止一台机器换着用户名喷洒；每个用户名：防止很多 IP 一起爆破同一个账号
+login_ip_limiter = TokenBucketLimiter(
+    burst=settings.LOGIN_RATE_IP_BURST, rate=settings.LOGIN_RATE_IP_PER_MINUTE / 60,
+    max_keys=settings.LOGIN_RATE_MAX_KEYS)
+login_username_limiter = TokenBucketLimiter(
+    burst=settings.LOGIN_RATE_USERNAME_BURST, rate=settings.LOGIN_RATE_USERNAME_PER_MINUTE / 60,
+    max_keys=settings.LOGIN_RATE_MAX_KEYS)
+
+
+def check_login_rate(ip: str, username: str) -> float:
+    """
+    登录前调用：两个桶都有令牌时各拿走一个，返回 0；否则不拿令牌，返回要等待的秒数
+    （先检查再拿，被 IP 限制拦下的请求不会消耗用户名的额度，反过来也一样）
+    """
+    if not settings.LOGIN_RATE_LIMIT_ENABLED:
+        return 0.0
+    username = username.strip().lower()
+    ip_wait = login_ip_limiter.retry_after(ip)
+    username_wait = login_username_limiter.retry_after(username)
+    if ip_wait > 0 or username_wait > 0:
+        if ip_wait > 0:
+            login_ip_limiter.rejected += 1
+        if username_wait > 0:
+            login_username_limiter.rejected += 1
+        return max(ip_wait, username_wait)
+    login_ip_limiter.consume(ip)
+    login_username_limiter.consume(username)
+    return 0.0
+
+
+def refund_login_rate(username: str):
+    """
+    登录成功后调用：退回用户名桶的令牌，用户名的额度只算密码错误的次数
+    （否则别人对这个账号猜几次密码，本人正确的登录也会被 429 拦下；IP 的令牌不退，防止一个 IP 刷请求）
+    """
+    if settings.LOGIN_RATE_LIMIT_ENABLED:
+        login_username_limiter.refund(username.strip().lower())
+
+
+def login_rate_stats() -> dict:
+    return {"ip": login_ip_limiter.stats(), "username": login_username_limiter.stats()}
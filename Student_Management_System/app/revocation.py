@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import sys
+import time
+from typing import Optional
+
+from sqlalchemy import select, insert, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Student_Management_System.app.config import settings
+from Student_Management_System.app.database import engine
+from Student_Management_System.app.models import TokenRevocation
+
+
+# Token 注销（吊销）
+# JWT 本身是无状态的，注销后在过期之前仍然能用。要让注销立即生效，每个请求都要检查 Token 有没有被注销，
+# 如果每次都查数据库，等于每个请求多一条 SQL。所以：
+# - 注销记录写进 token_revocation 表（重启不丢、多个进程共享）
+# - 每个进程在内存里放一份注销名单，请求时只查内存（两次字典查找，没有 I/O）
+# - 后台任务每隔几秒把别的进程新写的记录拉过来（只拉新增的），过期的记录从内存和数据库里清掉
+# 两种注销：
+# - 注销单个 Token（退出登录）：记住 Token 的编号 jti，到 Token 过期为止
+# - 注销用户的全部 Token（管理员操作）：记住截止时间，这之前签发的 Token 都失效，之后重新登录的不受影响
+# 注意：别的进程最多晚 TOKEN_REVOCATION_SYNC_SECONDS 秒生效
+
+logger = logging.getLogger("student_management.revocation")
+
+# 拉取新记录时往前多看一段时间：防止别的进程的事务提交晚了，记录的 created_at 比上次拉取的时间还早
+SYNC_OVERLAP_SECONDS = 10
+# 每拉取多少次清理一次数据库里过期的记录
+CLEANUP_EVERY = 60
+
+
+class RevocationList:
+    def __init__(self):
+        self._tokens = {}  # jti -> Token 过期时间戳
+        self._users = {}  # 用户ID -> (截止时间戳, 记录过期时间戳)
+        self.synced_at = 0.0  # 上次从数据库拉取的时间
+        self.syncs = 0
+        self.rejected = 0  # 拦下了多少个已注销的 Token
+
+    def is_revoked(self, user_id: int, jti: Optional[str], issued_at: float) -> bool:
+        """Token 是否已被注销（每个请求都会调用，只查内存）"""
+        if jti is not None and jti in self._tokens:
+            self.rejected += 1
+            return True
+        cutoff = self._users.get(user_id)
+        if cutoff is not None and issued_at <= cutoff[0]:
+            self.rejected += 1
+            return True
+        return False
+
+    def apply(self, user_id: int, jti: Optional[str], issued_before: Optional[float], expires_at: float):
+        """把一条注销记录放进内存（重复放没有影响）"""
+        if jti is not None:
+            self._tokens[jti] = expires_at
+        if issued_before is not None:
+            current = self._users.get(user_id)
+            if current is None or current[0] < issued_before:
+                self._users[user_id] = (issued_before, expires_at)
+
+    def purge(self, now: float):
+        """删掉已经过期的记录（相关 Token 已经自然过期，不需要再记着）"""
+        self._tokens = {jti: exp for jti, exp in self._tokens.items() if exp > now}
+        self._users = {uid: item for uid, item in self._users.items() if item[1] > now}
+
+    def memory_bytes(self) -> int:
+        """估算占用的内存（字典本身 + 里面的键和值）"""
+        size = sys.getsizeof(self._tokens) + sys.getsizeof(self._users)
+        size += sum(sys.getsizeof(jti) + sys.getsizeof(exp) for jti, exp in self._tokens.items())
+        size += sum(sys.getsizeof(uid) + sys.getsizeof(item) + sys.getsizeof(item[0]) + sys.getsizeof(item[1])
+                    for uid, item in self._users.items())
+        return size
+
+    def stats(self) -> dict:
+        return {
+            "revoked_tokens": len(self._tokens),
+            "revoked_users": len(self._users),
+            "memory_bytes": self.memory_bytes(),
+            "rejected": self.rejected,
+            "syncs": self.syncs,
+            "synced_at": self.synced_at,
+        }
+
+
+revocations = RevocationList()
+
+
+def token_lifetime() -> float:
+    """Token 的有效期（秒）"""
+    return settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+
+async def revoke_token(db: AsyncSession, user_id: int, jti: str, expires_at: float):
+    """注销单个 Token（会提交事务），当前进程立即生效"""
+    await db.execute(insert(TokenRevocation).values(
+        user_id=user_id, jti=jti, expires_at=expires_at, created_at=time.time()))
+    await db.commit()
+    revocations.apply(user_id, jti, None, expires_at)
+
+
+async def revoke_user(db: AsyncSession, user_id: int):
+    """注销用户的全部 Token（会提交事务），当前进程立即生效"""
+    now = time.time()
+    expires_at = now + token_lifetime()  # 这之后，注销前签发的 Token 都已自然过期
+    await db.execute(insert(TokenRevocation).values(
+        user_id=user_id, issued_before=now, expires_at=expires_at, created_at=now))
+    await db.commit()
+    revocations.apply(user_id, None, now, expires_at)
+
+
+async def sync_revocations(full: bool = False):
+    """
+    从数据库拉取注销记录放进内存
+    full=True：启动时加载全部没过期的记录；否则只拉上次之后新增的
+    """
+    now = time.time()
+    query = select(TokenRevocation.user_id, TokenRevocation.jti, TokenRevocation.issued_before,
+                   TokenRevocation.expires_at).where(TokenRevocation.expires_at > now)
+    if not full:
+        query = query.where(TokenRevocation.created_at >= revocations.synced_at - SYNC_OVERLAP_SECONDS)
+    async with engine.connect() as conn:  # 走主库：副本可能还没同步到刚写的记录
+        rows = (await conn.execute(query)).all()
+        if revocations.syncs % CLEANUP_EVERY == 0:
+            await conn.execute(delete(TokenRevocation).where(TokenRevocation.expires_at <= now))
+            await conn.commit()
+    for row in rows:
+        revocations.apply(row.user_id, row.jti, row.issued_before, row.expires_at)
+    revocations.purge(now)
+    revocations.synced_at = now
+    revocations.syncs += 1
+    return len(rows)
+
+
+async def revocation_sync_loop():
+    """后台任务：定时拉取别的进程写的注销记录（启动时由 main.py 创建）"""
+    while True:
+        await asyncio.sleep(settings.TOKEN_REVOCATION_SYNC_SECONDS)
+        try:
+            await sync_revocations()
+        except Exception:  # 数据库暂时连不上时不退出，下次再试
+            logger.exception("同步Token注销记录失败")
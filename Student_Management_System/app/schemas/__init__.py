@@ -1,4 +1,15 @@
 from .user import UserLogin, Token, TokenData, UserBase
-from .student import StudentCreate, StudentUpdate, StudentBase, StudentPagination
+from .student import StudentCreate, StudentUpdate, StudentBase, StudentPagination, \
+    StudentImportError, StudentImportResult, StudentBatchFilter, StudentBatchUpdate, StudentBatchResult
+from .clazz import ClazzCreate, ClazzUpdate, ClazzBase, ClazzPagination
+from .course import CourseCreate, CourseUpdate, CourseBase, CoursePagination, EnrollResult, \
+    EnrollmentBase
+from .score import ScoreEntry, ScoreBulkCreate, ScoreEntryError, ScoreBulkResult, ScoreStats, ScoreRankItem, ScoreRanking
 
-__all__ = ["UserLogin", "Token", "TokenData", "UserBase", "StudentCreate", "StudentUpdate", "StudentBase", "StudentPagination"]
\ No newline at end of file
+__all__ = ["UserLogin", "Token", "TokenData", "UserBase", "StudentCreate", "StudentUpdate", "StudentBase", "StudentPagination",
+           "StudentImportError", "StudentImportResult", "StudentBatchFilter", "StudentBatchUpdate",
+           "StudentBatchResult",
+           "ClazzCreate", "ClazzUpdate", "ClazzBase", "ClazzPagination",
+           "CourseCreate", "CourseUpdate", "CourseBase", "CoursePagination", "EnrollResult", "EnrollmentBase",
+           "ScoreEntry", "ScoreBulkCreate", "ScoreEntryError", "ScoreBulkResult", "ScoreStats", "ScoreRankItem",
+           "ScoreRanking"]
\ No newline at end of file
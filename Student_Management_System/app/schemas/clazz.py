@@ -0,0 +1,47 @@
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
+from typing import Optional
+
+# 添加班级的请求模型
+class ClazzCreate(BaseModel):
+    class_name: str = Field(..., min_length=1, max_length=50, description="班级名称（不能重复）")
+    grade: str = Field(..., min_length=1, max_length=20, description="年级（比如：2023级）")
+    major: str = Field(..., min_length=1, max_length=50, description="专业")
+    teacher_id: Optional[int] = Field(None, description="班主任ID（可选，必须是教师账号）")
+
+# 更新班级的请求模型
+class ClazzUpdate(BaseModel):
+    class_name: Optional[str] = Field(None, min_length=1, max_length=50, description="班级名称（可选）")
+    grade: Optional[str] = Field(None, min_length=1, max_length=20, description="年级（可选）")
+    major: Optional[str] = Field(None, min_length=1, max_length=50, description="专业（可选）")
+    teacher_id: Optional[int] = Field(None, description="班主任ID（可选）")
+
+    @field_validator("class_name", "grade", "major")
+    @classmethod
+    def check_not_null(cls, value):
+        # 可以不传，但不能传 null：数据库里这几列不能为空
+        if value is None:
+            raise ValueError("不能为空")
+        return value
+
+# 班级响应模型
+class ClazzBase(BaseModel):
+    id: int
+    class_name: str
+    grade: str
+    major: str
+    teacher_id: Optional[int]
+    teacher_name: Optional[str] = Field(None, description="班主任用户名")
+    student_count: int = Field(..., description="学生人数")
+    create_time: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+# 分页响应模型
+class ClazzPagination(BaseModel):
+    items: list[ClazzBase] = Field(..., description="当前页的班级列表")
+    total: int = Field(..., description="班级总数")
+    page: int = Field(..., description="当前页码")
+    size: int = Field(..., description="每页显示多少个")
+    pages: int = Field(..., description="总页数")
@@ -0,0 +1,61 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+# 添加课程的请求模型
+class CourseCreate(BaseModel):
+    course_name: str = Field(..., min_length=1, max_length=50, description="课程名称（不能重复）")
+    credit: int = Field(2, ge=0, le=20, description="学分")
+    teacher_id: Optional[int] = Field(None, description="任课老师ID（可选，必须是教师账号）")
+    capacity: int = Field(50, ge=1, le=100000, description="选课人数上限")
+
+# 更新课程的请求模型
+class CourseUpdate(BaseModel):
+    course_name: Optional[str] = Field(None, min_length=1, max_length=50, description="课程名称（可选）")
+    credit: Optional[int] = Field(None, ge=0, le=20, description="学分（可选）")
+    teacher_id: Optional[int] = Field(None, description="任课老师ID（可选）")
+    capacity: Optional[int] = Field(None, ge=1, le=100000, description="选课人数上限（可选，不能小于已选人数）")
+
+# 课程响应模型
+class CourseBase(BaseModel):
+    id: int
+    course_name: str
+    credit: int
+    teacher_id: Optional[int]
+    teacher_name: Optional[str] = Field(None, description="任课老师用户名")
+    capacity: int = Field(..., description="选课人数上限")
+    enrolled_count: int = Field(..., description="已选人数")
+    create_time: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+# 分页响应模型
+class CoursePagination(BaseModel):
+    items: list[CourseBase] = Field(..., description="当前页的课程列表")
+    total: int = Field(..., description="课程总数")
+    page: int = Field(..., description="当前页码")
+    size: int = Field(..., description="每页显示多少个")
+    pages: int = Field(..., description="总页数")
+
+# 选课状态
+class EnrollmentStatusEnum(str, Enum):
+    enrolled = "enrolled"
+    waitlisted = "waitlisted"
+
+# 选课结果
+class EnrollResult(BaseModel):
+    course_id: int
+    student_id: int
+    status: EnrollmentStatusEnum = Field(..., description="enrolled：选上了；waitlisted：人满了，进入候补")
+    waitlist_position: Optional[int] = Field(None, description="候补排在第几位（选上了为空）")
+
+# 我的选课中的一条
+class EnrollmentBase(BaseModel):
+    course_id: int
+    course_name: str
+    credit: int
+    status: EnrollmentStatusEnum
+    waitlist_position: Optional[int] = Field(None, description="候补排在第几位（选上了为空）")
+    create_time: Optional[datetime]
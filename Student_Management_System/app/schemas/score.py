@@ -0,0 +1,55 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+# 批量录入中的一条成绩
+class ScoreEntry(BaseModel):
+    student_id: int = Field(..., description="学生ID")
+    score: float = Field(..., ge=0, le=100, description="分数（0-100）")
+
+# 批量录入成绩的请求模型（比如一个班一门课一场考试的全部成绩）
+class ScoreBulkCreate(BaseModel):
+    course_id: int = Field(..., description="课程ID")
+    exam: str = Field(..., min_length=1, max_length=50, description="考试名称（比如：2024春季期末）")
+    clazz_id: Optional[int] = Field(None, description="班级ID（可选，传了就要求学生都在这个班）")
+    scores: list[ScoreEntry] = Field(..., min_length=1, max_length=10000, description="成绩列表（已有成绩会被覆盖）")
+
+# 批量录入中出错的一条
+class ScoreEntryError(BaseModel):
+    student_id: int
+    error: str
+
+# 批量录入结果
+class ScoreBulkResult(BaseModel):
+    total: int = Field(..., description="提交的成绩条数")
+    saved: int = Field(..., description="保存成功的条数（新增或覆盖）")
+    errors: list[ScoreEntryError] = Field(..., description="出错的成绩")
+
+# 成绩统计
+class ScoreStats(BaseModel):
+    course_id: int
+    exam: str
+    clazz_id: Optional[int] = Field(None, description="班级ID（为空表示全部班级）")
+    count: int = Field(..., description="人数")
+    mean: Optional[float] = Field(None, description="平均分")
+    median: Optional[float] = Field(None, description="中位数")
+    stddev: Optional[float] = Field(None, description="标准差（总体）")
+    min: Optional[float] = Field(None, description="最低分")
+    max: Optional[float] = Field(None, description="最高分")
+    percentiles: dict[str, float] = Field(..., description="百分位数，比如 p25、p75、p90")
+    histogram: dict[str, int] = Field(..., description="等级分布：A(90-100) B(80-89) C(70-79) D(60-69) F(<60)")
+
+# 排名中的一行
+class ScoreRankItem(BaseModel):
+    student_id: int
+    student_name: str
+    clazz_id: int
+    score: float
+    clazz_rank: int = Field(..., description="班内排名（同分同名次）")
+    overall_rank: int = Field(..., description="全部学生中的排名")
+
+# 排名分页
+class ScoreRanking(BaseModel):
+    items: list[ScoreRankItem]
+    total: int
+    page: int
+    size: int
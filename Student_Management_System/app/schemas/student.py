@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, model_validator
 from datetime import datetime
 from typing import Optional
 from enum import Enum
@@ -9,6 +9,17 @@ class GenderEnum(str, Enum):
     female = "女"
     other = "其他"
 
+# 学生列表的排序键（游标分页按它往后翻页）
+class StudentSortEnum(str, Enum):
+    id = "id"
+    create_time = "create_time"
+
+# 总数统计方式：精确 / 估算 / 不统计
+class CountModeEnum(str, Enum):
+    exact = "exact"
+    estimated = "estimated"
+    none = "none"
+
 # 添加学生的请求模型
 class StudentCreate(BaseModel):
     username: str = Field(..., min_length=3, max_length=50, description="登录用户名（学生学号）")
@@ -48,7 +59,57 @@ class StudentBase(BaseModel):
 # 分页响应模型
 class StudentPagination(BaseModel):
     items: list[StudentBase] = Field(..., description="当前页的学生列表")
-    total: int = Field(..., description="学生总人数")
+    total: Optional[int] = Field(None, description="学生总人数（count=none 时不返回）")
     page: int = Field(..., description="当前页码")
     size: int = Field(..., description="每页显示多少人")
-    pages: int = Field(..., description="总页数")
\ No newline at end of file
+    pages: Optional[int] = Field(None, description="总页数（不统计总数时不返回）")
+    next_cursor: Optional[str] = Field(None, description="下一页游标，传给 cursor 参数继续翻页；没有下一页时为空")
+
+
+# 批量导入/导出的数据格式
+class DataFormatEnum(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+# 批量导入中某一行的错误
+class StudentImportError(BaseModel):
+    row: int = Field(..., description="出错的行号（数据行从1开始，不算CSV表头）")
+    username: Optional[str] = Field(None, description="这一行的用户名（能解析出来时才有）")
+    error: str = Field(..., description="错误原因")
+
+# 批量导入结果
+class StudentImportResult(BaseModel):
+    total: int = Field(..., description="读取的数据行数")
+    created: int = Field(..., description="成功导入的学生数")
+    failed: int = Field(..., description="失败的行数")
+    errors: list[StudentImportError] = Field(..., description="每一行的错误明细")
+    elapsed_seconds: float = Field(..., description="耗时（秒）")
+    rows_per_second: float = Field(..., description="导入速度（行/秒）")
+
+# 批量修改：按条件选学生
+class StudentBatchFilter(BaseModel):
+    clazz_id: Optional[int] = Field(None, description="班级ID（比如整班转班）")
+    name: Optional[str] = Field(None, min_length=1, description="姓名包含（可选）")
+
+# 批量修改的请求模型：ids 和 filter 二选一，changes 是要改的字段（和单个修改一样）
+class StudentBatchUpdate(BaseModel):
+    ids: Optional[list[int]] = Field(None, min_length=1, max_length=10000, description="学生ID列表（最多1万个）")
+    filter: Optional[StudentBatchFilter] = Field(None, description="按条件选学生（和 ids 二选一）")
+    changes: StudentUpdate = Field(..., description="要修改的字段，只改传了的字段")
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("ids 和 filter 必须二选一")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("filter 至少要有一个条件（不允许一次修改全部学生）")
+        if not self.changes.model_dump(exclude_unset=True):
+            raise ValueError("changes 不能为空")
+        return self
+
+# 批量修改结果
+class StudentBatchResult(BaseModel):
+    matched: int = Field(..., description="选中的学生数")
+    updated: int = Field(..., description="实际修改的学生数")
+    missing_ids: list[int] = Field(default_factory=list, description="不存在的学生ID（按 ids 修改时）")
+    clazz_changes: dict[int, int] = Field(default_factory=dict, description="转班后各班级人数的变化 {班级ID: 增减人数}")
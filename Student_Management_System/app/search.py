@@ -0,0 +1,124 @@
+from sqlalchemy import select, insert, delete, func, distinct, or_, case, exists
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Student_Management_System.app.models import Student, User, StudentSearchGram
+
+
+# 学生搜索（n-gram 索引，片段长度1~3）
+# 写入：学生新增/修改/删除时调用 reindex_students，重新生成这些学生的片段
+# 查询：把关键词也拆成片段，找出“包含全部片段”的学生作为候选，再用 LIKE 精确确认
+#       （LIKE 只作用在少量候选行上，不再扫全表）
+
+# 可以搜索的字段
+SEARCH_FIELDS = {
+    "name": Student.student_name,
+    "username": User.username,
+    "phone": Student.phone,
+}
+
+
+def split_grams(text: str, n: int) -> set:
+    """长度为 n 的所有相邻片段"""
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def make_grams(text: str) -> set:
+    """把文本拆成 1~3 个字的片段（统一转小写）"""
+    text = text.lower()
+    return split_grams(text, 1) | split_grams(text, 2) | split_grams(text, 3)
+
+
+def query_grams(keyword: str) -> set:
+    """
+    关键词要用到的片段：尽量用长片段（3个字），区分度高、候选少；
+    关键词不够长时退回2个字或单字
+    """
+    keyword = keyword.lower()
+    return split_grams(keyword, min(len(keyword), 3))
+
+
+def candidate_ids(keyword: str, fields: list):
+    """子查询：在指定字段里包含关键词全部片段的学生ID"""
+    grams = query_grams(keyword)
+    return (
+        select(StudentSearchGram.student_id)
+        .where(StudentSearchGram.gram.in_(grams), StudentSearchGram.field.in_(fields))
+        .group_by(StudentSearchGram.student_id, StudentSearchGram.field)
+        .having(func.count(distinct(StudentSearchGram.gram)) == len(grams))
+    )
+
+
+def search_conditions(keyword: str, fields: list) -> list:
+    """搜索条件：先用索引缩小范围，再用 LIKE 确认真的包含关键词"""
+    return [
+        Student.id.in_(candidate_ids(keyword, fields)),
+        or_(*(SEARCH_FIELDS[f].contains(keyword, autoescape=True) for f in fields)),
+    ]
+
+
+def relevance(keyword: str, fields: list):
+    """相关度排序：完全相同 > 开头匹配 > 中间包含（数字越小越靠前）"""
+    whens = []
+    for f in fields:
+        whens.append((SEARCH_FIELDS[f] == keyword, 0))
+    for f in fields:
+        whens.append((SEARCH_FIELDS[f].startswith(keyword, autoescape=True), 1))
+    return case(*whens, else_=2)
+
+
+async def reindex_students(db: AsyncSession, student_ids: list):
+    """重新生成这些学生的搜索片段（学生已删除时只会清掉旧片段）；在提交事务前调用"""
+    if not student_ids:
+        return
+    await db.execute(delete(StudentSearchGram).where(StudentSearchGram.student_id.in_(student_ids)))
+    rows = await db.execute(
+        select(Student.id, Student.student_name, User.username, Student.phone)
+        .join(User, Student.user_id == User.id)
+        .where(Student.id.in_(student_ids))
+    )
+    values = []
+    for row in rows:
+        for field, text in (("name", row.student_name), ("username", row.username), ("phone", row.phone)):
+            if text:
+                values.extend({"gram": g, "field": field, "student_id": row.id} for g in make_grams(text))
+    if values:
+        await db.execute(insert(StudentSearchGram), values)
+
+
+async def rebuild_search_index(db: AsyncSession, batch_size: int = 1000) -> int:
+    """按学生ID分批重建全部索引（上线时或数据不一致时用），返回处理的学生数"""
+    total = 0
+    last_id = 0
+    while True:
+        ids = list(await db.scalars(
+            select(Student.id).where(Student.id > last_id).order_by(Student.id).limit(batch_size)
+        ))
+        if not ids:
+            break
+        await reindex_students(db, ids)
+        await db.commit()
+        total += len(ids)
+        last_id = ids[-1]
+    return total
+
+
+async def backfill_search_index(db: AsyncSession, batch_size: int = 1000) -> int:
+    """
+    给还没有索引片段的学生补建索引（升级前就存在的学生），返回补建的学生数
+    已经有片段的学生不会重建，所以可以重复执行；每批提交一次，中途失败下次接着补
+    """
+    total = 0
+    last_id = 0
+    while True:
+        ids = list(await db.scalars(
+            select(Student.id)
+            .where(Student.id > last_id, ~exists().where(StudentSearchGram.student_id == Student.id))
+            .order_by(Student.id).limit(batch_size)
+        ))
+        if not ids:
+            break
+        await reindex_students(db, ids)
+        await db.commit()
+        total += len(ids)
+        last_id = ids[-1]
+    return total
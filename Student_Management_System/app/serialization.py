@@ -0,0 +1,52 @@
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+from fastapi import Response
+
+try:
+    import orjson  # 可选依赖：装了就用（比标准库 json 快很多），没装就退回标准库
+except ImportError:
+    orjson = None
+
+
+# 响应快速序列化
+# 学生数据是从我们自己的数据库查出来的，写入时已经校验过（StudentCreate/StudentUpdate），
+# 返回时没必要再用 StudentBase 逐个字段校验一遍（EmailStr 校验尤其慢），FastAPI 按 response_model 还会再校验、转换一次。
+# 快速路径：查询行直接转成字典，用 orjson 一次编码成 JSON，返回 FastJSONResponse（FastAPI 遇到 Response 不会再处理）。
+# 注意：只用在“数据来自数据库”的响应上；请求参数的校验完全不变。
+
+def _default(value: Any):
+    """标准库 json 不认识的类型"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"无法序列化 {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """编码成 JSON 字节串（中文不转义，时间转 ISO 格式，和 Pydantic 的输出一致）"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """直接用 dumps 编码的 JSON 响应"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# 学生响应里的字段（和 StudentBase 一致，查询行里多出来的 user_id 不返回）
+STUDENT_FIELDS = ("id", "student_name", "gender", "age", "phone", "email",
+                  "clazz_id", "clazz_name", "username", "create_time")
+
+
+def student_row_dict(row) -> dict:
+    """把一行学生查询结果转成响应字典（不校验，数据来自数据库）"""
+    mapping = row._mapping
+    return {name: mapping[name] for name in STUDENT_FIELDS}
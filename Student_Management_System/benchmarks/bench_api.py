@@ -0,0 +1,423 @@
+"""
+接口压测：启动 main:app，造数据，并发请求认证和学生管理的全部接口，统计延迟、吞吐和每个请求的SQL条数
+
+用法（在项目根目录，也就是 Student_Management_System 的上一级执行）：
+    # 进程内启动 main:app（本地 SQLite 文件），结果存成 JSON
+    python -m Student_Management_System.benchmarks.bench_api run --students 20000 --save before.json
+    # 改完代码再跑一次，和之前的结果对比，有退化时退出码为1（可以放进CI）
+    python -m Student_Management_System.benchmarks.bench_api run --students 20000 --save after.json --baseline before.json
+    # 只对比两份结果
+    python -m Student_Management_System.benchmarks.bench_api compare before.json after.json
+
+说明：
+- 数据库由 DATABASE_URL 决定（默认本地 SQLite 文件 bench_api.db）；想用本地 Postgres/MySQL 替身，设置 DATABASE_URL 即可
+- 默认在同一个进程里通过 ASGI 直接调用 main:app（不走网络，结果稳定，适合对比两次提交）；
+  加 --url http://127.0.0.1:8000 可以压一个单独启动的 uvicorn（造数据仍然直接写 DATABASE_URL 指向的库）
+- 每个接口单独跑一轮（同一时刻只压一个接口），分别统计 p50/p95/p99、每秒请求数、每个请求的SQL条数
+  （SQL条数来自响应头 Server-Timing；导出接口边查边发，SQL在响应头发出之后才执行，所以显示为0）
+- 随机数种子固定，两次运行发出的请求完全一样
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+# 压测默认用本地 SQLite，不连真实数据库（要在导入 app 之前设置）
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///bench_api.db")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("SLOW_QUERY_THRESHOLD_MS", "10000")  # 压测时不打印慢查询日志
+os.environ.setdefault("LOGIN_RATE_LIMIT_ENABLED", "false")  # 压测登录吞吐时关掉登录限流（--url 压的服务也要这样启动）
+
+import bcrypt
+import httpx
+from sqlalchemy import select, func, insert
+
+from Student_Management_System.app.database import engine, Base
+from Student_Management_System.app.models import User, Clazz, Student, StudentSearchGram
+from Student_Management_System.app.search import make_grams
+
+PASSWORD = "bench123"
+SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈"
+GIVEN = "伟芳娜秀英敏静丽强磊军洋勇艳杰娟涛明超兰霞平刚桂华玉萍红玲芬燕彩春菊凤洁梅琳素云莲真环雪荣爱妹香月"
+SERVER_TIMING_QUERIES = re.compile(r'db;desc="(\d+) queries"')
+
+
+# ---------------- 造数据 ----------------
+
+async def seed(students: int, classes: int, bcrypt_rounds: int, fresh: bool):
+    """生成管理员、教师、班级、学生和搜索索引（库里已经有学生时跳过，除非 --fresh）"""
+    async with engine.begin() as conn:
+        if fresh:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        if await conn.scalar(select(func.count(Student.id))):
+            return
+    print(f"生成 {classes} 个班级、{students} 个学生...", file=sys.stderr)
+    start = time.perf_counter()
+    rnd = random.Random(42)
+    # 所有账号用同一个密码，只加密一次
+    hashed = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(bcrypt_rounds)).decode("utf-8")
+    teachers = max(1, classes // 10)
+    async with engine.begin() as conn:
+        await conn.execute(insert(User), [{"id": 1, "username": "bench_admin", "password": hashed, "role": "admin",
+                                           "status": 1}] +
+                           [{"id": 1 + i, "username": f"bench_teacher{i}", "password": hashed, "role": "teacher",
+                             "status": 1} for i in range(1, teachers + 1)])
+        await conn.execute(insert(Clazz), [{"id": i, "class_name": f"压测班级{i}", "grade": "2023级", "major": "计算机",
+                                            "teacher_id": 2 + i % teachers, "student_count": 0}
+                                           for i in range(1, classes + 1)])
+    first_user_id = teachers + 2
+    counts = [0] * (classes + 1)
+    batch = 5000
+    for base in range(0, students, batch):
+        users, rows, grams = [], [], []
+        for i in range(base + 1, min(base + batch, students) + 1):
+            name = rnd.choice(SURNAMES) + "".join(rnd.choice(GIVEN) for _ in range(rnd.randint(1, 2)))
+            username = f"bench_s{i:07d}"
+            phone = f"1{rnd.randint(3, 9)}{rnd.randint(0, 999999999):09d}"
+            clazz_id = i % classes + 1
+            counts[clazz_id] += 1
+            users.append({"id": first_user_id + i, "username": username, "password": hashed, "role": "student",
+                          "status": 1})
+            rows.append({"id": i, "user_id": first_user_id + i, "student_name": name, "gender": "男",
+                         "age": 18 + i % 5, "phone": phone, "email": f"s{i}@example.com", "clazz_id": clazz_id})
+            for f, text in (("name", name), ("username", username), ("phone", phone)):
+                grams.extend({"gram": g, "field": f, "student_id": i} for g in make_grams(text))
+        async with engine.begin() as conn:
+            await conn.execute(insert(User), users)
+            await conn.execute(insert(Student), rows)
+            await conn.execute(insert(StudentSearchGram), grams)
+    async with engine.begin() as conn:
+        for clazz_id in range(1, classes + 1):
+            await conn.execute(Clazz.__table__.update().where(Clazz.id == clazz_id)
+                               .values(student_count=counts[clazz_id]))
+    print(f"生成完成，用时 {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+# ---------------- 压测场景 ----------------
+
+@dataclass
+class Context:
+    """场景之间共享的数据（比如登录拿到的Token、新建的学生ID）"""
+    students: int
+    classes: int
+    rnd: random.Random
+    admin_headers: dict = field(default_factory=dict)
+    tokens: list = field(default_factory=list)  # 登录场景拿到的Token，注销场景用
+    etags: dict = field(default_factory=dict)  # 学生ID -> ETag，304场景用
+    created_ids: list = field(default_factory=list)  # 新建学生场景的结果，修改/删除场景用
+    run_id: str = ""
+
+    def student_id(self) -> int:
+        return self.rnd.randint(1, self.students)
+
+
+@dataclass
+class Scenario:
+    name: str
+    # 生成第 i 个请求：返回 httpx.request 的参数
+    build: Callable[[Context, int], dict]
+    # 请求数 = --requests × factor（比较重的接口少跑几次），至少1个
+    factor: float = 1.0
+    expect: tuple = (200,)
+    # 收到响应后的处理（比如记下Token、ETag）
+    after: Optional[Callable[[Context, int, httpx.Response], None]] = None
+
+
+def new_student(ctx: Context, i: int, prefix: str = "new") -> dict:
+    return {
+        "username": f"bench_{prefix}_{ctx.run_id}_{i}",
+        "password": PASSWORD,
+        "student_name": ctx.rnd.choice(SURNAMES) + ctx.rnd.choice(GIVEN),
+        "gender": "女",
+        "age": 19,
+        "phone": f"139{ctx.rnd.randint(0, 99999999):08d}",
+        "clazz_id": ctx.rnd.randint(1, ctx.classes),
+    }
+
+
+def remember_token(ctx: Context, i: int, response: httpx.Response):
+    if response.status_code == 200:
+        ctx.tokens.append(response.json()["access_token"])
+
+
+def remember_etag(ctx: Context, i: int, response: httpx.Response):
+    if response.status_code == 200 and response.headers.get("etag"):
+        ctx.etags[response.json()["id"]] = response.headers["etag"]
+
+
+def remember_created(ctx: Context, i: int, response: httpx.Response):
+    if response.status_code == 200:
+        ctx.created_ids.append(response.json()["id"])
+
+
+def if_none_match(ctx: Context, i: int) -> dict:
+    student_id, etag = list(ctx.etags.items())[i % len(ctx.etags)]
+    return {"method": "GET", "url": f"/api/students/{student_id}",
+            "headers": {**ctx.admin_headers, "If-None-Match": etag}}
+
+
+def bulk_body(ctx: Context, i: int) -> dict:
+    lines = [json.dumps(new_student(ctx, i * 100 + j, "bulk"), ensure_ascii=False) for j in range(20)]
+    return {"method": "POST", "url": "/api/students/bulk?format=ndjson", "headers": ctx.admin_headers,
+            "content": "\n".join(lines).encode("utf-8")}
+
+
+SCENARIOS = [
+    # ---- app/api/auth.py ----
+    Scenario("auth.login", lambda ctx, i: {
+        "method": "POST", "url": "/api/auth/login",
+        "data": {"username": f"bench_s{ctx.student_id():07d}", "password": PASSWORD},
+    }, factor=0.5, after=remember_token),
+    Scenario("auth.password_hasher_stats", lambda ctx, i: {
+        "method": "GET", "url": "/api/auth/password-hasher/stats", "headers": ctx.admin_headers}),
+    Scenario("auth.cache_stats", lambda ctx, i: {
+        "method": "GET", "url": "/api/auth/cache/stats", "headers": ctx.admin_headers}),
+    # ---- app/api/students.py：只读 ----
+    Scenario("students.list", lambda ctx, i: {
+        "method": "GET", "url": f"/api/students?page={ctx.rnd.randint(1, 50)}&size=20",
+        "headers": ctx.admin_headers}),
+    Scenario("students.list_100_no_count", lambda ctx, i: {
+        "method": "GET", "url": f"/api/students?size=100&count=none&clazz_id={ctx.rnd.randint(1, ctx.classes)}",
+        "headers": ctx.admin_headers}),
+    Scenario("students.get", lambda ctx, i: {
+        "method": "GET", "url": f"/api/students/{ctx.student_id()}", "headers": ctx.admin_headers},
+             after=remember_etag),
+    Scenario("students.get_not_modified", if_none_match, expect=(304,)),
+    Scenario("students.search", lambda ctx, i: {
+        "method": "GET", "url": f"/api/students/search?q={ctx.rnd.choice(SURNAMES)}{ctx.rnd.choice(GIVEN)}",
+        "headers": ctx.admin_headers}),
+    Scenario("students.export_class", lambda ctx, i: {
+        "method": "GET", "url": f"/api/students/export?clazz_id={ctx.rnd.randint(1, ctx.classes)}",
+        "headers": ctx.admin_headers}, factor=0.2),
+    # ---- app/api/students.py：写 ----
+    Scenario("students.create", lambda ctx, i: {
+        "method": "POST", "url": "/api/students", "headers": ctx.admin_headers, "json": new_student(ctx, i)},
+             factor=0.5, after=remember_created),
+    Scenario("students.update", lambda ctx, i: {
+        "method": "PUT", "url": f"/api/students/{ctx.created_ids[i % len(ctx.created_ids)]}",
+        "headers": ctx.admin_headers, "json": {"age": 20 + i % 10}}, factor=0.5),
+    Scenario("students.batch_update", lambda ctx, i: {
+        "method": "PATCH", "url": "/api/students/batch", "headers": ctx.admin_headers,
+        "json": {"ids": ctx.rnd.sample(range(1, ctx.students + 1), min(100, ctx.students)),
+                 "changes": {"age": 18 + i % 5}}}, factor=0.1),
+    Scenario("students.bulk_import_20", bulk_body, factor=0.05),
+    Scenario("students.reindex_all", lambda ctx, i: {
+        "method": "POST", "url": "/api/students/search/reindex", "headers": ctx.admin_headers}, factor=0.0),
+    Scenario("students.delete", lambda ctx, i: {
+        "method": "DELETE", "url": f"/api/students/{ctx.created_ids[i]}", "headers": ctx.admin_headers},
+             factor=0.5),
+    # 注销放最后（用登录场景拿到的Token）
+    Scenario("auth.logout", lambda ctx, i: {
+        "method": "POST", "url": "/api/auth/logout",
+        "headers": {"Authorization": f"Bearer {ctx.tokens[i % len(ctx.tokens)]}"}}, factor=0.5),
+]
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """最近秩百分位数"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+async def run_scenario(client: httpx.AsyncClient, ctx: Context, scenario: Scenario, requests: int,
+                       concurrency: int) -> dict:
+    """并发发出 requests 个请求，统计延迟、吞吐、SQL条数"""
+    specs = [scenario.build(ctx, i) for i in range(requests)]  # 先生成好，计时里不包含生成请求的时间
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, queries = [], []
+    errors = {}
+
+    async def one(i: int, spec: dict):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(**spec)
+            await response.aread()
+            latencies.append((time.perf_counter() - start) * 1000)
+        match = SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+        if match:
+            queries.append(int(match.group(1)))
+        if response.status_code not in scenario.expect:
+            errors[response.status_code] = errors.get(response.status_code, 0) + 1
+        elif scenario.after:
+            scenario.after(ctx, i, response)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i, spec) for i, spec in enumerate(specs)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+async def run_all(args) -> dict:
+    await seed(args.students, args.classes, args.bcrypt_rounds, args.fresh)
+    ctx = Context(students=args.students, classes=args.classes, rnd=random.Random(args.seed),
+                  run_id=str(time.time_ns()))
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=120)
+        lifespan = None
+    else:
+        from Student_Management_System.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120)
+        lifespan = app.router.lifespan_context(app)  # ASGITransport 不会触发启动事件，手动执行
+        await lifespan.__aenter__()
+
+    results = {}
+    try:
+        async with client:
+            response = await client.post("/api/auth/login", data={"username": "bench_admin", "password": PASSWORD})
+            response.raise_for_status()
+            ctx.admin_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            selected = set(args.only.split(",")) if args.only else None
+            for scenario in SCENARIOS:
+                if selected and scenario.name not in selected:
+                    continue
+                requests = max(1, int(args.requests * scenario.factor))
+                if scenario.name == "students.delete":
+                    requests = min(requests, len(ctx.created_ids))  # 只删本次新建的学生
+                if scenario.name == "auth.logout":
+                    requests = min(requests, len(ctx.tokens))  # 每个Token只能注销一次
+                if (scenario.name in ("students.update", "students.delete") and not ctx.created_ids) or \
+                        (scenario.name == "students.get_not_modified" and not ctx.etags) or \
+                        (scenario.name == "auth.logout" and not ctx.tokens):
+                    print(f"跳过 {scenario.name}（依赖的场景没有运行）", file=sys.stderr)
+                    continue
+                print(f"压测 {scenario.name}：{requests} 个请求，并发 {args.concurrency}", file=sys.stderr)
+                results[scenario.name] = await run_scenario(client, ctx, scenario, requests, args.concurrency)
+    finally:
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---------------- 对比 ----------------
+
+def compare(old: dict, new: dict, threshold: float) -> list:
+    """
+    对比两次结果，返回退化的场景列表
+    退化：p95 变慢超过 threshold（且至少慢1毫秒，排除噪音），吞吐下降超过 threshold，或者每个请求多执行了SQL
+    """
+    regressions = []
+    print(f"对比：{old['meta'].get('commit')} -> {new['meta'].get('commit')}（阈值 {threshold:.0%}）")
+    print(f"{'接口':<30}{'p95(旧)':>10}{'p95(新)':>10}{'吞吐(旧)':>10}{'吞吐(新)':>10}{'SQL(旧)':>9}{'SQL(新)':>9}")
+    for name, b in new["results"].items():
+        a = old["results"].get(name)
+        if a is None:
+            print(f"{name:<30}（新增场景）")
+            continue
+        reasons = []
+        if b["p95_ms"] > a["p95_ms"] * (1 + threshold) and b["p95_ms"] - a["p95_ms"] >= 1:
+            reasons.append("p95变慢")
+        if b["throughput_rps"] < a["throughput_rps"] * (1 - threshold):
+            reasons.append("吞吐下降")
+        if a["queries_per_request"] is not None and b["queries_per_request"] is not None and \
+                b["queries_per_request"] > a["queries_per_request"] + 0.01:
+            reasons.append("SQL变多")
+        flag = "  <-- " + "、".join(reasons) if reasons else ""
+        print(f"{name:<30}{a['p95_ms']:>10}{b['p95_ms']:>10}{a['throughput_rps']:>10}{b['throughput_rps']:>10}"
+              f"{str(a['queries_per_request']):>9}{str(b['queries_per_request']):>9}{flag}")
+        if reasons:
+            regressions.append(name)
+    return regressions
+
+
+def print_results(report: dict):
+    meta = report["meta"]
+    print(f"提交：{meta['commit']}  数据库：{meta['database']}  学生：{meta['students']}  并发：{meta['concurrency']}")
+    print(f"{'接口':<30}{'请求数':>7}{'失败':>6}{'吞吐/s':>9}{'p50ms':>9}{'p95ms':>9}{'p99ms':>9}{'SQL/请求':>9}")
+    for name, r in report["results"].items():
+        failed = sum(r["errors"].values())
+        print(f"{name:<30}{r['requests']:>7}{failed:>6}{r['throughput_rps']:>9}{r['p50_ms']:>9}{r['p95_ms']:>9}"
+              f"{r['p99_ms']:>9}{str(r['queries_per_request']):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="接口压测")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="造数据并压测")
+    run.add_argument("--students", type=int, default=10000, help="学生数量（默认1万）")
+    run.add_argument("--classes", type=int, default=100, help="班级数量（默认100）")
+    run.add_argument("--requests", type=int, default=500, help="每个接口的基准请求数（重的接口按比例少跑）")
+    run.add_argument("--concurrency", type=int, default=20, help="并发数（默认20）")
+    run.add_argument("--bcrypt-rounds", type=int, default=12, help="造数据时密码的加密强度（影响登录耗时，默认12）")
+    run.add_argument("--seed", type=int, default=42, help="随机数种子")
+    run.add_argument("--fresh", action="store_true", help="先删掉所有表再造数据（会清空 DATABASE_URL 指向的库！）")
+    run.add_argument("--only", help="只跑这些场景，逗号分隔（比如 students.get,students.list）")
+    run.add_argument("--url", help="压一个已经启动的服务（比如 http://127.0.0.1:8000），不传则进程内启动 main:app")
+    run.add_argument("--save", help="结果保存成JSON文件")
+    run.add_argument("--baseline", help="和之前保存的结果对比，有退化时退出码为1")
+    run.add_argument("--threshold", type=float, default=0.1, help="退化阈值（默认0.1，即10%%）")
+    cmp = sub.add_parser("compare", help="对比两份结果")
+    cmp.add_argument("old")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=0.1, help="退化阈值（默认0.1，即10%%）")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        with open(args.old, encoding="utf-8") as f:
+            old = json.load(f)
+        with open(args.new, encoding="utf-8") as f:
+            new = json.load(f)
+        sys.exit(1 if compare(old, new, args.threshold) else 0)
+
+    results = asyncio.run(run_all(args))
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "target": args.url or "in-process",
+            "students": args.students,
+            "classes": args.classes,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    print_results(report)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到 {args.save}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            old = json.load(f)
+        if compare(old, report, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+选课并发基准测试：模拟选课开放的一瞬间，大量学生同时抢同一门课
+
+用法（在项目根目录，也就是 Student_Management_System 的上一级执行）：
+    python -m Student_Management_System.benchmarks.bench_enroll --students 2000 --capacity 300 --concurrency 50
+
+默认用本地 SQLite 文件；要测 MySQL 的行锁表现，设置 DATABASE_URL 环境变量指向测试库即可
+（每次运行新建一门课程，学生只生成一次，不会清空已有数据）。
+注意 SQLite 写入时锁整个库，并发一高就在忙等里排队，吞吐和尾延迟比 MySQL 的行锁差很多，只适合验证正确性。
+每个学生用独立的会话调用和接口相同的 enroll()，可以让一部分学生重复提交，最后核对：
+- 已选人数 = min(名额, 学生数)，课程计数列和选课记录一致（没有超员）
+- 重复提交全部被拦下（409），没有重复的选课记录
+- 候补位置从1开始连续
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+# 基准测试默认用本地 SQLite，不连真实数据库（要在导入 app 之前设置）
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///bench_enroll.db")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+from fastapi import HTTPException
+from sqlalchemy import select, insert, func
+
+from Student_Management_System.app.database import engine, Base, AsyncSessionLocal
+from Student_Management_System.app.models import User, Clazz, Student, Course, Enrollment
+from Student_Management_System.app.queries import enroll
+
+USERNAME_PREFIX = "bench_enroll_"
+
+
+async def seed(students: int) -> list:
+    """生成测试学生（已经生成过就复用），返回学生ID列表"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as db:
+        clazz_id = await db.scalar(select(Clazz.id).where(Clazz.class_name == "选课压测班"))
+        if clazz_id is None:
+            clazz = Clazz(class_name="选课压测班", grade="2023级", major="计算机", student_count=0)
+            db.add(clazz)
+            await db.flush()
+            clazz_id = clazz.id
+        existing = await db.scalar(select(func.count(User.id)).where(User.username.startswith(USERNAME_PREFIX)))
+        if existing < students:
+            print(f"生成 {students - existing} 个学生...", file=sys.stderr)
+            names = [f"{USERNAME_PREFIX}{i:06d}" for i in range(existing, students)]
+            await db.execute(insert(User), [{"username": n, "password": "x", "role": "student", "status": 1}
+                                            for n in names])
+            user_ids = (await db.execute(select(User.username, User.id).where(User.username.in_(names)))).all()
+            await db.execute(insert(Student), [{"user_id": uid, "student_name": f"压测{name[-6:]}", "gender": "男",
+                                                "age": 18, "clazz_id": clazz_id} for name, uid in user_ids])
+        await db.commit()
+        return list(await db.scalars(
+            select(Student.id).join(User, Student.user_id == User.id)
+            .where(User.username.startswith(USERNAME_PREFIX)).order_by(Student.id).limit(students)
+        ))
+
+
+async def create_course(capacity: int) -> int:
+    """每次运行新建一门课程，互不影响"""
+    async with AsyncSessionLocal() as db:
+        course = Course(course_name=f"选课压测{time.time_ns()}", credit=2, capacity=capacity, enrolled_count=0)
+        db.add(course)
+        await db.commit()
+        return course.id
+
+
+async def run(course_id: int, student_ids: list, concurrency: int, duplicate_rate: float) -> dict:
+    """所有请求同时开始，最多 concurrency 个同时在数据库里执行"""
+    rnd = random.Random(42)
+    requests = student_ids + [sid for sid in student_ids if rnd.random() < duplicate_rate]  # 一部分学生重复提交
+    rnd.shuffle(requests)
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes = {"enrolled": 0, "waitlisted": 0, "duplicate": 0, "error": 0}
+    latencies = []
+    positions = []
+
+    async def one(student_id: int):
+        async with semaphore:
+            start = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                try:
+                    result = await enroll(db, course_id, student_id)
+                    outcomes[result["status"]] += 1
+                    if result["waitlist_position"] is not None:
+                        positions.append(result["waitlist_position"])
+                except HTTPException as e:
+                    outcomes["duplicate" if e.status_code == 409 else "error"] += 1
+                except Exception as e:  # 比如 SQLite 的 database is locked、MySQL 的死锁
+                    outcomes["error"] += 1
+                    print(f"请求失败：{type(e).__name__}: {e}", file=sys.stderr)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(sid) for sid in requests))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(requests),
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(requests) / elapsed, 1),
+        "enrollments_per_second": round((outcomes["enrolled"] + outcomes["waitlisted"]) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+        "waitlist_positions": sorted(positions),
+        **outcomes,
+    }
+
+
+async def verify(course_id: int, capacity: int, students: int, result: dict) -> dict:
+    """核对数据库里的最终状态"""
+    async with AsyncSessionLocal() as db:
+        counter = await db.scalar(select(Course.enrolled_count).where(Course.id == course_id))
+        rows = dict((await db.execute(
+            select(Enrollment.status, func.count(Enrollment.id))
+            .where(Enrollment.course_id == course_id).group_by(Enrollment.status)
+        )).all())
+        distinct_students = await db.scalar(
+            select(func.count(func.distinct(Enrollment.student_id))).where(Enrollment.course_id == course_id)
+        )
+    enrolled = rows.get("enrolled", 0)
+    waitlisted = rows.get("waitlisted", 0)
+    positions = result.pop("waitlist_positions")
+    checks = {
+        "no_overbooking": enrolled <= capacity and counter == enrolled,
+        "seats_filled": enrolled == min(capacity, students),
+        "no_duplicates": distinct_students == enrolled + waitlisted,
+        "waitlist_in_order": positions == list(range(1, len(positions) + 1)),
+    }
+    return {"capacity": capacity, "enrolled_count": counter, "enrolled_rows": enrolled,
+            "waitlisted_rows": waitlisted, "checks": checks}
+
+
+async def main_async(args) -> dict:
+    student_ids = await seed(args.students)
+    course_id = await create_course(args.capacity)
+    result = await run(course_id, student_ids, args.concurrency, args.duplicate_rate)
+    result.update(await verify(course_id, args.capacity, len(student_ids), result))
+    result["database"] = engine.dialect.name
+    result["concurrency"] = args.concurrency
+    await engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="选课并发基准测试")
+    parser.add_argument("--students", type=int, default=2000, help="学生数量（默认2000）")
+    parser.add_argument("--capacity", type=int, default=300, help="课程名额（默认300）")
+    parser.add_argument("--concurrency", type=int, default=50, help="同时执行的请求数（默认50）")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1, help="重复提交的学生比例（默认0.1）")
+    parser.add_argument("--json", action="store_true", help="输出JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print(f"数据库：{result['database']}  并发：{result['concurrency']}  名额：{result['capacity']}")
+        print(f"请求数：{result['requests']}  用时：{result['elapsed_seconds']}s  "
+              f"吞吐：{result['requests_per_second']} 请求/秒，{result['enrollments_per_second']} 选课/秒")
+        print(f"结果：选上 {result['enrolled']}，候补 {result['waitlisted']}，重复被拦 {result['duplicate']}，"
+              f"失败 {result['error']}")
+        print(f"延迟：p50 {result['p50_ms']}ms  p95 {result['p95_ms']}ms  p99 {result['p99_ms']}ms")
+        print("核对：" + "  ".join(f"{k}={'通过' if v else '失败'}" for k, v in result["checks"].items()))
+    if not all(result["checks"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+学生姓名搜索基准测试：LIKE '%xx%' 全表扫描 vs n-gram 搜索索引
+
+用法（在项目根目录，也就是 Student_Management_System 的上一级执行）：
+    python -m Student_Management_System.benchmarks.bench_search --rows 1000000
+
+会在本地 SQLite 文件里生成指定数量的学生并建好索引（已经生成过就直接复用），
+然后对几组关键词分别跑“查一页 + 统计总数”，输出每种方式的耗时中位数。
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+# 基准测试用本地 SQLite，不连真实数据库（要在导入 app 之前设置）
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///bench.db")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+from sqlalchemy import create_engine, select, func, insert, event
+
+from Student_Management_System.app.database import Base
+from Student_Management_System.app.models import User, Clazz, Student, StudentSearchGram
+from Student_Management_System.app.queries import select_students
+from Student_Management_System.app.search import make_grams, search_conditions
+
+SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈"
+GIVEN = "伟芳娜秀英敏静丽强磊军洋勇艳杰娟涛明超秀兰霞平刚桂英华玉萍红娥玲芬燕彩春菊兰凤洁梅琳素云莲真环雪荣爱妹霞香月莺媛艳瑞凡佳嘉琼勤珍贞莉桂娣叶璧璐娅琦晶妍茜秋珊莎锦黛青倩婷姣婉娴瑾颖露瑶怡婵雁蓓纨仪荷丹蓉眉君琴蕊薇菁梦岚苑婕馨瑗琰韵融园艺咏卿聪澜纯毓悦昭冰爽琬茗羽希宁欣飘育滢馥筠柔竹霭凝晓欢霄枫芸菲寒伊亚宜可姬舒影荔枝思丽"
+KEYWORDS = ["王", "伟", "张伟", "李秀英", "s0001234", "138"]
+
+
+def seed(engine, rows: int, batch: int = 20000):
+    """生成学生数据和搜索索引"""
+    rnd = random.Random(42)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        if conn.scalar(select(func.count(Student.id))) >= rows:
+            return
+    print(f"生成 {rows} 个学生和搜索索引...", file=sys.stderr)
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(insert(Clazz), [{"id": i, "class_name": f"班级{i}", "grade": "2023级", "major": "计算机"}
+                                     for i in range(1, 2001)])
+    for base in range(0, rows, batch):
+        users, students, grams = [], [], []
+        for i in range(base + 1, min(base + batch, rows) + 1):
+            name = rnd.choice(SURNAMES) + "".join(rnd.choice(GIVEN) for _ in range(rnd.randint(1, 2)))
+            username = f"s{i:07d}"
+            phone = f"1{rnd.randint(3, 9)}{rnd.randint(0, 999999999):09d}"
+            users.append({"id": i, "username": username, "password": "x", "role": "student", "status": 1})
+            students.append({"id": i, "user_id": i, "student_name": name, "gender": "男", "age": 18,
+                             "phone": phone, "clazz_id": i % 2000 + 1})
+            for field, text in (("name", name), ("username", username), ("phone", phone)):
+                grams.extend({"gram": g, "field": field, "student_id": i} for g in make_grams(text))
+        with engine.begin() as conn:
+            conn.execute(insert(User), users)
+            conn.execute(insert(Student), students)
+            conn.execute(insert(StudentSearchGram), grams)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    print(f"生成完成，用时 {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+def timed(conn, stmt, repeat: int) -> float:
+    """执行多次，返回耗时中位数（毫秒）"""
+    costs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(stmt).all()
+        costs.append((time.perf_counter() - start) * 1000)
+    return statistics.median(costs)
+
+
+def run(engine, repeat: int) -> list:
+    results = []
+    with engine.connect() as conn:
+        for keyword in KEYWORDS:
+            field = "username" if keyword.startswith("s") else "phone" if keyword.isdigit() else "name"
+            column = {"name": Student.student_name, "username": User.username, "phone": Student.phone}[field]
+            # 原来的写法：LIKE '%关键词%'
+            like = [column.like(f"%{keyword}%")]
+            # 搜索索引
+            indexed = search_conditions(keyword, [field])
+            row = {"keyword": keyword, "field": field}
+            for label, conditions in (("like", like), ("index", indexed)):
+                page = select_students(*conditions).order_by(Student.id).limit(20)
+                count = select(func.count(Student.id)).select_from(Student).join(User, Student.user_id == User.id) \
+                    .where(*conditions)
+                row[f"{label}_page_ms"] = round(timed(conn, page, repeat), 2)
+                row[f"{label}_count_ms"] = round(timed(conn, count, repeat), 2)
+                row[f"{label}_matches"] = conn.scalar(count)
+            results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="学生搜索基准测试")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="学生数量（默认100万）")
+    parser.add_argument("--db", default="bench_search.db", help="SQLite 文件路径")
+    parser.add_argument("--repeat", type=int, default=5, help="每个查询执行几次取中位数")
+    parser.add_argument("--json", action="store_true", help="输出JSON")
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}")
+    # SQLite 默认不开外键，基准测试里也不需要；关掉同步写盘加快生成数据
+    event.listen(engine, "connect", lambda dbapi_conn, _: dbapi_conn.execute("PRAGMA synchronous=OFF"))
+    seed(engine, args.rows)
+    results = run(engine, args.repeat)
+
+    if args.json:
+        print(json.dumps({"rows": args.rows, "results": results}, ensure_ascii=False, indent=2))
+        return
+    print(f"学生数：{args.rows}")
+    print(f"{'关键词':<10}{'字段':<10}{'匹配数':>8}{'LIKE分页':>10}{'LIKE计数':>10}{'索引分页':>10}{'索引计数':>10}  (毫秒)")
+    for r in results:
+        print(f"{r['keyword']:<10}{r['field']:<10}{r['index_matches']:>8}{r['like_page_ms']:>10}"
+              f"{r['like_count_ms']:>10}{r['index_page_ms']:>10}{r['index_count_ms']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+学生响应序列化微基准：原来的写法（StudentBase 逐行校验 + FastAPI 按 response_model 再校验、编码）vs 快速路径
+
+用法（在项目根目录，也就是 Student_Management_System 的上一级执行）：
+    python -m Student_Management_System.benchmarks.bench_serialization --rows 100 --repeat 2000
+
+用内存 SQLite 查出真实的查询行（和接口里一样的 select_students），只测“查询行 -> JSON 字节串”这一段，
+输出每秒能处理多少行。
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+# 基准测试不连真实数据库（要在导入 app 之前设置）
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+
+from Student_Management_System.app.database import Base
+from Student_Management_System.app.models import User, Clazz, Student
+from Student_Management_System.app.queries import select_students, row_to_student
+from Student_Management_System.app.schemas.student import StudentPagination
+from Student_Management_System.app.serialization import dumps, student_row_dict, orjson
+
+
+def load_rows(rows: int) -> list:
+    """在内存 SQLite 里造数据，用接口同样的查询查出来"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Clazz), [{"id": 1, "class_name": "计算机2301班", "grade": "2023级", "major": "计算机"}])
+        conn.execute(insert(User), [{"id": i, "username": f"s{i:07d}", "password": "x", "role": "student",
+                                     "status": 1} for i in range(1, rows + 1)])
+        conn.execute(insert(Student), [{"id": i, "user_id": i, "student_name": f"张三{i}", "gender": "男", "age": 18,
+                                        "phone": "13800138000", "email": f"s{i}@example.com", "clazz_id": 1}
+                                       for i in range(1, rows + 1)])
+    with engine.connect() as conn:
+        return conn.execute(select_students()).all()
+
+
+pagination_adapter = TypeAdapter(StudentPagination)
+
+
+def page(items: list, rows: list) -> dict:
+    return {"items": items, "total": len(rows), "page": 1, "size": len(rows), "pages": 1, "next_cursor": None}
+
+
+def before(rows: list) -> bytes:
+    """原来的路径：逐行构造 StudentBase（完整校验），再像 FastAPI 一样按 response_model 校验、转成JSON"""
+    content = page([row_to_student(row) for row in rows], rows)
+    validated = pagination_adapter.validate_python(jsonable_encoder(content))
+    return json.dumps(pagination_adapter.dump_python(validated, mode="json"), ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def after(rows: list) -> bytes:
+    """快速路径：查询行直接转字典，一次编码"""
+    return dumps(page([student_row_dict(row) for row in rows], rows))
+
+
+def timed(func, rows: list, repeat: int) -> float:
+    """执行多次，返回每次耗时的中位数（秒）"""
+    costs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        costs.append(time.perf_counter() - start)
+    return statistics.median(costs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="学生响应序列化微基准")
+    parser.add_argument("--rows", type=int, default=100, help="每页多少行（默认100）")
+    parser.add_argument("--repeat", type=int, default=1000, help="重复次数（默认1000）")
+    args = parser.parse_args()
+
+    rows = load_rows(args.rows)
+    # 两种写法输出的内容必须一致
+    assert json.loads(before(rows)) == json.loads(after(rows)), "两种写法的输出不一致"
+
+    results = {}
+    for label, func in (("before", before), ("after", after)):
+        func(rows)  # 预热
+        cost = timed(func, rows, args.repeat)
+        results[label] = cost
+        print(f"{label:<8}每页 {cost * 1000:.3f} ms，{args.rows / cost:,.0f} 行/秒")
+    print(f"JSON编码器：{'orjson' if orjson is not None else '标准库 json'}；"
+          f"快了 {results['before'] / results['after']:.1f} 倍")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
-from contextlib import asynccontextmanager
-from fastapi import FastAPI
-from app.database import engine, Base
-from app.api import auth_router, students_router
+# 启动计时（只依赖标准库，最先导入，后面每个阶段都计时，启动完成后打印报告）
+from Student_Management_System.app.bootstrap import startup_timer, ensure_schema
+
+with startup_timer.phase("imports"):
+    import asyncio
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI
+with startup_timer.phase("config"):
+    from Student_Management_System.app.config import settings
+with startup_timer.phase("engine"):  # 包括导入 SQLAlchemy、创建连接池（这时还不会连数据库）
+    from Student_Management_System.app.database import engine, replica_engine, read_your_writes_middleware
+    from Student_Management_System.app.metrics import sql_metrics_middleware
+    from Student_Management_System.app.revocation import sync_revocations, revocation_sync_loop
 
 
 # 生命周期管理器
@@ -10,20 +19,32 @@ async def lifespan(app: FastAPI):
     # Startup - 服务器启动时执行
     print(" 学生管理系统启动中...")
 
-    # 创建数据库表
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    print("数据库表创建完成")
+    # 检查表结构版本号：和模型一致就跳过，不一致才建表（不再每次启动都执行 create_all）
+    with startup_timer.phase("schema"):
+        result = await ensure_schema(engine, settings.SCHEMA_BOOTSTRAP)
+    startup_timer.note(result)
+    # 加载Token注销名单（之后每个请求只查内存），并启动后台同步任务
+    with startup_timer.phase("revocations"):
+        await sync_revocations(full=True)
+    sync_task = asyncio.create_task(revocation_sync_loop())
+    print(startup_timer.report(settings.STARTUP_BUDGET_MS))
 
     yield  # 这里服务器正常运行
 
     # Shutdown - 服务器关闭时执行
     print("学生管理系统关闭中...")
+    sync_task.cancel()
     await engine.dispose()
+    if replica_engine is not engine:
+        await replica_engine.dispose()
     print("数据库连接已关闭")
 
 
 # 创建FastAPI应用实例（相当于启动Web服务器）
+startup_timer.start("routers")  # 导入接口模块、注册路由
+from Student_Management_System.app.api import auth_router, students_router, clazzes_router, courses_router, \
+    scores_router, metrics_router, prometheus_router
+
 app = FastAPI(
     title="学生管理系统API",  # 接口文档标题
     description="小白友好版：FastAPI + SQLAlchemy 学生管理系统",  # 文档描述
@@ -31,9 +52,20 @@ app = FastAPI(
     lifespan=lifespan  # 添加生命周期管理
 )
 
+# 注册中间件：统计每个请求的SQL数量和耗时（响应头 Server-Timing）
+app.middleware("http")(sql_metrics_middleware)
+# 注册中间件：写请求成功后几秒内，这个客户端的读请求走主库（配置了只读副本时才生效）
+app.middleware("http")(read_your_writes_middleware)
+
 # 注册接口路由（把我们写的接口添加到服务器）
 app.include_router(auth_router)  # 认证接口（登录/注销）
 app.include_router(students_router)  # 学生管理接口（增删改查）
+app.include_router(clazzes_router)  # 班级管理接口（增删改查）
+app.include_router(courses_router)  # 课程与选课接口（课程增删改查、选课、退课、候补）
+app.include_router(scores_router)  # 成绩管理接口（录入、统计、排名）
+app.include_router(metrics_router)  # 运行监控接口（连接池等）
+app.include_router(prometheus_router)  # Prometheus 指标（/metrics）
+startup_timer.end()
 
 
 # 根路由（测试服务器是否启动成功）
@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# 导入 app 之前先配置好环境变量：用临时的 SQLite 文件，不碰 .env 里的数据库
+ROOT = Path(__file__).resolve().parent.parent
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="sms-tests-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["DATABASE_REPLICA_URL"] = ""
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-with-at-least-32-bytes!")
+os.environ.setdefault("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+os.environ["LOGIN_RATE_LIMIT_ENABLED"] = "true"  # 压测脚本导入时会默认关掉登录限流，测试要打开
+sys.path.insert(0, str(ROOT))
+
+from tests.helpers import seed, run, load_script  # 要在设置环境变量之后导入
+
+
+@pytest.fixture
+def api():
+    """
+    调接口的工具：api(协程函数) 会先建好测试数据，再把 httpx 客户端传给协程函数执行
+    比如 api(lambda client: client.get("/api/students/1", headers=auth()))
+    """
+    import httpx
+    from Student_Management_System.app.database import engine
+    from Student_Management_System.main import app
+
+    def call(func, students: int = 10, **seed_options):
+        async def main():
+            await seed(students, **seed_options)
+            try:
+                async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+                    return await func(c)
+            finally:
+                await engine.dispose()
+        return run(main())
+
+    return call
+
+
+@pytest.fixture
+def calculator_module():
+    return load_script("calculator_01", "01.py")
+
+
+@pytest.fixture
+def prime_module():
+    return load_script("prime_02", "02.py")
@@ -0,0 +1,79 @@
+import asyncio
+import importlib.util
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 测试用的小工具（app 的模块都在函数里导入：conftest.py 要先设置好环境变量，app 才能导入）
+
+ROOT = Path(__file__).resolve().parent.parent
+PASSWORD = "secret1"
+
+
+def load_script(name: str, filename: str):
+    """按文件路径导入根目录下的脚本（01.py、02.py 的文件名不是合法的模块名）"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, ROOT / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module  # 多进程时子进程要按模块名找到函数
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(coro):
+    """在同步测试里跑一个协程"""
+    return asyncio.run(coro)
+
+
+def clear_caches():
+    """每个测试都从空数据库开始，进程内的缓存也要清空（否则会命中上一个测试的数据）"""
+    from Student_Management_System.app.dependencies import principal_cache, token_cache
+    from Student_Management_System.app.queries import student_cache
+    from Student_Management_System.app.queries.score import stats_cache, course_versions
+    from Student_Management_System.app.ratelimit import login_ip_limiter, login_username_limiter
+
+    for cache in (principal_cache, token_cache, student_cache, stats_cache):
+        cache.clear()
+    course_versions.clear()
+    for limiter in (login_ip_limiter, login_username_limiter):
+        for shard in limiter._shards:
+            shard.clear()
+
+
+async def seed(students: int = 10, create_time: datetime = None):
+    """
+    建表并写入测试数据：管理员(用户ID 1)、教师(2)、班级 1 和 2、学生 1..n（用户ID 100+，单数在1班，双数在2班）
+    create_time：所有学生用同一个创建时间（测游标分页的边界）
+    """
+    import bcrypt
+    from Student_Management_System.app.database import Base, engine, AsyncSessionLocal
+    from Student_Management_System.app.models import User, Clazz, Student
+    from Student_Management_System.app.search import rebuild_search_index
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    password = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(4)).decode()
+    async with AsyncSessionLocal() as db:
+        db.add(User(id=1, username="admin", password=password, role="admin", status=1))
+        db.add(User(id=2, username="teacher", password=password, role="teacher", status=1))
+        db.add(Clazz(id=1, class_name="一班", grade="2023级", major="计算机", teacher_id=2, student_count=0))
+        db.add(Clazz(id=2, class_name="二班", grade="2023级", major="计算机", teacher_id=2, student_count=0))
+        for i in range(1, students + 1):
+            db.add(User(id=100 + i, username=f"stu{i:03d}", password=password, role="student", status=1))
+            extra = {"create_time": create_time} if create_time else {}
+            db.add(Student(id=i, user_id=100 + i, student_name=f"学生{i}", gender="男", age=18,
+                           clazz_id=2 - i % 2, **extra))
+        await db.flush()
+        from Student_Management_System.app.queries import recount_students
+        await recount_students(db)
+        await rebuild_search_index(db)
+        await db.commit()
+    await engine.dispose()  # 每个测试用自己的事件循环，连接不能跨循环复用
+    clear_caches()
+
+
+def auth(user_id: int = 1, role: str = "admin") -> dict:
+    from Student_Management_System.app.api.auth import create_access_token
+    return {"Authorization": "Bearer " + create_access_token({"sub": str(user_id), "role": role})}
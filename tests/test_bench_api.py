@@ -0,0 +1,38 @@
+import pytest
+
+from Student_Management_System.benchmarks import bench_api
+
+
+def result(p95: float, rps: float, queries) -> dict:
+    return {"p95_ms": p95, "throughput_rps": rps, "queries_per_request": queries}
+
+
+def report(**results) -> dict:
+    return {"meta": {"commit": None}, "results": results}
+
+
+@pytest.mark.parametrize("p, expected", [(0, 1), (50, 5), (95, 10), (99, 10), (100, 10)])
+def test_percentile_is_nearest_rank(p, expected):
+    assert bench_api.percentile(list(range(1, 11)), p) == expected
+
+
+def test_percentile_of_nothing_is_zero():
+    assert bench_api.percentile([], 95) == 0.0
+
+
+def test_compare_flags_each_kind_of_regression(capsys):
+    old = report(a=result(10, 100, 2), b=result(10, 100, 2), c=result(10, 100, 2), d=result(10, 100, 2))
+    new = report(
+        a=result(10.5, 95, 2),     # 在阈值以内
+        b=result(20, 100, 2),      # p95 变慢
+        c=result(10, 50, 2),       # 吞吐下降
+        d=result(10, 100, 3),      # SQL 变多
+        e=result(99, 1, 9),        # 新增场景不算退化
+    )
+    assert bench_api.compare(old, new, 0.1) == ["b", "c", "d"]
+    assert "新增场景" in capsys.readouterr().out
+
+
+def test_compare_ignores_tiny_absolute_slowdowns():
+    # 0.2ms -> 0.5ms 比例上翻了一倍多，但不到1毫秒，算噪音
+    assert bench_api.compare(report(a=result(0.2, 100, None)), report(a=result(0.5, 100, 1)), 0.1) == []
@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from Student_Management_System.app.bootstrap import ensure_schema
+from Student_Management_System.app.database import Base
+from tests.helpers import run
+
+
+def with_engine(tmp_path, func):
+    """在一个单独的临时 SQLite 库上执行 func(engine)"""
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bootstrap.db'}")
+        try:
+            return await func(engine)
+        finally:
+            await engine.dispose()
+    return run(main())
+
+
+async def version(engine):
+    async with engine.connect() as conn:
+        return await conn.scalar(text("SELECT version FROM schema_version"))
+
+
+def test_fresh_database_is_created_then_skipped(tmp_path):
+    async def scenario(engine):
+        first = await ensure_schema(engine)
+        second = await ensure_schema(engine)
+        return first, second, await version(engine)
+
+    first, second, stamped = with_engine(tmp_path, scenario)
+    assert first.startswith("已建表") and "跳过" in second and stamped
+
+
+def test_missing_column_fails_without_stamping(tmp_path):
+    async def scenario(engine):
+        # 模拟升级前的老库：表都在，但 clazz 还没有 student_count 列，也没有版本表
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(text("ALTER TABLE clazz DROP COLUMN student_count"))
+        with pytest.raises(RuntimeError, match="clazz 缺少列 student_count"):
+            await ensure_schema(engine)
+        async with engine.connect() as conn:
+            tables = await conn.run_sync(lambda c: c.dialect.get_table_names(c))
+        return "schema_version" in tables
+
+    assert with_engine(tmp_path, scenario) is False
+
+
+def test_upgrade_backfills_counts_and_search_index(tmp_path):
+    async def scenario(engine):
+        # 模拟升级：学生数据已经在，但还没有搜索索引，班级人数也还是默认值
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(text("INSERT INTO user (id, username, password, role, status) "
+                                    "VALUES (101, 'stu001', 'x', 'student', 1)"))
+            await conn.execute(text("INSERT INTO clazz (id, class_name, grade, major, student_count) "
+                                    "VALUES (1, '一班', '2023级', '计算机', 0)"))
+            await conn.execute(text("INSERT INTO student (id, user_id, student_name, gender, age, clazz_id) "
+                                    "VALUES (1, 101, '张三', '男', 18, 1)"))
+        await ensure_schema(engine)
+        async with engine.connect() as conn:
+            count = await conn.scalar(text("SELECT student_count FROM clazz WHERE id = 1"))
+            grams = await conn.scalar(text("SELECT COUNT(*) FROM student_search_gram WHERE student_id = 1"))
+        return count, grams
+
+    count, grams = with_engine(tmp_path, scenario)
+    assert count == 1 and grams > 0
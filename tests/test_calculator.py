@@ -0,0 +1,124 @@
+import io
+import math
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def calc(calculator_module):
+    return calculator_module.SimpleCalculator()
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("1+2*3", 7),
+    ("(1+2)*3", 9),
+    ("10/4", 2.5),
+    ("10-4-3", 3),  # 左结合
+    ("8/4/2", 1),
+    ("-2*(3-5)", 4),
+    ("2*-3", -6),
+    ("-(-2)", 2),
+    ("+5", 5),
+    ("1.5e3/4", 375),
+    ("2.5E-1*4", 1),
+    ("  3 +\t4 ", 7),
+    ("1/3", 0.333333),
+])
+def test_calculate(calc, expression, expected):
+    assert calc.calculate(expression) == expected
+
+
+@pytest.mark.parametrize("expression, message, position", [
+    ("1+", "最后缺少数字", 3),
+    ("(1+2", "少了右括号", 1),
+    ("1+2)", "少了左括号", 4),
+    ("2 3", "前面缺少运算符", 3),
+    ("*3", "前面缺少数字", 1),
+    ("1+#", "不认识的字符", 3),
+])
+def test_errors_point_at_the_character(calc, expression, message, position):
+    result = calc.calculate(expression)
+    assert message in result
+    assert result.startswith(f"错误：第{position}个字符")
+
+
+def test_division_by_zero(calc):
+    assert "除数不能是0" in calc.calculate("1/(2-2)")
+
+
+def test_variables(calc):
+    assert calc.calculate("price*(1+rate)-discount", {"price": 100, "rate": 0.1, "discount": "5"}) == 105
+    assert "没有赋值" in calc.calculate("x+1")
+    assert calc.calculate("x*2", {"x": 3, "unused": "abc"}) == 6
+
+
+@pytest.mark.parametrize("value", ["abc", None, [1]])
+def test_non_numeric_variable_is_an_expression_error(calc, value):
+    result = calc.calculate("1 + x*2", {"x": value})
+    assert result.startswith("错误：第5个字符")
+    assert "不是数字" in result
+
+
+def test_compile_cache_hits_and_evicts(calculator_module):
+    calc = calculator_module.SimpleCalculator(cache_size=2)
+    first, _ = calc.compile("a+b")
+    assert calc.compile("a+b")[0] is first
+    assert first.variables == ("a", "b")
+    calc.compile("1+1")
+    calc.compile("2+2")  # 淘汰 a+b
+    assert calc.compile("a+b")[0] is not first
+    assert calc.cache_stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_evaluate_columns_marks_division_by_zero_rows(calculator_module, calc, use_numpy):
+    if use_numpy and calculator_module.numpy is None:
+        pytest.skip("没装 NumPy")
+    compiled, _ = calc.compile("a/(b-1)+2")
+    values, errors, error = compiled.evaluate_columns({"a": [4, 6, 8], "b": [3, 1, 5]}, use_numpy=use_numpy)
+    assert error == ""
+    assert list(errors) == [0, 1, 0]
+    assert values[0] == 4 and math.isnan(values[1]) and values[2] == 4
+
+
+def test_evaluate_columns_matches_row_by_row(calc):
+    compiled, _ = calc.compile("-x*(y+1.5)/2-x")
+    x = [i - 5.0 for i in range(11)]
+    y = [float(i) for i in range(11)]
+    values, _, _ = compiled.evaluate_columns({"x": x, "y": y})
+    expected = [compiled.evaluate({"x": a, "y": b})[0] for a, b in zip(x, y)]
+    assert list(values) == pytest.approx(expected)
+
+
+def test_batch_keeps_input_order(calculator_module, tmp_path, capsys):
+    lines = [f"{i}*2" if i % 5 else "1/0" for i in range(1, 51)]
+    source = tmp_path / "exprs.txt"
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    assert calculator_module.run_batch([str(source), "--workers", "2", "--chunk-size", "7"]) == 0
+    output = capsys.readouterr()
+    rows = output.out.splitlines()
+    assert len(rows) == 50
+    assert rows[0] == "result\t2" and rows[4].startswith("error\t")
+    assert rows[49].startswith("error\t") and rows[48] == "result\t98"
+    assert "出错 10 行" in output.err
+
+
+def test_batch_reads_stdin_as_ndjson(calculator_module, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "stdin", io.StringIO("1+1\nx\n"))
+    calculator_module.run_batch(["--workers", "1", "--format", "ndjson"])
+    rows = capsys.readouterr().out.splitlines()
+    assert '"result": 2' in rows[0] and '"line": 2' in rows[1] and '"error"' in rows[1]
+
+
+def test_batch_missing_file_is_a_clean_error(calculator_module, tmp_path, capsys):
+    assert calculator_module.run_batch([str(tmp_path / "missing.txt")]) == 1
+    assert "无法打开输入文件" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("option", [["--chunk-size", "0"], ["--chunk-size", "-1"], ["--workers", "0"]])
+def test_batch_rejects_sizes_below_one(calculator_module, option, capsys):
+    with pytest.raises(SystemExit) as exc:
+        calculator_module.run_batch(["-", *option])
+    assert exc.value.code == 2
+    assert "必须大于等于1" in capsys.readouterr().err
@@ -0,0 +1,31 @@
+import pytest
+
+from tests.helpers import auth
+
+
+@pytest.mark.parametrize("field", ["class_name", "grade", "major"])
+def test_update_rejects_null_for_required_fields(api, field):
+    async def scenario(client):
+        return (await client.put("/api/clazzes/1", json={field: None}, headers=auth())).status_code
+
+    assert api(scenario, students=0) == 422
+
+
+def test_update_can_clear_teacher_and_rename(api):
+    async def scenario(client):
+        updated = (await client.put("/api/clazzes/1", json={"teacher_id": None, "class_name": "新一班"},
+                                    headers=auth())).json()
+        student = (await client.get("/api/students/1", headers=auth())).json()
+        return updated["teacher_id"], student["clazz_name"]
+
+    assert api(scenario, students=1) == (None, "新一班")
+
+
+def test_class_with_students_cannot_be_deleted(api):
+    async def scenario(client):
+        busy = await client.delete("/api/clazzes/1", headers=auth())
+        await client.patch("/api/students/batch", json={"ids": [1], "changes": {"clazz_id": 2}}, headers=auth())
+        empty = await client.delete("/api/clazzes/1", headers=auth())
+        return busy.status_code, empty.status_code
+
+    assert api(scenario, students=2) == (400, 200)
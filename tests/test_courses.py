@@ -0,0 +1,84 @@
+from tests.helpers import auth
+
+
+async def create_course(client, capacity: int) -> int:
+    body = {"course_name": "体育", "capacity": capacity}
+    return (await client.post("/api/courses", json=body, headers=auth())).json()["id"]
+
+
+async def enroll(client, course_id: int, student_id: int) -> dict:
+    return (await client.post(f"/api/courses/{course_id}/enroll", params={"student_id": student_id},
+                              headers=auth())).json()
+
+
+async def course(client, course_id: int) -> dict:
+    return (await client.get(f"/api/courses/{course_id}", headers=auth())).json()
+
+
+async def my_courses(client, student_id: int) -> list:
+    return (await client.get("/api/courses/enrollments/me", params={"student_id": student_id},
+                             headers=auth())).json()
+
+
+def test_seats_then_waitlist_in_order(api):
+    async def scenario(client):
+        course_id = await create_course(client, capacity=2)
+        results = [await enroll(client, course_id, sid) for sid in (1, 2, 3, 4)]
+        return results, await course(client, course_id)
+
+    results, info = api(scenario, students=4)
+    assert [r["status"] for r in results] == ["enrolled", "enrolled", "waitlisted", "waitlisted"]
+    assert [r["waitlist_position"] for r in results] == [None, None, 1, 2]
+    assert info["enrolled_count"] == 2
+
+
+def test_duplicate_enrollment_is_409(api):
+    async def scenario(client):
+        course_id = await create_course(client, capacity=1)
+        await enroll(client, course_id, 1)
+        again = await client.post(f"/api/courses/{course_id}/enroll", params={"student_id": 1}, headers=auth())
+        return again.status_code, (await course(client, course_id))["enrolled_count"]
+
+    assert api(scenario, students=1) == (409, 1)  # 重复选课时抢到的名额也退回了
+
+
+def test_drop_promotes_first_waitlisted(api):
+    async def scenario(client):
+        course_id = await create_course(client, capacity=1)
+        for sid in (1, 2, 3):
+            await enroll(client, course_id, sid)
+        dropped = (await client.delete(f"/api/courses/{course_id}/enroll", params={"student_id": 1},
+                                       headers=auth())).json()
+        return dropped, await my_courses(client, 2), await my_courses(client, 3), await course(client, course_id)
+
+    dropped, second, third, info = api(scenario, students=3)
+    assert dropped["promoted"] == 1
+    assert second[0]["status"] == "enrolled"
+    assert third[0]["status"] == "waitlisted" and third[0]["waitlist_position"] == 1
+    assert info["enrolled_count"] == 1
+
+
+def test_raising_capacity_fills_from_waitlist(api):
+    async def scenario(client):
+        course_id = await create_course(client, capacity=1)
+        for sid in (1, 2, 3):
+            await enroll(client, course_id, sid)
+        await client.put(f"/api/courses/{course_id}", json={"capacity": 3}, headers=auth())
+        return await course(client, course_id), await my_courses(client, 3)
+
+    info, third = api(scenario, students=3)
+    assert info["enrolled_count"] == 3
+    assert third[0]["status"] == "enrolled"
+
+
+def test_deleting_a_student_releases_the_seat(api):
+    async def scenario(client):
+        course_id = await create_course(client, capacity=1)
+        for sid in (1, 2):
+            await enroll(client, course_id, sid)
+        await client.delete("/api/students/1", headers=auth())
+        return await course(client, course_id), await my_courses(client, 2)
+
+    info, second = api(scenario, students=2)
+    assert info["enrolled_count"] == 1
+    assert second[0]["status"] == "enrolled"
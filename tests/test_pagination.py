@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from Student_Management_System.app.pagination import encode_cursor, decode_cursor
+from tests.helpers import auth
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("id", [42]), "id") == [42]
+    when = datetime(2024, 3, 1, 8, 30, 15, 123456)
+    assert decode_cursor(encode_cursor("create_time", [when, 7]), "create_time") == [when, 7]
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor("create_time", [datetime(2024, 1, 1), 123456789])
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!!", "", encode_cursor("id", ["abc"]), "eyJ4IjoxfQ"])
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor, "id")
+    assert e.value.status_code == 400
+
+
+def test_cursor_from_another_sort_key_is_400():
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(encode_cursor("id", [1]), "create_time")
+    assert e.value.status_code == 400
+
+
+async def walk_pages(client, sort: str, size: int) -> list:
+    """用游标一页一页翻到底，返回依次拿到的学生ID"""
+    ids, cursor = [], None
+    while True:
+        params = {"size": size, "sort": sort, "count": "none"}
+        if cursor:
+            params["cursor"] = cursor
+        body = (await client.get("/api/students", params=params, headers=auth())).json()
+        ids += [item["id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("size", [1, 7, 25, 100])
+def test_keyset_pages_cover_every_row_once(api, size):
+    ids = api(lambda client: walk_pages(client, "id", size), students=25)
+    assert ids == list(range(1, 26))
+
+
+def test_keyset_boundary_with_equal_create_time(api):
+    # 所有学生的创建时间都一样：只比较 create_time 会跳过或重复，要按 (create_time, id) 接着翻
+    same_time = datetime(2024, 9, 1, 8, 0, 0)
+    ids = api(lambda client: walk_pages(client, "create_time", 4), students=10, create_time=same_time)
+    assert ids == list(range(1, 11))
+
+
+def test_last_page_has_no_cursor(api):
+    async def scenario(client):
+        return (await client.get("/api/students", params={"size": 10}, headers=auth())).json()
+
+    body = api(scenario, students=10)
+    assert len(body["items"]) == 10
+    assert body["next_cursor"] is None
+    assert body["total"] == 10
@@ -0,0 +1,85 @@
+import math
+
+import pytest
+
+
+def is_prime(n: int) -> bool:
+    """试除法（对照用）"""
+    if n < 2:
+        return False
+    return all(n % d for d in range(2, math.isqrt(n) + 1))
+
+
+@pytest.fixture(params=[False, True], ids=["bytearray", "numpy"])
+def sieve(request, prime_module):
+    if request.param and prime_module.numpy is None:
+        pytest.skip("没装 NumPy")
+    # 分段故意设得很小，让范围跨很多段，检查段与段的边界
+    return prime_module.SegmentedSieve(segment_size=50, use_numpy=request.param)
+
+
+@pytest.mark.parametrize("a, b", [(0, 1), (1, 2), (2, 3), (1, 1000), (97, 97), (98, 100), (500, 2000), (10, 5)])
+def test_primes_match_trial_division(sieve, a, b):
+    assert sieve.primes(a, b) == [n for n in range(a, b + 1) if is_prime(n)]
+    assert sieve.count(a, b) == len(sieve.primes(a, b))
+
+
+def test_known_counts(prime_module):
+    sieve = prime_module.SegmentedSieve()
+    assert sieve.count(1, 10 ** 6) == 78498
+    assert sieve.count(10 ** 12, 10 ** 12 + 1000) == 37
+    assert sieve.primes(10 ** 12, 10 ** 12 + 40) == [1000000000039]
+
+
+@pytest.mark.parametrize("n, expected", [(1, 2), (2, 3), (5, 11), (6, 13), (100, 541), (10000, 104729)])
+def test_nth(sieve, n, expected):
+    assert sieve.nth(n) == expected
+
+
+def test_nth_rejects_zero(sieve):
+    with pytest.raises(ValueError):
+        sieve.nth(0)
+
+
+def test_workers_give_the_same_answer(prime_module):
+    single = prime_module.SegmentedSieve(segment_size=1000)
+    multi = prime_module.SegmentedSieve(segment_size=1000, workers=2)
+    assert multi.count(1, 200000) == single.count(1, 200000)
+    assert multi.primes(10 ** 9, 10 ** 9 + 5000) == single.primes(10 ** 9, 10 ** 9 + 5000)
+    assert multi.nth(5000) == single.nth(5000) == 48611
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1000", 1000),
+    ("1_000_000", 10 ** 6),
+    ("1e12", 10 ** 12),
+    ("1e+12", 10 ** 12),
+    ("1E+3+5", 1005),
+    ("10**9", 10 ** 9),
+    ("1e12+1000", 10 ** 12 + 1000),
+])
+def test_parse_number(prime_module, text, expected):
+    assert prime_module.parse_number(text) == expected
+
+
+def test_cli_count(prime_module, capsys):
+    prime_module.run_cli(["count", "1e+2", "1e2+100"])
+    assert capsys.readouterr().out.strip() == str(sum(is_prime(n) for n in range(100, 201)))
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_segment_size_below_one_is_rejected(prime_module, use_numpy):
+    with pytest.raises(ValueError):
+        prime_module.SegmentedSieve(segment_size=0, use_numpy=use_numpy)
+
+
+@pytest.mark.parametrize("argv, message", [
+    (["count", "1", "10", "--segment-size", "0"], "segment_size"),
+    (["count", "a", "5"], "不是合法的数字：a"),
+    (["nth", "0"], "大于等于1"),
+])
+def test_cli_bad_input_is_a_usage_error(prime_module, argv, message, capsys):
+    with pytest.raises(SystemExit) as exc:
+        prime_module.run_cli(argv)
+    assert exc.value.code == 2
+    assert message in capsys.readouterr().err
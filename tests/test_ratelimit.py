@@ -0,0 +1,97 @@
+import pytest
+
+from Student_Management_System.app import ratelimit
+from Student_Management_System.app.config import Settings
+from Student_Management_System.app.ratelimit import TokenBucketLimiter
+from tests.helpers import PASSWORD
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", fake)
+    return fake
+
+
+def take(limiter, key) -> bool:
+    """和 check_login_rate 一样：先看能不能拿，能拿再拿"""
+    if limiter.retry_after(key) > 0:
+        limiter.rejected += 1
+        return False
+    limiter.consume(key)
+    return True
+
+
+def test_burst_then_reject(clock):
+    limiter = TokenBucketLimiter(burst=3, rate=1)
+    assert [take(limiter, "ip") for _ in range(5)] == [True, True, True, False, False]
+    assert limiter.stats()["allowed"] == 3 and limiter.stats()["rejected"] == 2
+    assert take(limiter, "other-ip")  # 每个 key 各有一个桶
+
+
+def test_tokens_refill_over_time(clock):
+    limiter = TokenBucketLimiter(burst=2, rate=0.5)  # 每2秒补一个
+    take(limiter, "k")
+    take(limiter, "k")
+    assert limiter.retry_after("k") == pytest.approx(2.0)
+    clock.now += 1
+    assert limiter.retry_after("k") == pytest.approx(1.0)
+    clock.now += 1
+    assert take(limiter, "k")
+    clock.now += 100  # 补满后不超过容量
+    assert [take(limiter, "k") for _ in range(3)] == [True, True, False]
+
+
+def test_refund_gives_a_token_back_up_to_burst(clock):
+    limiter = TokenBucketLimiter(burst=2, rate=0.001)
+    take(limiter, "k")
+    take(limiter, "k")
+    limiter.refund("k")
+    assert take(limiter, "k")
+    limiter.refund("k")
+    limiter.refund("k")
+    limiter.refund("k")
+    assert [take(limiter, "k") for _ in range(3)] == [True, True, False]
+    limiter.refund("never-seen")  # 没有桶时什么都不做
+    assert len(limiter) == 1
+
+
+def test_lru_eviction_keeps_memory_bounded(clock):
+    limiter = TokenBucketLimiter(burst=1, rate=1, max_keys=4, shards=1)
+    for i in range(10):
+        take(limiter, f"ip{i}")
+    assert len(limiter) == 4
+    assert limiter.evictions == 6
+
+
+@pytest.mark.parametrize("name, value", [
+    ("LOGIN_RATE_IP_PER_MINUTE", 0),
+    ("LOGIN_RATE_USERNAME_PER_MINUTE", -1),
+    ("LOGIN_RATE_USERNAME_BURST", 0.5),
+])
+def test_settings_reject_unusable_rates(monkeypatch, name, value):
+    config = Settings()
+    monkeypatch.setattr(config, name, value)
+    with pytest.raises(ValueError):
+        config.validate()
+
+
+def test_successful_logins_do_not_use_up_the_username_budget(api):
+    async def scenario(client):
+        good = [(await client.post("/api/auth/login", data={"username": "teacher", "password": PASSWORD})).status_code
+                for _ in range(8)]
+        bad = [(await client.post("/api/auth/login", data={"username": "admin", "password": "wrong"})).status_code
+               for _ in range(8)]
+        return good, bad
+
+    good, bad = api(scenario)
+    assert good == [200] * 8
+    assert bad[:5] == [401] * 5 and bad[5:] == [429] * 3  # 用户名桶默认5次
@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import pytest
+
+from Student_Management_System.app.revocation import RevocationList, revocations
+from tests.helpers import auth, run, PASSWORD
+
+
+def test_revoked_token_by_jti():
+    revoked = RevocationList()
+    revoked.apply(user_id=1, jti="abc", issued_before=None, expires_at=2000.0)
+    assert revoked.is_revoked(1, "abc", issued_at=100.0)
+    assert not revoked.is_revoked(1, "other", issued_at=100.0)
+    assert revoked.rejected == 1
+
+
+def test_revoking_a_user_only_hits_tokens_issued_before_the_cutoff():
+    revoked = RevocationList()
+    revoked.apply(user_id=7, jti=None, issued_before=500.0, expires_at=2000.0)
+    assert revoked.is_revoked(7, "t1", issued_at=499.5)
+    assert revoked.is_revoked(7, "t1", issued_at=500.0)
+    assert not revoked.is_revoked(7, "t2", issued_at=500.1)  # 注销之后重新登录的不受影响
+    assert not revoked.is_revoked(8, "t3", issued_at=1.0)
+
+
+def test_later_cutoff_wins_and_earlier_is_ignored():
+    revoked = RevocationList()
+    revoked.apply(7, None, 500.0, 2000.0)
+    revoked.apply(7, None, 300.0, 2000.0)  # 别的进程同步过来的旧记录
+    assert revoked.is_revoked(7, None, issued_at=400.0)
+    revoked.apply(7, None, 800.0, 2300.0)
+    assert revoked.is_revoked(7, None, issued_at=700.0)
+
+
+def test_purge_drops_expired_records():
+    revoked = RevocationList()
+    revoked.apply(1, "old", None, expires_at=100.0)
+    revoked.apply(1, "new", None, expires_at=300.0)
+    revoked.apply(2, None, 50.0, expires_at=100.0)
+    revoked.purge(now=200.0)
+    assert revoked.stats()["revoked_tokens"] == 1
+    assert revoked.stats()["revoked_users"] == 0
+    assert revoked.is_revoked(1, "new", 0.0)
+    assert not revoked.is_revoked(2, None, 10.0)
+
+
+def test_logout_revokes_the_token(api):
+    async def scenario(client):
+        login = await client.post("/api/auth/login", data={"username": "admin", "password": PASSWORD})
+        headers = {"Authorization": "Bearer " + login.json()["access_token"]}
+        before = (await client.get("/api/students/1", headers=headers)).status_code
+        await client.post("/api/auth/logout", headers=headers)
+        after = (await client.get("/api/students/1", headers=headers)).status_code
+        other = (await client.get("/api/students/1", headers=auth())).status_code  # 别的 Token 不受影响
+        return before, after, other
+
+    assert api(scenario) == (200, 401, 200)
+    revocations.purge(time.time() + 10 ** 9)  # 不影响后面的测试
+
+
+def test_sync_failures_are_logged_and_the_loop_keeps_going(monkeypatch, caplog):
+    from Student_Management_System.app import revocation
+
+    calls = []
+
+    async def failing_sync():
+        calls.append(1)
+        if len(calls) == 2:
+            raise asyncio.CancelledError  # 第二次同步时停止循环
+        raise RuntimeError("数据库连不上")
+
+    monkeypatch.setattr(revocation, "sync_revocations", failing_sync)
+    monkeypatch.setattr(revocation.settings, "TOKEN_REVOCATION_SYNC_SECONDS", 0)
+    with pytest.raises(asyncio.CancelledError):
+        run(revocation.revocation_sync_loop())
+    assert len(calls) == 2
+    assert "同步Token注销记录失败" in caplog.text and "数据库连不上" in caplog.text
@@ -0,0 +1,73 @@
+import statistics
+
+import pytest
+
+from Student_Management_System.app.queries.score import interpolate
+from tests.helpers import auth
+
+SCORES = [55, 61.5, 70, 70, 78, 83, 88, 90.5, 94, 100]
+
+
+def percentile(data: list, p: int) -> float:
+    """对照用：标准库的 inclusive 分位数和 numpy.percentile 默认的线性插值一致"""
+    if p in (0, 100):
+        return min(data) if p == 0 else max(data)
+    return statistics.quantiles(data, n=100, method="inclusive")[p - 1]
+
+
+@pytest.mark.parametrize("p", [0, 25, 50, 75, 90, 95, 100])
+def test_interpolate_matches_reference(p):
+    values = dict(enumerate(sorted(SCORES)))
+    assert interpolate(values, len(SCORES), p) == pytest.approx(percentile(SCORES, p))
+
+
+def test_interpolate_single_value():
+    assert interpolate({0: 88.0}, 1, 90) == 88.0
+
+
+async def create_course_with_scores(client, scores: dict) -> int:
+    course_id = (await client.post("/api/courses", json={"course_name": "数学"}, headers=auth())).json()["id"]
+    body = {"course_id": course_id, "exam": "期末",
+            "scores": [{"student_id": sid, "score": score} for sid, score in scores.items()]}
+    assert (await client.post("/api/scores/bulk", json=body, headers=auth())).json()["saved"] == len(scores)
+    return course_id
+
+
+def test_stats_match_reference(api):
+    async def scenario(client):
+        course_id = await create_course_with_scores(client, dict(enumerate(SCORES, start=1)))
+        return (await client.get("/api/scores/stats", params={"course_id": course_id, "exam": "期末"},
+                                 headers=auth())).json()
+
+    stats = api(scenario)
+    assert stats["count"] == len(SCORES)
+    assert stats["mean"] == pytest.approx(round(statistics.mean(SCORES), 2))
+    assert stats["stddev"] == pytest.approx(round(statistics.pstdev(SCORES), 2))
+    assert stats["median"] == pytest.approx(statistics.median(SCORES))
+    assert stats["percentiles"]["p90"] == pytest.approx(round(percentile(SCORES, 90), 2))
+    assert stats["histogram"] == {"A": 3, "B": 2, "C": 3, "D": 1, "F": 1}
+
+
+def test_ranking_shares_rank_on_ties(api):
+    async def scenario(client):
+        course_id = await create_course_with_scores(client, {1: 90, 2: 95, 3: 90, 4: 80})
+        return (await client.get("/api/scores/ranking", params={"course_id": course_id, "exam": "期末"},
+                                 headers=auth())).json()
+
+    items = api(scenario, students=4)["items"]
+    assert [(i["student_id"], i["overall_rank"]) for i in items] == [(2, 1), (1, 2), (3, 2), (4, 4)]
+    assert {i["student_id"]: i["clazz_rank"] for i in items} == {1: 1, 3: 1, 2: 1, 4: 2}
+
+
+def test_student_changes_invalidate_cached_stats(api):
+    async def scenario(client):
+        course_id = await create_course_with_scores(client, {1: 60, 2: 70, 3: 80})
+        params = {"course_id": course_id, "exam": "期末"}
+        before = (await client.get("/api/scores/stats", params=params, headers=auth())).json()["count"]
+        await client.put("/api/students/3", json={"student_name": "改名"}, headers=auth())
+        ranking = (await client.get("/api/scores/ranking", params=params, headers=auth())).json()
+        await client.delete("/api/students/1", headers=auth())
+        after = (await client.get("/api/scores/stats", params=params, headers=auth())).json()["count"]
+        return before, ranking["items"][0]["student_name"], after
+
+    assert api(scenario, students=3) == (3, "改名", 2)
@@ -0,0 +1,135 @@
+import pytest
+
+from Student_Management_System.app.importer import iter_lines, iter_records
+from Student_Management_System.app.schemas.student import DataFormatEnum
+from tests.helpers import auth, run
+
+
+async def lines_of(text: str):
+    for line in text.split("\n"):
+        yield line
+
+
+def parse(text: str, fmt: DataFormatEnum) -> list:
+    async def collect():
+        return [item async for item in iter_records(lines_of(text), fmt)]
+    return run(collect())
+
+
+def test_csv_rows_with_quoted_newlines_and_quotes():
+    text = 'username,student_name,phone\na1,"张\n三",\na2,"李""四",13800000000\n\n'
+    assert parse(text, DataFormatEnum.csv) == [
+        (1, {"username": "a1", "student_name": "张\n三"}),  # 空单元格当作没填
+        (2, {"username": "a2", "student_name": '李"四', "phone": "13800000000"}),
+    ]
+
+
+def test_csv_unterminated_quote_is_reported():
+    rows = parse('username,student_name\na1,"没有闭合\na2,x', DataFormatEnum.csv)
+    assert len(rows) == 1 and "双引号没有闭合" in rows[0][1]
+
+
+def test_ndjson_rows_and_errors():
+    rows = parse('{"username": "a1"}\n[1, 2]\n{bad json\n', DataFormatEnum.ndjson)
+    assert rows[0] == (1, {"username": "a1"})
+    assert rows[1][0] == 2 and "JSON对象" in rows[1][1]
+    assert rows[2][0] == 3 and rows[2][1].startswith("格式错误")
+
+
+def test_invalid_utf8_line_is_a_row_error():
+    async def chunks():
+        yield "username,student_name\na1,张三\na2,".encode() + b"\xff\xfe"
+        yield "\na3,李四\n".encode()
+
+    async def collect():
+        return [item async for item in iter_records(iter_lines(chunks()), DataFormatEnum.csv)]
+
+    rows = run(collect())
+    assert rows[0] == (1, {"username": "a1", "student_name": "张三"})
+    assert rows[1][0] == 2 and "不是UTF-8" in rows[1][1]
+    assert rows[2] == (3, {"username": "a3", "student_name": "李四"})
+
+
+def test_bulk_import_reports_each_failed_row(api):
+    rows = [
+        '{"username": "new01", "password": "secret1", "student_name": "新生", "gender": "男", "age": 18, "clazz_id": 1}',
+        '{"username": 123, "password": "secret1", "student_name": "a", "gender": "男", "age": 18, "clazz_id": 1}',
+        '{"username": "stu001", "password": "secret1", "student_name": "b", "gender": "女", "age": 18, "clazz_id": 1}',
+        '{"username": "new02", "password": "secret1", "student_name": "c", "gender": "女", "age": 18, "clazz_id": 9}',
+    ]
+
+    async def scenario(client):
+        report = (await client.post("/api/students/bulk", params={"format": "ndjson"},
+                                    content="\n".join(rows).encode(), headers=auth())).json()
+        clazz = (await client.get("/api/clazzes/1", headers=auth())).json()
+        return report, clazz
+
+    report, clazz = api(scenario, students=2)
+    assert report["total"] == 4 and report["created"] == 1
+    assert [(e["row"], e["username"]) for e in report["errors"]] == [(2, "123"), (3, "stu001"), (4, "new02")]
+    assert clazz["student_count"] == 2  # 原来1个 + 导入1个
+
+
+def test_batch_transfer_updates_class_counts(api):
+    async def scenario(client):
+        body = {"filter": {"clazz_id": 1}, "changes": {"clazz_id": 2}}
+        result = (await client.patch("/api/students/batch", json=body, headers=auth())).json()
+        counts = [(await client.get(f"/api/clazzes/{cid}", headers=auth())).json()["student_count"] for cid in (1, 2)]
+        return result, counts
+
+    result, counts = api(scenario, students=6)
+    assert result["matched"] == result["updated"] == 3
+    assert result["clazz_changes"] == {"1": -3, "2": 3}
+    assert counts == [0, 6]
+
+
+@pytest.mark.parametrize("changes", [{"age": None}, {"clazz_id": None}, {"student_name": None}])
+def test_null_for_required_fields_is_400(api, changes):
+    async def scenario(client):
+        batch = await client.patch("/api/students/batch", json={"ids": [1], "changes": changes}, headers=auth())
+        single = await client.put("/api/students/1", json=changes, headers=auth())
+        return batch.status_code, single.status_code
+
+    assert api(scenario, students=1) == (400, 400)
+
+
+def test_etag_changes_with_content_and_supports_304(api):
+    async def scenario(client):
+        first = await client.get("/api/students/1", headers=auth())
+        etag = first.headers["etag"]
+        cached = await client.get("/api/students/1", headers={**auth(), "If-None-Match": etag})
+        await client.put("/api/students/1", json={"age": 20}, headers=auth())
+        await client.put("/api/students/1", json={"age": 21}, headers=auth())  # 同一秒里改两次
+        changed = await client.get("/api/students/1", headers={**auth(), "If-None-Match": etag})
+        return cached.status_code, changed.status_code, changed.headers["etag"] != etag, changed.json()["age"]
+
+    assert api(scenario, students=1) == (304, 200, True, 21)
+
+
+def test_student_can_only_read_itself(api):
+    async def scenario(client):
+        own = await client.get("/api/students/1", headers=auth(101, "student"))
+        other = await client.get("/api/students/2", headers=auth(101, "student"))
+        return own.status_code, other.status_code
+
+    assert api(scenario, students=2) == (200, 403)
+
+
+def test_search_ranks_exact_match_first(api):
+    async def scenario(client):
+        found = (await client.get("/api/students/search", params={"q": "学生1"}, headers=auth())).json()
+        listed = (await client.get("/api/students", params={"name": "生1", "size": 50}, headers=auth())).json()
+        return [s["id"] for s in found], sorted(s["id"] for s in listed["items"])
+
+    found, listed = api(scenario, students=12)
+    assert found[0] == 1 and sorted(found) == [1, 10, 11, 12]
+    assert listed == [1, 10, 11, 12]
+
+
+def test_single_transfer_updates_class_counts(api):
+    async def scenario(client):
+        await client.put("/api/students/1", json={"clazz_id": 2}, headers=auth())
+        await client.put("/api/students/1", json={"clazz_id": 2}, headers=auth())  # 已经在2班，人数不变
+        return [(await client.get(f"/api/clazzes/{cid}", headers=auth())).json()["student_count"] for cid in (1, 2)]
+
+    assert api(scenario, students=4) == [1, 3]  # 原来每班2人